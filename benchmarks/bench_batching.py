@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_deepl import MockDeepLServer
+from pydeepl import core
+from pydeepl.batching import TranslationBatcher, close_batchers, translate_many
+from pydeepl.cache import close_caches
+from pydeepl.client import close_translators, get_translator
+
+
+def main(count=2000, latency=0.005):
+    # 模拟资源文件：大量短字符串，其中不少重复
+    texts = [f'Label {i % (count // 4)}' for i in range(count)]
+
+    with MockDeepLServer(latency=latency) as server, tempfile.TemporaryDirectory() as tmp:
+        translator = get_translator('bench-key', server.url)
+
+        def run(name, func):
+            before = sum(server.requests.values())
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            requests = sum(server.requests.values()) - before
+            print(f'{name:<22}{elapsed:>9.3f} s{requests:>8} requests{count / elapsed:>12.0f} texts/s')
+
+        print(f'{count} texts, {latency * 1000:.0f} ms simulated latency')
+        run('one per request', lambda: [translator.translate_text(text, target_lang='ZH') for text in texts])
+        run('translate_many', lambda: translate_many(translator, texts, None, 'ZH'))
+
+        batcher = TranslationBatcher(translator)
+        with ThreadPoolExecutor(max_workers=32) as callers:
+            run('batcher (32 callers)', lambda: list(callers.map(lambda text: batcher.translate(text, None, 'ZH'),
+                                                                 texts)))
+        batcher.close()
+
+        # 实际的翻译入口：并发调用 core.translate 时经共享的合并器发送
+        config = {'deepl_api': 'bench-key', 'server_url': server.url, 'detect_language': False,
+                  'cache': {'path': os.path.join(tmp, 'c.db')}, 'scheduler': {'rate': 100000, 'burst': 100000}}
+        with ThreadPoolExecutor(max_workers=32) as callers:
+            run('core.translate (32)', lambda: list(callers.map(
+                lambda text: core.translate(f'{text}.', 'EN', 'ZH', config=config), texts)))
+        close_batchers()
+        close_translators()
+        close_caches()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydeepl.cache import TranslationCache
+
+
+def measure(func, keys):
+    start = time.perf_counter()
+    for key in keys:
+        func(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main(entries=20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TranslationCache(os.path.join(tmp, 'cache.db'), memory_entries=1024)
+        texts = [f'Error {i}: the operation could not be completed.' for i in range(entries)]
+        put_us = measure(lambda text: cache.put(text, 'EN', 'ZH', f'错误 {text}'), texts)
+        hot = texts[-512:]
+        hot_us = measure(lambda text: cache.get(text, 'EN', 'ZH'), hot * 20)
+        cold_us = measure(lambda text: cache.get(text, 'EN', 'ZH'), texts[:5000])
+        miss_us = measure(lambda text: cache.get(text, 'EN', 'JA'), texts[:5000])
+        print(f'put            {put_us:8.1f} us')
+        print(f'hit (memory)   {hot_us:8.1f} us')
+        print(f'hit (sqlite)   {cold_us:8.1f} us')
+        print(f'miss           {miss_us:8.1f} us')
+        print(cache.stats())
+        cache.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_deepl import MockDeepLServer
+from pydeepl import core
+from pydeepl.cache import close_caches
+from pydeepl.client import close_translators
+from pydeepl.scheduler import INTERACTIVE, scheduled_translator_from_config
+
+PARAGRAPH = ('The committee reviewed the proposal in detail. It raised several questions about the budget. '
+             'Further analysis is required before a final decision can be made!\n\n')
+
+
+def make_text(chars, tag):
+    # 每个用例的文本都不同，避免命中翻译缓存
+    paragraphs = []
+    size = 0
+    while size < chars:
+        paragraph = f'{tag} {len(paragraphs)}: {PARAGRAPH}'
+        paragraphs.append(paragraph)
+        size += len(paragraph)
+    return ''.join(paragraphs)
+
+
+def measure(chunks):
+    start = time.perf_counter()
+    first = None
+    for _ in chunks:
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def single_request(text, config):
+    # 原实现：整段文本作为一个请求发送
+    translator = scheduled_translator_from_config(config, INTERACTIVE)
+    yield translator.translate_text(text, source_lang='EN', target_lang='ZH').text
+
+
+def main(sizes=(20000, 50000, 100000), latency=0.1, char_latency=0.00002):
+    with MockDeepLServer(latency=latency, char_latency=char_latency) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        config = {'deepl_api': 'bench-key', 'server_url': server.url, 'cache': {'path': os.path.join(tmp, 'c.db')},
+                  'scheduler': {'rate': 100000, 'burst': 100000}}
+        print(f'{latency * 1000:.0f} ms per request + {char_latency * 1e6:.0f} µs per character')
+        print(f'{"case":<32}{"first output":>14}{"total":>10}{"requests":>10}')
+        # 先翻译一段文本，让耗时模型得到初始观测
+        list(core.translate_chunks(make_text(20000, 'warm-up'), 'EN', 'ZH', config=config))
+        for size in sizes:
+            cases = [('single request', lambda text: single_request(text, config)),
+                     ('adaptive, concurrent', lambda text: core.translate_chunks(text, 'EN', 'ZH', config=config))]
+            for name, run in cases:
+                text = make_text(size, f'{name} {size}')
+                requests = sum(server.requests.values())
+                first, total = measure(run(text))
+                print(f'{f"{size // 1000}k chars, {name}":<32}{first:>12.2f} s{total:>8.2f} s'
+                      f'{sum(server.requests.values()) - requests:>10}')
+        print(f'{server.contexts} requests carried context from the previous chunk')
+        close_translators()
+        close_caches()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deepl
+import yaml
+
+from mock_deepl import MockDeepLServer
+from pydeepl.client import close_translators, translator_from_config
+from pydeepl.config import read_config
+
+
+def translate_uncached(config_file, text):
+    # 旧实现：每次翻译都重新解析配置并新建 Translator
+    with open(config_file, 'r', encoding='utf-8') as file:
+        config = yaml.safe_load(file)
+    translator = deepl.Translator(config['deepl_api'], server_url=config['server_url'])
+    return translator.translate_text(text, target_lang='ZH').text
+
+
+def translate_cached(config_file, text):
+    config = read_config(config_file)
+    translator = translator_from_config(config)
+    return translator.translate_text(text, target_lang='ZH').text
+
+
+def measure(func, config_file, rounds):
+    func(config_file, 'warm up')
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        func(config_file, f'Hello world {i}')
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[len(samples) // 2], samples[int(len(samples) * 0.95)]
+
+
+def main(rounds=200):
+    with MockDeepLServer() as server, tempfile.TemporaryDirectory() as tmp:
+        config_file = os.path.join(tmp, 'PyDeeplConfig.yml')
+        with open(config_file, 'w', encoding='utf-8') as file:
+            yaml.safe_dump({'deepl_api': 'bench-key', 'server_url': server.url,
+                            'call_shortcut': '<ctrl>+<space>'}, file)
+
+        print(f'{"mode":<10}{"mean ms":>10}{"p50 ms":>10}{"p95 ms":>10}')
+        for name, func in (('before', translate_uncached), ('after', translate_cached)):
+            mean, p50, p95 = measure(func, config_file, rounds)
+            print(f'{name:<10}{mean:>10.3f}{p50:>10.3f}{p95:>10.3f}')
+        close_translators()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydeepl.config import ConfigService
+
+CONFIG = '''deepl_api: "{key}"
+call_shortcut: <ctrl>+<space>
+live_translate:
+  enabled: true
+  debounce_ms: 500
+scheduler:
+  rate: 5
+  burst: 10
+'''
+
+
+def per_call(service, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        service.snapshot()
+    return (time.perf_counter() - start) / calls
+
+
+def main(calls=100000, changes=20, interval=0.1):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'PyDeeplConfig.yml')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(CONFIG.format(key='key-0'))
+
+        # 未启动监视线程时每次读取都检查文件的 mtime；启动后只读取内存中的快照
+        unwatched = ConfigService(path)
+        print(f'{"read, stat per call":<28}{per_call(unwatched, calls) * 1e6:>8.2f} µs')
+        watched = ConfigService(path, interval=interval)
+        watched.start()
+        print(f'{"read, watched snapshot":<28}{per_call(watched, calls) * 1e6:>8.2f} µs')
+
+        # 从写入文件到发布新快照的延迟，取决于轮询间隔
+        delays = []
+        published = []
+        watched.subscribe(lambda old, new: published.append(time.perf_counter()))
+        for i in range(1, changes + 1):
+            written = time.perf_counter()
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(CONFIG.format(key=f'key-{i}'))
+            while len(published) < i:
+                time.sleep(0.001)
+            delays.append(published[-1] - written)
+        watched.stop()
+        delays.sort()
+        print(f'{"reload after write":<28}{delays[len(delays) // 2] * 1000:>8.1f} ms median, '
+              f'{delays[-1] * 1000:.1f} ms max (poll every {interval * 1000:.0f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydeepl import detect
+from pydeepl.detect import detect_language, resolve_source
+
+# 与模型样本文本不重叠的测试语料
+CORPUS = {
+    'EN': [
+        'Click the button below to download the latest version of the software.',
+        'I will be out of the office until Monday, so please send urgent requests to my colleague.',
+        'The meeting has been moved to Thursday afternoon because several people could not attend.',
+        'This function returns a list of all users who have logged in during the last thirty days.',
+        'She told me that she would rather stay at home and read a book than go to the party.',
+        'Thank you for your order! Your package should arrive within three to five business days.',
+        'Our results show that the new method is faster and uses less memory than the old one.',
+        'Do you know where I can find a good place to eat around here?',
+    ],
+    'DE': [
+        'Klicken Sie auf die Schaltfläche unten, um die neueste Version der Software herunterzuladen.',
+        'Ich bin bis Montag nicht im Büro, bitte senden Sie dringende Anfragen an meinen Kollegen.',
+        'Die Besprechung wurde auf Donnerstagnachmittag verschoben, weil mehrere Personen nicht teilnehmen konnten.',
+        'Diese Funktion gibt eine Liste aller Benutzer zurück, die sich in den letzten dreißig Tagen angemeldet haben.',
+        'Sie sagte mir, dass sie lieber zu Hause bleiben und ein Buch lesen würde, als auf die Party zu gehen.',
+        'Vielen Dank für Ihre Bestellung! Ihr Paket sollte innerhalb von drei bis fünf Werktagen ankommen.',
+        'Unsere Ergebnisse zeigen, dass die neue Methode schneller ist und weniger Speicher braucht.',
+        'Weißt du, wo ich hier in der Gegend gut essen kann?',
+    ],
+    'FR': [
+        'Cliquez sur le bouton ci-dessous pour télécharger la dernière version du logiciel.',
+        "Je serai absent du bureau jusqu'à lundi, merci d'envoyer les demandes urgentes à mon collègue.",
+        "La réunion a été déplacée à jeudi après-midi parce que plusieurs personnes ne pouvaient pas venir.",
+        'Cette fonction renvoie la liste de tous les utilisateurs qui se sont connectés au cours des trente derniers jours.',
+        "Elle m'a dit qu'elle préférait rester à la maison et lire un livre plutôt que d'aller à la fête.",
+        'Merci pour votre commande ! Votre colis devrait arriver dans un délai de trois à cinq jours ouvrables.',
+        "Nos résultats montrent que la nouvelle méthode est plus rapide et utilise moins de mémoire que l'ancienne.",
+        'Savez-vous où je peux trouver un bon endroit pour manger par ici ?',
+    ],
+    'IT': [
+        "Fai clic sul pulsante qui sotto per scaricare l'ultima versione del programma.",
+        "Sarò fuori ufficio fino a lunedì, quindi vi prego di inviare le richieste urgenti al mio collega.",
+        'La riunione è stata spostata a giovedì pomeriggio perché diverse persone non potevano partecipare.',
+        'Questa funzione restituisce un elenco di tutti gli utenti che hanno effettuato l\'accesso negli ultimi trenta giorni.',
+        'Mi ha detto che preferirebbe restare a casa a leggere un libro piuttosto che andare alla festa.',
+        'Grazie per il tuo ordine! Il pacco dovrebbe arrivare entro tre-cinque giorni lavorativi.',
+        'I nostri risultati mostrano che il nuovo metodo è più veloce e usa meno memoria di quello vecchio.',
+        'Sai dove posso trovare un buon posto per mangiare qui vicino?',
+    ],
+    'ES': [
+        'Haga clic en el botón de abajo para descargar la última versión del programa.',
+        'Estaré fuera de la oficina hasta el lunes, así que envíe las solicitudes urgentes a mi compañero.',
+        'La reunión se ha trasladado al jueves por la tarde porque varias personas no podían asistir.',
+        'Esta función devuelve una lista de todos los usuarios que han iniciado sesión en los últimos treinta días.',
+        'Me dijo que prefería quedarse en casa y leer un libro en lugar de ir a la fiesta.',
+        '¡Gracias por su pedido! Su paquete debería llegar en un plazo de tres a cinco días hábiles.',
+        'Nuestros resultados muestran que el nuevo método es más rápido y usa menos memoria que el anterior.',
+        '¿Sabes dónde puedo encontrar un buen sitio para comer por aquí?',
+    ],
+    'PT': [
+        'Clique no botão abaixo para transferir a versão mais recente do programa.',
+        'Estarei fora do escritório até segunda-feira, por isso envie os pedidos urgentes ao meu colega.',
+        'A reunião foi adiada para quinta-feira à tarde porque várias pessoas não podiam comparecer.',
+        'Esta função devolve uma lista de todos os utilizadores que iniciaram sessão nos últimos trinta dias.',
+        'Ela disse-me que preferia ficar em casa a ler um livro do que ir à festa.',
+        'Obrigado pela sua encomenda! A sua embalagem deverá chegar dentro de três a cinco dias úteis.',
+        'Os nossos resultados mostram que o novo método é mais rápido e usa menos memória do que o antigo.',
+        'Sabes onde posso encontrar um bom sítio para comer aqui perto?',
+    ],
+    'ZH': [
+        '点击下面的按钮下载最新版本的软件。',
+        '我周一之前不在办公室，紧急事务请联系我的同事。',
+        '由于好几个人无法参加，会议改到了周四下午。',
+        '这个函数返回最近三十天内登录过的所有用户的列表。',
+        '我们的结果表明，新方法比旧方法更快，占用的内存也更少。',
+        '请在 Windows 10 上安装 Python 3.8 或更高版本。',
+    ],
+    'JA': [
+        '下のボタンをクリックして、ソフトウェアの最新版をダウンロードしてください。',
+        '月曜日まで不在にしますので、急ぎの用件は同僚に送ってください。',
+        '何人かが参加できなかったため、会議は木曜日の午後に変更されました。',
+        'この関数は、過去三十日間にログインしたすべてのユーザーの一覧を返します。',
+        'ご注文ありがとうございます。荷物は三日から五日以内に届く予定です。',
+    ],
+    'RU': [
+        'Нажмите кнопку ниже, чтобы скачать последнюю версию программы.',
+        'Я буду в отъезде до понедельника, поэтому срочные запросы отправляйте моему коллеге.',
+        'Встреча перенесена на вечер четверга, потому что несколько человек не смогли прийти.',
+        'Наши результаты показывают, что новый метод быстрее и использует меньше памяти.',
+        'Ты знаешь, где здесь можно хорошо поесть?',
+    ],
+    # 太短、无法可靠判断的文本，以及模型之外的语言（荷兰语、瑞典语、波兰语、乌克兰语等），应交给 DeepL 自动检测
+    None: ['OK', 'Hello!', 'Paris', 'Ciao', 'Danke', 'v1.2.3', '東京',
+           'Dit is een Nederlandse zin over het weer en de stad waar wij wonen.',
+           'Klik op de knop hieronder om de nieuwste versie van de software te downloaden.',
+           'Jag är inte på kontoret förrän på måndag, så skicka brådskande förfrågningar till min kollega.',
+           'Nie będzie mnie w biurze do poniedziałku, więc pilne sprawy proszę kierować do mojego kolegi.',
+           'Spotkanie zostało przeniesione na czwartek po południu, ponieważ kilka osób nie mogło przyjść.',
+           'Birkaç kişi katılamadığı için toplantı perşembe öğleden sonraya ertelendi.',
+           'Привіт, як справи? Це українська мова, і вона дуже гарна.'],
+}
+
+# 只有汉字的文本无法区分中文与日文、简体与繁体，目标语言为中文时也必须发送给 DeepL
+MUST_TRANSLATE = [
+    ('這個函數會傳回最近三十天內登入過的所有使用者的清單。', 'ZH'),
+    ('由於好幾個人無法參加，會議改到了週四下午。', 'ZH'),
+    ('点击下面的按钮下载最新版本的软件。', 'ZH'),
+    ('東京都千代田区丸内一丁目', 'ZH'),
+    ('会議室予約', 'ZH'),
+    ('株式会社東京電力本社営業部', 'ZH'),
+]
+
+TARGETS = ['ZH', 'EN-US', 'JA', 'FR', 'DE', 'IT', 'ES', 'PT-PT', 'RU']
+
+
+def accuracy():
+    correct = wrong = unknown = 0
+    for lang, texts in CORPUS.items():
+        for text in texts:
+            detected = detect_language(text)
+            if detected == lang:
+                correct += 1
+            elif detected is None:
+                unknown += 1
+            else:
+                wrong += 1
+                print(f'  misdetected {lang} as {detected}: {text[:60]}')
+    total = correct + wrong + unknown
+    print(f'accuracy: {correct}/{total} correct, {unknown} left to DeepL, {wrong} wrong')
+
+
+def must_translate():
+    skipped = 0
+    for text, target in MUST_TRANSLATE:
+        source, same = resolve_source(text, None, target, {})
+        if same:
+            skipped += 1
+            print(f'  skipped {text} -> {target} (detected {source})')
+    print(f'han-only texts: {len(MUST_TRANSLATE) - skipped}/{len(MUST_TRANSLATE)} sent to DeepL, {skipped} skipped')
+    return skipped == 0
+
+
+def latency(sizes=(1, 4, 16)):
+    detect._model = None
+    start = time.perf_counter()
+    detect._load_model()
+    print(f'model build (first call): {(time.perf_counter() - start) * 1000:.1f} ms')
+    for lang in ('EN', 'ZH'):
+        base = ' '.join(CORPUS[lang])
+        for kb in sizes:
+            text = (base * (kb * 1024 // len(base.encode('utf-8')) + 1)).encode('utf-8')[:kb * 1024]
+            text = text.decode('utf-8', 'ignore')
+            rounds = 200
+            start = time.perf_counter()
+            for _ in range(rounds):
+                detect_language(text)
+            elapsed = (time.perf_counter() - start) / rounds
+            print(f'{lang} {kb:>3} KB: {elapsed * 1e6:>8.0f} us/call, {elapsed * 1e6 / kb:>8.0f} us/KB')
+
+
+def saved_requests(requests=2000, same_language_share=0.2, seed=1):
+    # 模拟自动检测下的请求：一部分文本本身已是目标语言
+    rng = random.Random(seed)
+    samples = [(lang, text) for lang, texts in CORPUS.items() if lang for text in texts]
+    saved = no_op = precise = 0
+    for _ in range(requests):
+        lang, text = rng.choice(samples)
+        if rng.random() < same_language_share:
+            target = {'EN': 'EN-US', 'PT': 'PT-PT'}.get(lang, lang)
+        else:
+            target = rng.choice([t for t in TARGETS if not t.startswith(lang)])
+        no_op += target.startswith(lang)
+        source, same = resolve_source(text, None, target, {})
+        saved += same
+        precise += source is not None and not same
+    print(f'{requests} auto-detect requests, {no_op} already in the target language')
+    print(f'  skipped locally:        {saved} ({saved / requests:.1%} of requests saved)')
+    print(f'  sent with source_lang:  {precise} ({precise / requests:.1%})')
+    print(f'  left to DeepL:          {requests - saved - precise}')
+
+
+if __name__ == '__main__':
+    latency()
+    accuracy()
+    passed = must_translate()
+    saved_requests()
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_deepl import MockDeepLServer
+from pydeepl.client import close_translators, get_translator
+from pydeepl.documents import translate_documents
+
+
+def make_files(directory, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'doc{i}.txt')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(f'Document {i}\n' * 200)
+        paths.append(path)
+    return paths
+
+
+def main(count=8, document_time=1.0, baseline=False):
+    with MockDeepLServer(document_time=document_time) as server, tempfile.TemporaryDirectory() as tmp:
+        translator = get_translator('bench-key', server.url)
+        paths = make_files(tmp, count)
+        print(f'{count} documents, {document_time:.1f} s simulated translation time each')
+
+        if baseline:
+            # 旧实现：逐个调用 translate_document_from_filepath（固定每 5 秒轮询一次）
+            output_dir = os.path.join(tmp, 'out')
+            os.makedirs(output_dir)
+            start = time.perf_counter()
+            for path in paths:
+                translator.translate_document_from_filepath(path, os.path.join(output_dir, os.path.basename(path)),
+                                                            target_lang='ZH')
+            elapsed = time.perf_counter() - start
+            print(f'{"sequential (deepl)":<22}{elapsed:>9.2f} s{count / elapsed:>10.2f} docs/s')
+
+        for workers in (1, 4, 8):
+            output_dir = os.path.join(tmp, f'out{workers}')
+            start = time.perf_counter()
+            results = translate_documents(translator, paths, 'ZH', output_dir=output_dir, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            failed = sum(1 for result in results if not result.ok)
+            print(f'{f"max_workers={workers}":<22}{elapsed:>9.2f} s{count / elapsed:>10.2f} docs/s'
+                  + (f'  ({failed} failed)' if failed else ''))
+        close_translators()
+
+
+if __name__ == '__main__':
+    main(baseline='--baseline' in sys.argv)
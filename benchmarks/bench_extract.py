@@ -0,0 +1,115 @@
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_deepl import MockDeepLServer
+from pydeepl import core
+from pydeepl.cache import close_caches
+from pydeepl.client import close_translators
+
+LABELS = ['Pending', 'Approved', 'Rejected', 'In progress', 'Shipped to customer', 'Awaiting payment',
+          'Cancelled by user', 'Refund issued', 'Out of stock', 'Back-ordered item']
+# DeepL 对每个文档至少按 50000 字符计费
+DOCUMENT_MIN_CHARACTERS = 50000
+
+
+def column(index):
+    name = ''
+    while True:
+        index, rest = divmod(index, 26)
+        name = chr(65 + rest) + name
+        if not index:
+            return name
+        index -= 1
+
+
+def make_xlsx(path, rows, columns=6):
+    # 状态列等重复的标签：共享字符串表中只有少量不重复的字符串，单元格只引用其序号
+    rng = random.Random(1)
+    strings = LABELS + [f'Order note {i}' for i in range(rows // 20)]
+    cells = []
+    total = 0
+    for row in range(1, rows + 1):
+        values = []
+        for col in range(columns):
+            index = rng.randrange(len(LABELS)) if col else len(LABELS) + rng.randrange(len(strings) - len(LABELS))
+            total += len(strings[index])
+            values.append(f'<c r="{column(col)}{row}" t="s"><v>{index}</v></c>')
+        cells.append(f'<row r="{row}">{"".join(values)}</row>')
+    main = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    rel = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml',
+                         '<?xml version="1.0" encoding="UTF-8"?><Types xmlns="http://schemas.openxmlformats.org/'
+                         'package/2006/content-types"><Default Extension="rels" ContentType="application/vnd.'
+                         'openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType='
+                         '"application/xml"/></Types>')
+        archive.writestr('_rels/.rels', f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="http://'
+                                        f'schemas.openxmlformats.org/package/2006/relationships"><Relationship '
+                                        f'Id="rId1" Type="{rel}/officeDocument" Target="xl/workbook.xml"/>'
+                                        f'</Relationships>')
+        archive.writestr('xl/workbook.xml', f'<?xml version="1.0" encoding="UTF-8"?><workbook xmlns="{main}" '
+                                            f'xmlns:r="{rel}"><sheets><sheet name="Orders" sheetId="1" '
+                                            f'r:id="rId1"/></sheets></workbook>')
+        archive.writestr('xl/_rels/workbook.xml.rels',
+                         f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="http://schemas.'
+                         f'openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="{rel}/'
+                         f'worksheet" Target="worksheets/sheet1.xml"/><Relationship Id="rId2" Type="{rel}/'
+                         f'sharedStrings" Target="sharedStrings.xml"/></Relationships>')
+        archive.writestr('xl/worksheets/sheet1.xml', f'<?xml version="1.0" encoding="UTF-8"?><worksheet '
+                                                     f'xmlns="{main}"><sheetData>{"".join(cells)}</sheetData>'
+                                                     f'</worksheet>')
+        archive.writestr('xl/sharedStrings.xml', f'<?xml version="1.0" encoding="UTF-8"?><sst xmlns="{main}" '
+                                                 f'count="{rows * columns}" uniqueCount="{len(strings)}">'
+                                                 + ''.join(f'<si><t>{escape(text)}</t></si>' for text in strings)
+                                                 + '</sst>')
+    return total
+
+
+def make_xliff(path, units):
+    rng = random.Random(2)
+    texts = [LABELS[rng.randrange(len(LABELS))] for _ in range(units)]
+    body = ''.join(f'<trans-unit id="u{i}"><source>{escape(text)}</source></trans-unit>'
+                   for i, text in enumerate(texts))
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?><xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:'
+                   'document:1.2"><file source-language="en" datatype="plaintext" original="app"><body>'
+                   f'{body}</body></file></xliff>')
+    return sum(len(text) for text in texts)
+
+
+def main(rows=20000, units=5000, latency=0.05, document_time=2.0):
+    with MockDeepLServer(latency=latency, document_time=document_time) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        xlsx = os.path.join(tmp, 'orders.xlsx')
+        xliff = os.path.join(tmp, 'strings.xlf')
+        cases = [(xlsx, make_xlsx(xlsx, rows)), (xliff, make_xliff(xliff, units))]
+        print(f'{"case":<28}{"wall":>9}{"billed chars":>15}')
+        for extract in (False, True):
+            for path, characters in cases:
+                # 每个用例使用单独的翻译缓存
+                config = {'deepl_api': 'bench-key', 'server_url': server.url, 'extract_files': extract,
+                          'cache': {'path': os.path.join(tmp, f'{os.path.basename(path)}{extract}.db')},
+                          'scheduler': {'rate': 100000, 'burst': 100000},
+                          'document_jobs': {'path': os.path.join(tmp, 'jobs.db')}}
+                sent = server.character_count
+                start = time.perf_counter()
+                results = core.translate_files([path], 'DE', config=config, output_dir=os.path.join(tmp, 'out'))
+                elapsed = time.perf_counter() - start
+                assert results[0].ok, results[0].error
+                # 文档接口按文档中全部文字计费（重复的也计入）；本地提取只计实际发送的文本
+                billed = max(characters, DOCUMENT_MIN_CHARACTERS) if not extract else server.character_count - sent
+                name = f'{os.path.basename(path)}, {"extract" if extract else "document API"}'
+                print(f'{name:<28}{elapsed:>7.2f} s{billed:>15}')
+        close_translators()
+        close_caches()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_deepl import MockDeepLServer
+from pydeepl import core
+from pydeepl.cache import close_caches
+from pydeepl.client import close_translators
+from pydeepl.fanout import all_ok
+from pydeepl.languages import target_map
+
+TEXT = 'The quick brown fox jumps over the lazy dog. This sentence is translated into every language. '
+
+
+def make_files(directory, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'doc{i}.txt')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(f'Document {i}\n' * 200)
+        paths.append(path)
+    return paths
+
+
+def row(name, elapsed, slowest=None):
+    print(f'{name:<28}{elapsed:>9.2f} s' + (f'{slowest:>14.2f} s' if slowest is not None else ''))
+
+
+def main(latency=0.2, document_time=1.0, documents=2):
+    targets = list(target_map)
+    with MockDeepLServer(latency=latency, document_time=document_time) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        # 文件走文档接口；调度器放开速率和同时进行的请求数，只比较串行与并发
+        config = {'deepl_api': 'bench-key', 'server_url': server.url, 'cache': {'path': os.path.join(tmp, 'c.db')},
+                  'document_jobs': {'path': os.path.join(tmp, 'jobs.db')}, 'stream_text_files': False,
+                  'scheduler': {'rate': 100000, 'burst': 100000, 'max_concurrent': 64}}
+        print(f'{len(targets)} target languages, {latency * 1000:.0f} ms latency per request, '
+              f'{document_time:.1f} s per document')
+        print(f'{"case":<28}{"wall":>11}{"slowest lang":>16}')
+
+        # 每轮使用不同的文本，避免命中翻译缓存
+        start = time.perf_counter()
+        for target in targets:
+            core.translate(TEXT + 'sequential', None, target, config=config)
+        row('text, sequential', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        results = core.translate_targets(TEXT + 'fan-out', targets, config=config)
+        elapsed = time.perf_counter() - start
+        assert all_ok(results), results
+        row('text, fan-out', elapsed, max(result.elapsed for result in results.values()))
+
+        paths = make_files(tmp, documents)
+        start = time.perf_counter()
+        for target in targets:
+            core.translate_files(paths, target, output_dir=os.path.join(tmp, 'seq', target), config=config)
+        row(f'{documents} documents, sequential', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        results = core.translate_files_targets(paths, targets, output_dir=os.path.join(tmp, 'fan'), config=config)
+        elapsed = time.perf_counter() - start
+        assert all_ok(results), results
+        row(f'{documents} documents, fan-out', elapsed, max(result.elapsed for result in results.values()))
+
+        close_translators()
+        close_caches()
+
+
+if __name__ == '__main__':
+    main()
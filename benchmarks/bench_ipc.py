@@ -0,0 +1,59 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_deepl import MockDeepLServer
+from pydeepl.ipc import IPCServer, connect, default_handlers
+
+PORT = 47366
+
+
+def timed(fn, rounds):
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(rounds=20, latency=0.05):
+    with MockDeepLServer(latency=latency) as server, tempfile.TemporaryDirectory() as tmp:
+        config_path = os.path.join(tmp, 'config.yml')
+        with open(config_path, 'w', encoding='utf-8') as file:
+            file.write(f'deepl_api: bench-key\nserver_url: {server.url}\nipc_port: {PORT}\n'
+                       f'cache:\n  path: {os.path.join(tmp, "cache.db")}\n')
+        config = {'deepl_api': 'bench-key', 'server_url': server.url, 'ipc_port': PORT,
+                  'cache': {'path': os.path.join(tmp, 'cache.db')}}
+        ipc = IPCServer(default_handlers(lambda: config), PORT)
+        ipc.start()
+
+        env = dict(os.environ, PYTHONPATH=ROOT)
+
+        def cli(i, *extra):
+            subprocess.run([sys.executable, '-m', 'pydeepl', *extra, '--config', config_path,
+                            f'Cold process request {i}', '-t', 'ZH'],
+                           env=env, capture_output=True, check=True)
+
+        print(f'backend latency {latency * 1000:.0f} ms, median of {rounds} calls')
+        print(f'{"cold CLI process":<34}{timed(cli, rounds):>8.1f} ms')
+        print(f'{"CLI --remote (new process)":<34}{timed(lambda i: cli(i, "--remote"), rounds):>8.1f} ms')
+
+        with connect(PORT) as client:
+            miss = timed(lambda i: client.request('translate', text=f'Warm request {i}', target='ZH'), rounds)
+            hit = timed(lambda i: client.request('translate', text=f'Warm request {i}', target='ZH'), rounds)
+            ping = timed(lambda i: client.request('ping'), rounds)
+        print(f'{"IPC client, cache miss":<34}{miss:>8.1f} ms')
+        print(f'{"IPC client, cache hit":<34}{hit:>8.1f} ms')
+        print(f'{"IPC round trip (ping)":<34}{ping:>8.2f} ms')
+        ipc.stop()
+
+
+if __name__ == '__main__':
+    main()
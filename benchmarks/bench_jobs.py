@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_deepl import MockDeepLServer
+from pydeepl import core
+from pydeepl.cache import close_caches
+from pydeepl.client import close_translators
+from pydeepl.jobs import close_job_stores
+
+
+def make_files(directory, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'doc{i}.txt')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(f'Document {i}\n' * 2000)
+        paths.append(path)
+    return paths
+
+
+def interrupted_run(paths, output_dir, config, after):
+    # 上传完成后中途退出：与 MainWindow.exit_app 相同，先关闭任务记录，再取消正在进行的任务
+    cancelled = threading.Event()
+    thread = threading.Thread(target=core.translate_files, args=(paths, 'ZH'),
+                              kwargs={'output_dir': output_dir, 'config': config,
+                                      'is_cancelled': cancelled.is_set})
+    thread.start()
+    time.sleep(after)
+    close_job_stores()
+    cancelled.set()
+    thread.join()
+    close_translators()
+
+
+def main(count=8, document_time=2.0):
+    for resumable in (False, True):
+        with MockDeepLServer(document_time=document_time) as server, tempfile.TemporaryDirectory() as tmp:
+            config = {'deepl_api': 'bench-key', 'server_url': server.url, 'stream_text_files': False,
+                      'cache': {'path': os.path.join(tmp, 'c.db')}, 'scheduler': {'rate': 100000, 'burst': 100000},
+                      'max_concurrent_documents': count,
+                      'document_jobs': {'enabled': resumable, 'path': os.path.join(tmp, 'jobs.db')}}
+            paths = make_files(tmp, count)
+            output_dir = os.path.join(tmp, 'out')
+            interrupted_run(paths, output_dir, config, document_time / 2)
+            uploads = len(server.documents)
+
+            # 重新启动后：有任务记录时继续轮询和下载，否则只能重新翻译全部文件
+            start = time.perf_counter()
+            if resumable:
+                results = core.resume_files(config)
+            else:
+                results = core.translate_files(paths, 'ZH', output_dir=output_dir, config=config)
+            elapsed = time.perf_counter() - start
+            assert len(results) == count and all(result.ok for result in results), results
+            uploaded_characters = sum(len(document['content']) for document in server.documents.values())
+            name = 'resume from job store' if resumable else 'retranslate (no jobs)'
+            print(f'{name:<24}{elapsed:>8.2f} s  uploads {uploads} -> {len(server.documents)}'
+                  f'  billed {uploaded_characters} chars')
+            close_job_stores()
+            close_translators()
+            close_caches()
+
+
+if __name__ == '__main__':
+    main()
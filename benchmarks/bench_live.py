@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QPlainTextEdit
+
+from mock_deepl import MockDeepLServer
+from pydeepl.live import LiveTranslator
+from pydeepl.workers import TranslationWorkers
+
+KEYSTROKE_INTERVAL = 0.06
+
+
+def pump(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.001)
+
+
+def main(latency=0.15, debounce_ms=400):
+    app = QApplication(sys.argv)
+    with MockDeepLServer(latency=latency) as server, tempfile.TemporaryDirectory() as tmp:
+        # 边输入边翻译按配置决定是否增量翻译，这里测量增量模式：追加句子时只翻译新句子
+        config = {'deepl_api': 'bench-key', 'server_url': server.url, 'incremental': True,
+                  'cache': {'path': os.path.join(tmp, 'cache.db')},
+                  'live_translate': {'enabled': True, 'debounce_ms': debounce_ms, 'min_change': 3}}
+
+        editor = QPlainTextEdit()
+        workers = TranslationWorkers()
+        live = LiveTranslator(editor, workers, lambda: (None, 'ZH'), load_config=lambda: config)
+        live.configure(config)
+
+        renders = []
+        live.preview.connect(lambda text: renders.append((time.perf_counter(), text, 'preview')))
+        workers.result.connect(lambda kind, text: renders.append((time.perf_counter(), text, 'network')))
+
+        def type_text(text):
+            for char in text:
+                editor.insertPlainText(char)
+                pump(KEYSTROKE_INTERVAL)
+            return time.perf_counter()
+
+        def measure(name, text):
+            renders.clear()
+            before = sum(server.requests.values())
+            last_keystroke = type_text(text)
+            deadline = time.perf_counter() + 5
+            while time.perf_counter() < deadline:
+                pump(0.005)
+                if renders and not workers.is_busy('text') and not live.timer.isActive():
+                    break
+            first = renders[0][0] - last_keystroke if renders else float('nan')
+            final = renders[-1][0] - last_keystroke if renders else float('nan')
+            requests = sum(server.requests.values()) - before
+            print(f'{name:<28}{first * 1000:>10.0f}{final * 1000:>10.0f}{requests:>10}')
+
+        print(f'debounce {debounce_ms} ms, backend latency {latency * 1000:.0f} ms, '
+              f'keystroke every {KEYSTROKE_INTERVAL * 1000:.0f} ms')
+        print(f'{"scenario":<28}{"first ms":>10}{"final ms":>10}{"requests":>10}')
+        measure('type first sentence', 'The quick brown fox jumps over the lazy dog.')
+        measure('append second sentence', ' It was a sunny day.')
+        editor.clear()
+        pump(debounce_ms / 1000 + 0.1)
+        measure('retype cached text', 'The quick brown fox jumps over the lazy dog. It was a sunny day.')
+        workers.shutdown()
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_deepl import MockDeepLServer
+from pydeepl import core, metrics
+from pydeepl.cache import close_caches
+
+
+def per_call(fn, rounds):
+    start = time.perf_counter()
+    for i in range(rounds):
+        fn(i)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main(rounds=20000, network_rounds=300):
+    with MockDeepLServer(latency=0) as server, tempfile.TemporaryDirectory() as tmp:
+        base = {'deepl_api': 'bench-key', 'server_url': server.url, 'cache': {'path': os.path.join(tmp, 'cache.db')},
+                'detect_language': False, 'scheduler': {'rate': 100000, 'burst': 100000}}
+        modes = [
+            ('off', {'enabled': False}),
+            ('on, in memory', {'enabled': True, 'path': ''}),
+            ('on, jsonl', {'enabled': True, 'format': 'jsonl', 'path': os.path.join(tmp, 'metrics.jsonl')}),
+            ('on, prometheus', {'enabled': True, 'format': 'prometheus', 'path': os.path.join(tmp, 'metrics.prom')}),
+        ]
+        # 预先写入缓存，缓存命中路径没有网络请求，最能体现统计本身的开销
+        core.translate('Cached sentence.', 'EN', 'ZH', config=base)
+
+        print(f'{"metrics":<18}{"cache hit":>14}{"mock request":>16}')
+        for name, options in modes:
+            config = dict(base, metrics=options)
+            metrics.configure(config)
+            metrics.recorder.reset()
+            hit = per_call(lambda i: core.translate('Cached sentence.', 'EN', 'ZH', config=config), rounds)
+            miss = per_call(lambda i: core.translate(f'{name} request {i}', 'EN', 'ZH', config=config),
+                            network_rounds)
+            print(f'{name:<18}{hit:>11.2f} us{miss:>13.1f} us')
+        print()
+        print(metrics.format_summary(metrics.recorder.summary()))
+        metrics.close()
+        close_caches()
+
+
+if __name__ == '__main__':
+    main()
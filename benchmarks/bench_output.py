@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LINE = '这是一段用于测试的译文，包含中文和 English words mixed together。\n'
+
+
+def rss_mb():
+    # 当前进程的常驻内存；不支持的平台返回 None
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(mode, megabytes):
+    # 在子进程中运行，内存峰值互不影响
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication, QTextBrowser
+
+    from pydeepl.output import OutputView
+
+    app = QApplication([])
+    browser = QTextBrowser()
+    browser.resize(600, 400)
+    browser.show()
+    view = OutputView(browser)
+    app.processEvents()
+
+    text = LINE * (megabytes * 1024 * 1024 // len(LINE.encode('utf-8')))
+    before = rss_mb()
+    longest = 0.0
+    start = time.perf_counter()
+    if mode == 'old':
+        # 原实现：setText 交给文档一次性排版，复制时再用 toPlainText() 取回
+        browser.setText(text)
+        app.processEvents()
+        longest = time.perf_counter() - start
+    else:
+        # 模拟逐块到达的译文
+        for offset in range(0, len(text), 10000):
+            view.append(text[offset:offset + 10000])
+        while view.timer.isActive():
+            tick = time.perf_counter()
+            app.processEvents()
+            longest = max(longest, time.perf_counter() - tick)
+    render = time.perf_counter() - start
+
+    start = time.perf_counter()
+    copied = browser.toPlainText() if mode == 'old' else view.text()
+    copy = time.perf_counter() - start
+    assert len(copied) >= min(len(text), 1)
+    peak = peak_rss_mb()
+    return {'render_s': render, 'longest_block_ms': longest * 1000, 'copy_ms': copy * 1000,
+            'peak_mb': None if peak is None or before is None else peak - before}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='大文本输出：显示耗时、界面最长阻塞时间、复制耗时和内存峰值')
+    parser.add_argument('sizes', nargs='*', type=int, default=[1, 10, 50], help='文本大小（MB）')
+    parser.add_argument('--timeout', type=float, default=300, help='每个用例的超时时间（秒）')
+    parser.add_argument('--case', nargs=2, metavar=('MODE', 'MB'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]))))
+        return
+
+    print(f'{"case":<14}{"render s":>10}{"max block ms":>14}{"copy ms":>10}{"peak MB":>10}')
+    for megabytes in args.sizes:
+        for mode in ('old', 'new'):
+            name = f'{megabytes} MB {mode}'
+            try:
+                result = subprocess.run([sys.executable, __file__, '--case', mode, str(megabytes)],
+                                        capture_output=True, text=True, timeout=args.timeout, check=True)
+            except subprocess.TimeoutExpired:
+                print(f'{name:<14}{"timeout":>10}')
+                continue
+            data = json.loads(result.stdout.strip().splitlines()[-1])
+            peak = f'{data["peak_mb"]:.0f}' if data['peak_mb'] is not None else 'n/a'
+            print(f'{name:<14}{data["render_s"]:>10.2f}{data["longest_block_ms"]:>14.0f}{data["copy_ms"]:>10.1f}'
+                  f'{peak:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from mock_deepl import MockDeepLServer
+from pydeepl.cache import close_caches
+from pydeepl.client import close_translators
+from pydeepl.quick import QuickTranslator
+from pydeepl.workers import TranslationWorkers
+
+
+def wait(app, seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        app.processEvents(QEventLoop.AllEvents, 10)
+
+
+def hotkey(app, quick, workers):
+    # 与 MainWindow.on_hotkey 相同：缓存中有结果时直接显示，否则提交翻译并等待结果
+    start = time.perf_counter()
+    text = quick.capture()
+    if quick.lookup(text, None, 'ZH') is not None:
+        return (time.perf_counter() - start) * 1000
+    loop = QEventLoop()
+    workers.result.connect(loop.quit)
+    workers.submit('text', lambda job: quick.translate(text, None, 'ZH'))
+    QTimer.singleShot(10000, loop.quit)
+    loop.exec_()
+    workers.result.disconnect(loop.quit)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(rounds=10, latency=0.15):
+    app = QApplication(sys.argv)
+    clipboard = app.clipboard()
+    with MockDeepLServer(latency=latency) as server, tempfile.TemporaryDirectory() as tmp:
+        config = {'deepl_api': 'bench-key', 'server_url': server.url, 'cache': {'path': os.path.join(tmp, 'c.db')},
+                  'quick_translate': {'enabled': True, 'prefetch': True, 'prefetch_budget': 2000}}
+        workers = TranslationWorkers()
+        quick = QuickTranslator(clipboard, lambda: (None, 'ZH'), load_config=lambda: config)
+        quick.configure(config)
+
+        cold, prefetched, repeated = [], [], []
+        for i in range(rounds):
+            # 复制后立即按快捷键：预取与快捷键请求合并为一次
+            quick.prefetch = False
+            clipboard.setText(f'Cold clipboard text number {i}.')
+            cold.append(hotkey(app, quick, workers))
+            repeated.append(hotkey(app, quick, workers))
+            # 复制后过一会儿才按快捷键：预取已完成
+            quick.prefetch = True
+            clipboard.setText(f'Prefetched clipboard text number {i}.')
+            wait(app, latency * 2)
+            prefetched.append(hotkey(app, quick, workers))
+
+        print(f'backend latency {latency * 1000:.0f} ms, median of {rounds} hotkey presses')
+        print(f'{"new text, no prefetch":<30}{statistics.median(cold):>9.1f} ms')
+        print(f'{"new text, prefetched":<30}{statistics.median(prefetched):>9.1f} ms')
+        print(f'{"same text again":<30}{statistics.median(repeated):>9.1f} ms')
+
+        # 连续复制大量文字：只预取正在进行的和最新的一条，字符数不超过预算
+        sent = server.character_count
+        for i in range(200):
+            clipboard.setText(f'Budget test clipboard text number {i}.')
+            app.processEvents()
+        wait(app, latency * 3)
+        print(f'200 clipboard changes: prefetched {server.character_count - sent} chars, '
+              f'{quick.prefetched_characters} of {quick.prefetch_budget} chars budget used')
+
+        quick.shutdown()
+        workers.shutdown()
+        close_translators()
+        close_caches()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deepl
+
+from mock_deepl import MockDeepLServer
+from pydeepl.scheduler import BULK, INTERACTIVE, QuotaGuardError, scheduled_translator_from_config
+
+
+def flood(translate, count, workers=16):
+    failures = [0]
+
+    def run(i):
+        try:
+            translate(f'Text number {i}')
+        except Exception:
+            failures[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(run, range(count)))
+    return time.perf_counter() - start, failures[0]
+
+
+def throughput(count=200, rate_limit=20):
+    print(f'{count} requests from 16 threads, server allows {rate_limit} req/s')
+    with MockDeepLServer(rate_limit=rate_limit) as server:
+        translator = deepl.Translator('bench-key-raw', server_url=server.url)
+        elapsed, failures = flood(lambda text: translator.translate_text(text, target_lang='ZH'), count)
+        print(f'{"deepl built-in retry":<24}{elapsed:>8.2f} s{server.rejected:>6} x 429{failures:>6} failed')
+        translator.close()
+
+    with MockDeepLServer(rate_limit=rate_limit) as server:
+        config = {'deepl_api': 'bench-key', 'server_url': server.url,
+                  'scheduler': {'rate': rate_limit * 0.9, 'burst': 5}}
+        translator = scheduled_translator_from_config(config)
+        elapsed, failures = flood(lambda text: translator.translate_text(text, target_lang='ZH'), count)
+        print(f'{"scheduler":<24}{elapsed:>8.2f} s{server.rejected:>6} x 429{failures:>6} failed')
+
+
+def priority_lanes(bulk=60):
+    with MockDeepLServer(latency=0.01) as server:
+        config = {'deepl_api': 'bench-key-lanes', 'server_url': server.url,
+                  'scheduler': {'rate': 20, 'burst': 1, 'max_concurrent': 2}}
+        bulk_translator = scheduled_translator_from_config(config, BULK)
+        interactive = scheduled_translator_from_config(config, INTERACTIVE)
+        bulk_translator.get_usage()
+
+        executor = ThreadPoolExecutor(max_workers=bulk)
+        for i in range(bulk):
+            executor.submit(bulk_translator.translate_text, f'Bulk {i}', target_lang='ZH')
+        time.sleep(0.2)
+        start = time.perf_counter()
+        interactive.translate_text('Interactive', target_lang='ZH')
+        latency = time.perf_counter() - start
+        executor.shutdown(wait=True)
+        print(f'interactive latency behind {bulk} queued bulk requests: {latency * 1000:.0f} ms '
+              f'(bulk queue drains in ~{bulk / 20:.1f} s)')
+
+
+def quota_guard():
+    with MockDeepLServer(character_limit=1000) as server:
+        config = {'deepl_api': 'bench-key-quota', 'server_url': server.url}
+        translator = scheduled_translator_from_config(config)
+        sent = 0
+        try:
+            while True:
+                translator.translate_text('x' * 90, target_lang='ZH')
+                sent += 1
+        except QuotaGuardError as e:
+            print(f'quota guard stopped after {sent} requests: {e}')
+        except deepl.QuotaExceededException as e:
+            print(f'server rejected after {sent} requests: {e}')
+
+
+if __name__ == '__main__':
+    throughput()
+    priority_lanes()
+    quota_guard()
@@ -0,0 +1,152 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_baseline.json')
+
+# 图形界面在首次绘制前导入的模块；当前平台缺少的模块会被跳过并列出
+GUI_MODULES = ['PyQt5.QtWidgets', 'PyQt5.QtGui', 'gui', 'yaml', 'pydeepl.core', 'pydeepl.workers', 'pydeepl.live']
+# 窗口显示后才在后台导入的模块
+DEFERRED_MODULES = ['deepl', 'pynput', 'pystray', 'PIL.Image']
+HEADLESS_MODULES = ['pydeepl.cli']
+FORBIDDEN_MODULES = ['PyQt5', 'pystray', 'pynput', 'win32gui', 'win32api', 'win32con']
+
+TIMELINE_MARKS = ['import_qt', 'import_gui', 'import_pydeepl', 'window_created', 'first_paint', 'ready_for_input',
+                  'hotkey_ready', 'client_ready', 'tray_ready']
+
+
+def import_script(modules):
+    lines = ['import importlib, sys', 'missing = []']
+    for module in modules:
+        lines.append(f'try:\n    importlib.import_module({module!r})\nexcept ImportError:\n    missing.append({module!r})')
+    lines.append('print(",".join(missing))')
+    return '\n'.join(lines)
+
+
+def cold_start(modules, rounds):
+    script = import_script(modules)
+    samples = []
+    missing = ''
+    for _ in range(rounds):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', script], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        # -X importtime 输出的最后一列是累计耗时（微秒），取顶层模块之和
+        total = 0
+        for line in result.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                cumulative, name = line.split('|')[1:3]
+                if cumulative.strip().isdigit() and not name.startswith('  '):
+                    total += int(cumulative)
+        samples.append(total / 1000)
+        missing = result.stdout.strip()
+    return statistics.median(samples), missing
+
+
+def check_headless():
+    script = ('import sys\nimport pydeepl.cli\n'
+              f'print(",".join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))')
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def run_main(timeout=30):
+    # 启动 main.py，等它写出启动时间线后结束进程；返回 (各阶段耗时, 错误信息)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'timeline.json')
+        env = dict(os.environ, PYDEEPL_STARTUP_TIMELINE=path)
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        spawned = time.time()
+        process = subprocess.Popen([sys.executable, 'main.py'], cwd=ROOT, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        deadline = time.perf_counter() + timeout
+        while not os.path.exists(path) and process.poll() is None and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        if process.poll() is None:
+            process.terminate()
+        _, stderr = process.communicate()
+        if not os.path.exists(path):
+            lines = stderr.strip().splitlines()
+            return None, lines[-1] if lines else 'timed out'
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+    # 以进程创建时刻为起点，包含解释器自身的启动时间
+    offset = (data['started'] - spawned) * 1000
+    marks = {'interpreter': offset}
+    marks.update({name: offset + elapsed for name, elapsed in data['marks'].items()})
+    return marks, '; '.join(f'{name}: {error}' for name, error in data['errors'].items())
+
+
+def timeline(rounds):
+    samples = {}
+    errors = ''
+    for _ in range(rounds):
+        marks, errors = run_main()
+        if marks is None:
+            print(f'main.py did not start: {errors}')
+            return None
+        for name, elapsed in marks.items():
+            samples.setdefault(name, []).append(elapsed)
+    medians = {name: statistics.median(values) for name, values in samples.items()}
+    for name in ['interpreter'] + TIMELINE_MARKS:
+        if name in medians:
+            print(f'  {name:<18}{medians[name]:>10.1f} ms')
+    if errors:
+        print(f'  background init errors: {errors}')
+    return medians
+
+
+def compare(medians, tolerance):
+    if not os.path.exists(BASELINE_FILE):
+        print(f'no baseline at {BASELINE_FILE}; run with --save-baseline to create one')
+        return 0
+    with open(BASELINE_FILE, encoding='utf-8') as file:
+        baseline = json.load(file)
+    failed = 0
+    for name in ('first_paint', 'ready_for_input'):
+        if name in baseline and name in medians:
+            # 允许一定比例的波动，另加 20 ms 的绝对余量
+            limit = baseline[name] * (1 + tolerance) + 20
+            status = 'ok' if medians[name] <= limit else 'REGRESSION'
+            failed += status != 'ok'
+            print(f'  {name:<18}{medians[name]:>10.1f} ms  baseline {baseline[name]:.1f} ms  {status}')
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='启动耗时基准测试')
+    parser.add_argument('rounds', nargs='?', type=int, default=5)
+    parser.add_argument('--save-baseline', action='store_true', help='把本次结果保存为基线')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='相对基线允许变慢的比例')
+    args = parser.parse_args()
+
+    print('cold import time (median)')
+    for name, modules in (('headless', HEADLESS_MODULES), ('gui', GUI_MODULES), ('deferred', DEFERRED_MODULES)):
+        median, missing = cold_start(modules, args.rounds)
+        note = f'  (not installed: {missing})' if missing else ''
+        print(f'  {name:<18}{median:>10.1f} ms{note}')
+
+    leaked = check_headless()
+    if leaked:
+        print(f'headless path imported GUI modules: {leaked}')
+        return 1
+
+    print('main.py startup timeline (median, from process spawn)')
+    medians = timeline(args.rounds)
+    if medians is None:
+        return 0
+    if args.save_baseline:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as file:
+            json.dump({name: round(value, 1) for name, value in medians.items()}, file, indent=2)
+        print(f'baseline saved to {BASELINE_FILE}')
+        return 0
+    return compare(medians, args.tolerance)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_deepl import MockDeepLServer
+from pydeepl.batching import translate_many
+from pydeepl.client import close_translators, get_translator
+from pydeepl.streaming import stream_translate_file
+
+
+def make_srt(path, size):
+    with open(path, 'w', encoding='utf-8') as file:
+        index = 0
+        while file.tell() < size:
+            index += 1
+            file.write(f'{index}\n00:00:{index % 60:02d},000 --> 00:00:{index % 60:02d},900\n'
+                       f'Subtitle line number {index}.\nSecond line of the cue.\n\n')
+
+
+def make_text(path, size, newlines=True):
+    # 没有空行的文本：每句一行，或者整个文件只有一行
+    with open(path, 'w', encoding='utf-8') as file:
+        index = 0
+        while file.tell() < size:
+            index += 1
+            file.write(f'Sentence number {index} of a text without blank lines.' + ('\n' if newlines else ' '))
+
+
+FILES = {
+    'srt': ('.srt', make_srt),
+    'no blank': ('.txt', make_text),
+    'one line': ('.txt', lambda path, size: make_text(path, size, newlines=False)),
+}
+
+
+def main(sizes_mb=(1, 4, 8)):
+    with MockDeepLServer() as server, tempfile.TemporaryDirectory() as tmp:
+        translator = get_translator('bench-key', server.url)
+
+        def translate_batch(texts):
+            return translate_many(translator, texts, None, 'ZH')
+
+        # 内存峰值应只取决于块的上限，不随文件大小或有没有空行变化
+        print(f'{"file":<10}{"size":>8}{"time s":>10}{"MB/s":>8}{"peak MB":>10}')
+        for kind, (ext, make) in FILES.items():
+            for size_mb in sizes_mb:
+                source = os.path.join(tmp, f'{kind.replace(" ", "_")}{size_mb}{ext}')
+                make(source, size_mb * 1024 * 1024)
+                tracemalloc.start()
+                start = time.perf_counter()
+                stream_translate_file(source, source[:-len(ext)] + f'_translated{ext}', translate_batch)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                tracemalloc.stop()
+                print(f'{kind:<10}{size_mb:>6}MB{elapsed:>10.2f}{size_mb / elapsed:>8.2f}{peak:>10.1f}')
+        close_translators()
+
+
+if __name__ == '__main__':
+    main(tuple(int(size) for size in sys.argv[1:]) or (1, 4, 8))
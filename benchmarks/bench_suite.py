@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'suite_baseline.json')
+sys.path.insert(0, ROOT)
+
+from mock_deepl import MockDeepLServer
+from pydeepl import core
+from pydeepl.cache import close_caches
+from pydeepl.client import close_translators
+from pydeepl.metrics import percentile
+
+# 与界面相同的入口（core.translate / translate_texts / translate_files），每个场景使用独立的模拟服务、
+# API 密钥（即独立的调度器）和缓存；调度器不限速，测得的是客户端自身的开销
+PARAGRAPH = ('The quick brown fox jumps over the lazy dog while the committee reviews the quarterly report. '
+             'Please make sure that every section is translated consistently and that the terminology matches. ')
+
+
+def short_text(context, i):
+    text = f'Short sentence number {i} for the benchmark.'
+    core.translate(text, None, 'ZH', config=context['config'])
+    return len(text)
+
+
+def large_text(context, i):
+    # 约 50 KB，低于 DeepL 单次请求的大小限制
+    text = f'Round {i}. ' + PARAGRAPH * 256
+    core.translate(text, None, 'ZH', config=context['config'])
+    return len(text)
+
+
+def many_small_texts(context, i):
+    texts = [f'Menu item {i}-{n}' for n in range(1000)]
+    core.translate_texts(texts, 'EN', 'ZH', config=context['config'])
+    return sum(len(text) for text in texts)
+
+
+def documents(context, i):
+    # 一半走文档接口，一半（.txt）通过文本接口流式翻译
+    paths = []
+    for n in range(16):
+        path = os.path.join(context['tmp'], f'doc{i}-{n}.{"html" if n % 2 else "txt"}')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(f'Document {i}-{n}\n' + PARAGRAPH * 20)
+        paths.append(path)
+    results = core.translate_files(paths, 'ZH', output_dir=os.path.join(context['tmp'], f'out{i}'),
+                                   config=context['config'])
+    failed = [result.error for result in results if not result.ok]
+    if failed:
+        raise RuntimeError(failed[0])
+    return sum(os.path.getsize(path) for path in paths)
+
+
+# 名称 -> (函数, 每次重复的轮数, 模拟服务参数)
+SCENARIOS = {
+    'short_text': (short_text, 200, {}),
+    'large_text': (large_text, 10, {}),
+    'many_small_texts': (many_small_texts, 5, {}),
+    'documents': (documents, 2, {'document_time': 0.2}),
+    'faults': (short_text, 100, {'error_rate': 0.03, 'throttle_rate': 0.02, 'retry_after': 0.1, 'seed': 1}),
+}
+
+
+def run_scenario(name, latency, repeat):
+    fn, rounds, server_options = SCENARIOS[name]
+    with MockDeepLServer(latency=latency, **server_options) as server, tempfile.TemporaryDirectory() as tmp:
+        context = {'tmp': tmp, 'config': {
+            'deepl_api': f'bench-{name}', 'server_url': server.url,
+            'cache': {'path': os.path.join(tmp, 'cache.db')},
+            'scheduler': {'rate': 100000, 'burst': 100000},
+        }}
+        fn(context, -1)
+
+        # 重复多次：分位数取全部样本，吞吐量取最好的一次，减少偶发抖动造成的误报
+        samples = []
+        best = None
+        for repetition in range(repeat):
+            units = 0
+            start = time.perf_counter()
+            for i in range(repetition * rounds, (repetition + 1) * rounds):
+                started = time.perf_counter()
+                units += fn(context, i)
+                samples.append(time.perf_counter() - started)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best[0]:
+                best = (elapsed, units)
+        elapsed, units = best
+
+        # 单独再跑一轮统计内存峰值，避免 tracemalloc 影响上面的耗时
+        tracemalloc.start()
+        fn(context, repeat * rounds)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        close_translators()
+        close_caches()
+        samples.sort()
+        return {
+            'ops_per_s': rounds / elapsed,
+            'kb_per_s': units / 1024 / elapsed,
+            'p50_ms': percentile(samples, 0.5) * 1000,
+            'p95_ms': percentile(samples, 0.95) * 1000,
+            'p99_ms': percentile(samples, 0.99) * 1000,
+            'peak_mb': peak / 1024 / 1024,
+            'faults': server.failed + server.throttled,
+        }
+
+
+def compare(results, baseline, tolerance):
+    # 耗时和内存允许变差 tolerance 比例（另加少量绝对余量），吞吐量允许下降同样比例
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            # 没有基线的场景无法对比，同样视为失败，需用 --save-baseline 显式保存
+            regressions.append(f'{name}: no baseline')
+            continue
+        checks = [
+            ('p50_ms', result['p50_ms'] > base['p50_ms'] * (1 + tolerance) + 1),
+            ('p95_ms', result['p95_ms'] > base['p95_ms'] * (1 + tolerance) + 2),
+            ('kb_per_s', result['kb_per_s'] < base['kb_per_s'] / (1 + tolerance)),
+            ('peak_mb', result['peak_mb'] > base['peak_mb'] * (1 + tolerance) + 1),
+        ]
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append(f'{name}.{metric}: {result[metric]:.2f} (baseline {base[metric]:.2f})')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='翻译路径基准测试：延迟分位数、吞吐量和内存峰值，并与基线对比')
+    parser.add_argument('scenarios', nargs='*', help=f'要运行的场景（{", ".join(SCENARIOS)}），默认全部')
+    parser.add_argument('--latency', type=float, default=0.0, help='模拟服务每个请求的额外延迟（秒）')
+    parser.add_argument('--repeat', type=int, default=3, help='每个场景重复的次数')
+    parser.add_argument('--save-baseline', action='store_true', help='把本次结果保存为基线')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='相对基线允许变差的比例')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f'未知场景：{", ".join(unknown)}')
+    names = args.scenarios or list(SCENARIOS)
+    print(f'{"scenario":<18}{"ops/s":>9}{"KB/s":>10}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"peak MB":>9}'
+          f'{"faults":>8}')
+    results = {}
+    for name in names:
+        result = results[name] = run_scenario(name, args.latency, args.repeat)
+        print(f'{name:<18}{result["ops_per_s"]:>9.1f}{result["kb_per_s"]:>10.1f}{result["p50_ms"]:>9.2f}'
+              f'{result["p95_ms"]:>9.2f}{result["p99_ms"]:>9.2f}{result["peak_mb"]:>9.2f}{result["faults"]:>8}')
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_FILE):
+            with open(BASELINE_FILE, encoding='utf-8') as file:
+                baseline = json.load(file)
+        baseline.update({name: {key: round(value, 3) for key, value in result.items()}
+                         for name, result in results.items()})
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as file:
+            json.dump(baseline, file, indent=2)
+        print(f'baseline saved to {BASELINE_FILE}')
+        return 0
+    if not os.path.exists(BASELINE_FILE):
+        # 没有基线时什么也没对比，返回非零，避免在新检出的仓库或 CI 中被当作通过
+        print(f'no baseline at {BASELINE_FILE}; nothing was compared. Run with --save-baseline to create one',
+              file=sys.stderr)
+        return 1
+    with open(BASELINE_FILE, encoding='utf-8') as file:
+        regressions = compare(results, json.load(file), args.tolerance)
+    if regressions:
+        print('REGRESSION')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print(f'no regressions (tolerance {args.tolerance:.0%})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
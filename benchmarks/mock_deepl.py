@@ -0,0 +1,335 @@
+import email.parser
+import email.policy
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# 本地模拟的 DeepL v2 接口，仅用于基准测试
+class MockDeepLHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        self.handle_request()
+
+    def do_DELETE(self):
+        self.handle_request()
+
+    def handle_request(self):
+        server = self.server
+        body = self.read_body()
+        server.count_request(self.path)
+
+        if not self.headers.get('Authorization', '').startswith('DeepL-Auth-Key '):
+            self.send_json(403, {'message': 'Invalid auth key'})
+            return
+
+        retry_after = server.check_rate_limit()
+        if retry_after is not None:
+            self.send_json(429, {'message': 'Too many requests'}, {'Retry-After': retry_after})
+            return
+
+        fault = server.inject_fault()
+        if fault == 429:
+            self.send_json(429, {'message': 'Too many requests'}, {'Retry-After': server.retry_after})
+            return
+        if fault == 503:
+            self.send_json(503, {'message': 'Service unavailable'})
+            return
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        path = urllib.parse.urlparse(self.path).path
+        parts = path.strip('/').split('/')
+        if path == '/v2/translate':
+            self.translate(body)
+        elif path == '/v2/document':
+            self.document_upload(body)
+        elif len(parts) == 3 and parts[:2] == ['v2', 'document']:
+            self.document_status(parts[2], body)
+        elif len(parts) == 4 and parts[:2] == ['v2', 'document'] and parts[3] == 'result':
+            self.document_result(parts[2], body)
+        elif path == '/v2/glossaries':
+            self.glossaries(body)
+        elif len(parts) == 3 and parts[:2] == ['v2', 'glossaries']:
+            self.glossary(parts[2])
+        elif path == '/v2/usage':
+            self.send_json(200, {'character_count': server.character_count, 'character_limit': server.character_limit})
+        else:
+            self.send_json(404, {'message': 'Not found'})
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.startswith('application/json'):
+            return json.loads(raw or b'{}')
+        if content_type.startswith('application/x-www-form-urlencoded'):
+            return {name: values if len(values) > 1 else values[0]
+                    for name, values in urllib.parse.parse_qs(raw.decode('utf-8')).items()}
+        if content_type.startswith('multipart/form-data'):
+            message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+                f'Content-Type: {content_type}\r\n\r\n'.encode('latin-1') + raw)
+            fields = {}
+            for part in message.iter_parts():
+                name = part.get_param('name', header='content-disposition')
+                payload = part.get_payload(decode=True)
+                filename = part.get_filename()
+                fields[name] = (filename, payload) if filename else payload.decode('utf-8')
+            return fields
+        return {}
+
+    def translate(self, body):
+        texts = body.get('text') or []
+        if isinstance(texts, str):
+            texts = [texts]
+        target_lang = body.get('target_lang')
+        if self.server.character_count + sum(len(text) for text in texts) > self.server.character_limit:
+            self.send_json(456, {'message': 'Quota exceeded'})
+            return
+        if self.server.char_latency:
+            time.sleep(self.server.char_latency * sum(len(text) for text in texts))
+        if body.get('context'):
+            with self.server._requests_lock:
+                self.server.contexts += 1
+        translations = []
+        for text in texts:
+            self.server.count_characters(len(text))
+            translations.append({'detected_source_language': 'EN',
+                                 'text': self.server.translate_text(text, target_lang, body.get('glossary_id')),
+                                 'billed_characters': len(text)})
+        self.send_json(200, {'translations': translations})
+
+    def document_upload(self, body):
+        if 'file' not in body:
+            self.send_json(400, {'message': 'Missing file'})
+            return
+        filename, content = body['file']
+        document_id = uuid.uuid4().hex
+        document_key = uuid.uuid4().hex
+        self.server.documents[document_id] = {
+            'key': document_key,
+            'filename': filename,
+            'content': content,
+            'target_lang': body.get('target_lang'),
+            'glossary_id': body.get('glossary_id'),
+            'ready_at': time.monotonic() + self.server.document_time,
+        }
+        self.send_json(200, {'document_id': document_id, 'document_key': document_key})
+
+    def find_document(self, document_id, body):
+        document = self.server.documents.get(document_id)
+        if document is None or document['key'] != body.get('document_key'):
+            self.send_json(404, {'message': 'Document not found'})
+            return None
+        return document
+
+    def document_status(self, document_id, body):
+        document = self.find_document(document_id, body)
+        if document is None:
+            return
+        remaining = document['ready_at'] - time.monotonic()
+        if remaining > 0:
+            self.send_json(200, {'document_id': document_id, 'status': 'translating',
+                                 'seconds_remaining': max(1, int(remaining))})
+        else:
+            self.send_json(200, {'document_id': document_id, 'status': 'done',
+                                 'billed_characters': len(document['content'])})
+
+    def document_result(self, document_id, body):
+        document = self.find_document(document_id, body)
+        if document is None:
+            return
+        if document['ready_at'] > time.monotonic():
+            self.send_json(503, {'message': 'Document not ready'})
+            return
+        # 与 DeepL 相同，译文只能下载一次
+        if document.get('downloaded'):
+            self.send_json(404, {'message': 'Document already downloaded'})
+            return
+        content = document['content']
+        if document['filename'].lower().endswith(('.txt', '.srt')):
+            text = content.decode('utf-8')
+            content = self.server.translate_text(text, document['target_lang'],
+                                                 document['glossary_id']).encode('utf-8')
+        document['downloaded'] = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def glossaries(self, body):
+        server = self.server
+        if self.command == 'GET':
+            self.send_json(200, {'glossaries': [glossary['info'] for glossary in server.glossaries.values()]})
+            return
+        entries = dict(line.split('\t', 1) for line in body.get('entries', '').splitlines() if '\t' in line)
+        if not entries:
+            self.send_json(400, {'message': 'Invalid glossary entries'})
+            return
+        glossary_id = str(uuid.uuid4())
+        info = {'glossary_id': glossary_id, 'name': body.get('name'), 'ready': True,
+                'source_lang': body.get('source_lang', '').lower(), 'target_lang': body.get('target_lang', '').lower(),
+                'creation_time': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()), 'entry_count': len(entries)}
+        server.glossaries[glossary_id] = {'info': info, 'entries': entries}
+        self.send_json(201, info)
+
+    def glossary(self, glossary_id):
+        glossary = self.server.glossaries.get(glossary_id)
+        if glossary is None:
+            self.send_json(404, {'message': 'Glossary not found'})
+        elif self.command == 'DELETE':
+            del self.server.glossaries[glossary_id]
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self.send_json(200, glossary['info'])
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockDeepLServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), latency=0.0, document_time=1.0, rate_limit=None,
+                 character_limit=500000000, error_rate=0.0, throttle_rate=0.0, retry_after=1.0, seed=None,
+                 char_latency=0.0):
+        super().__init__(address, MockDeepLHandler)
+        self.latency = latency
+        # char_latency：文本翻译请求中每个字符额外的延迟（秒），模拟长请求更慢
+        self.char_latency = char_latency
+        self.contexts = 0
+        self.document_time = document_time
+        self.documents = {}
+        self.glossaries = {}
+        self.character_count = 0
+        self.character_limit = character_limit
+        self.requests = {}
+        self.rejected = 0
+        # rate_limit：每秒允许的请求数，超出时返回 429 和 Retry-After
+        self.rate_limit = rate_limit
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        # error_rate / throttle_rate：随机返回 503 / 429（Retry-After 为 retry_after 秒）的请求比例
+        # 指定 seed 时注入的故障序列可复现
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.failed = 0
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._requests_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count_request(self, path):
+        with self._requests_lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def check_rate_limit(self):
+        if not self.rate_limit:
+            return None
+        with self._requests_lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            if self._window_count >= self.rate_limit:
+                self.rejected += 1
+                return max(1, round(self._window_start + 1.0 - now))
+            self._window_count += 1
+        return None
+
+    def inject_fault(self):
+        if not self.error_rate and not self.throttle_rate:
+            return None
+        with self._requests_lock:
+            roll = self._random.random()
+            if roll < self.throttle_rate:
+                self.throttled += 1
+                return 429
+            if roll < self.throttle_rate + self.error_rate:
+                self.failed += 1
+                return 503
+        return None
+
+    def count_characters(self, count):
+        with self._requests_lock:
+            self.character_count += count
+
+    def translate_text(self, text, target_lang, glossary_id=None):
+        glossary = self.glossaries.get(glossary_id)
+        if glossary is not None:
+            for source, target in glossary['entries'].items():
+                text = text.replace(source, target)
+        return f'[{target_lang}] {text}'
+
+    def handle_error(self, request, client_address):
+        # 客户端进程退出时断开保持中的连接属于正常情况
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='本地模拟 DeepL API 服务')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='每个请求的额外延迟（秒）')
+    parser.add_argument('--char-latency', type=float, default=0.0, help='文本请求中每个字符额外的延迟（秒）')
+    parser.add_argument('--document-time', type=float, default=1.0, help='文档翻译所需时间（秒）')
+    parser.add_argument('--rate-limit', type=int, default=None, help='每秒允许的请求数，超出返回 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='随机返回 503 的请求比例')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='随机返回 429 的请求比例')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='随机 429 响应中的 Retry-After（秒）')
+    parser.add_argument('--seed', type=int, default=None, help='故障注入的随机种子')
+    args = parser.parse_args()
+
+    server = MockDeepLServer(('127.0.0.1', args.port), latency=args.latency, document_time=args.document_time,
+                             rate_limit=args.rate_limit, error_rate=args.error_rate,
+                             throttle_rate=args.throttle_rate, retry_after=args.retry_after, seed=args.seed,
+                             char_latency=args.char_latency)
+    print(f'Mock DeepL API: {server.url}')
+    server.serve_forever()
@@ -1,75 +1,223 @@
 import subprocess
-
-import gui
-
-from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog
-from PyQt5.QtGui import QIcon
-import os
 import sys
-import deepl
-import yaml
-from pynput import keyboard
-import pystray
-from PIL import Image
-import datetime
+import threading
 
-import win32gui, win32con, win32api
+from pydeepl.startup import timeline_from_env
 
+# 启动时间线：托盘、快捷键和 DeepL 客户端在窗口首次绘制后才于后台初始化
+timeline = timeline_from_env(expected=('ready_for_input', 'tray_ready', 'hotkey_ready', 'client_ready'))
 
-def read_config():
-    config_file = 'PyDeeplConfig.yml'
+from pydeepl.config import (DEFAULT_SHORTCUT, ConfigError, close_config_services, config_service, read_config,
+                            read_config_or_default)
+from pydeepl.ipc import IPCServer, default_handlers, forward_to_instance, ipc_port, parse_launch_args
 
-    default_config = '''deepl_api: "enter deepl api key"
-# 输入你的DeepL API密钥
+# 已有实例在运行时，把启动参数交给它处理后直接退出，不再加载 Qt；配置文件无效时使用默认配置，窗口中再提示错误
+if __name__ == '__main__' and forward_to_instance(parse_launch_args(sys.argv[1:]), read_config_or_default()[0]):
+    sys.exit(0)
 
-call_shortcut: <ctrl>+<space>
-'''
-    if not os.path.exists(config_file):
-        with open(config_file, 'w', encoding='utf-8') as file:
-            file.write(default_config)
+from PyQt5.QtCore import Qt, QTimer, QUrl, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog, QShortcut
+from PyQt5.QtGui import QDesktopServices, QIcon, QKeySequence
+import os
 
-    with open(config_file, 'r', encoding='utf-8') as file:
-        yml_config = yaml.safe_load(file)
+timeline.mark('import_qt')
 
-    return yml_config
+import gui
+
+timeline.mark('import_gui')
+
+from pydeepl import core, metrics
+from pydeepl.batching import close_batchers
+from pydeepl.cache import close_caches
+from pydeepl.client import close_translators
+from pydeepl.documents import format_report
+from pydeepl.fanout import format_results, parse_targets
+from pydeepl.jobs import close_job_stores, format_history, jobs_from_config
+from pydeepl.languages import document_extensions, source_map, target_map
+from pydeepl.live import LiveTranslator
+from pydeepl.output import OutputView
+from pydeepl.quick import QuickTranslator, copy_selection
+from pydeepl.workers import TranslationWorkers
+
+timeline.mark('import_pydeepl')
+
+
+def reveal_file(path: str):
+    # Windows 上在资源管理器中选中译文，其他系统打开所在的文件夹；打不开时只保留输出框中的结果
+    try:
+        if sys.platform == 'win32':
+            subprocess.run(f'explorer /select,"{path}"')
+        else:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.dirname(os.path.abspath(path))))
+    except OSError:
+        pass
 
 
 class MainWindow(QMainWindow):
+    remote_show = pyqtSignal(dict)
+    hotkey_pressed = pyqtSignal()
+    resume_requested = pyqtSignal()
+    history_requested = pyqtSignal()
+    config_changed = pyqtSignal(object, object)
+    config_error = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.ui = gui.Ui_MainWindow()
         self.ui.setupUi(self)
 
+        # 后台翻译任务
+        self.workers = TranslationWorkers(self)
+        self.live = LiveTranslator(self.ui.InputTextEdit, self.workers, self.current_languages, self)
+        self.quick = QuickTranslator(QApplication.clipboard(), self.current_languages, self)
+        self.output = OutputView(self.ui.OutputTextBrowser, self)
+
         # 初始化
         self.setWindowTitle('PyDeepL')
         self.setWindowIcon(QIcon(':/Icon/pydeepl.ico'))
         self.on_combobox_changed()
         self.clear_text()
+        self.tray_icon = None
+        self.listener = None
+        self.shortcut = None
+        self._hotkey_lock = threading.Lock()
+        self._painted = False
 
+        # 绑定信号与槽
+        self.ui.SourceComboBox.currentIndexChanged.connect(self.on_combobox_changed)
+        self.ui.TargetComboBox.currentIndexChanged.connect(self.on_combobox_changed)
+        self.ui.SwapButton.clicked.connect(self.swap_languages)
+        self.ui.ClearButton.clicked.connect(self.clear_text)
+        self.ui.TranslateButton.clicked.connect(self.translate_text)
+        self.ui.CopyButton.clicked.connect(self.copy_text)
+        self.ui.UploadFileButton.clicked.connect(self.select_and_translate_file)
+        self.workers.progress.connect(self.on_job_progress)
+        self.workers.partial.connect(self.on_job_partial)
+        self.workers.result.connect(self.on_job_result)
+        self.workers.error.connect(self.on_job_error)
+        self.live.preview.connect(self.output.set_text)
+        self.live.cleared.connect(self.output.clear)
+        self.ui.SourceComboBox.currentIndexChanged.connect(self.live.invalidate)
+        self.ui.TargetComboBox.currentIndexChanged.connect(self.live.invalidate)
+        self.hotkey_pressed.connect(self.on_hotkey)
+        self.resume_requested.connect(self.resume_files)
+        self.history_requested.connect(self.show_history)
+        self.config_changed.connect(self.on_config_changed)
+        self.config_error.connect(self.on_config_error)
+
+        # Esc 取消正在进行的翻译
+        QShortcut(QKeySequence(Qt.Key_Escape), self, activated=self.cancel_jobs)
+        # Ctrl+Shift+Enter 同时翻译成配置中的多种目标语言
+        QShortcut(QKeySequence('Ctrl+Shift+Return'), self, activated=self.translate_all_targets)
+        # Ctrl+S 把译文导出为文本文件
+        QShortcut(QKeySequence.Save, self, activated=self.export_output)
+        # F12 打开诊断面板
+        self.diagnostics = None
+        QShortcut(QKeySequence(Qt.Key_F12), self, activated=self.show_diagnostics)
+
+        config, error = read_config_or_default()
+        self.live.configure(config)
+        self.quick.configure(config)
+        metrics.configure(config)
+        # 启动时配置文件无效：先用默认配置运行，修改正确后由监视线程加载
+        self._config_fallback = error is not None
+        if error is not None:
+            self.on_config_error(str(error))
+        # 配置文件修改后由监视线程发布新快照：客户端在该线程中更换，界面相关的设置交给主线程
+        self.config = config_service()
+        self.config.subscribe(core.apply_config)
+        self.config.subscribe(self.config_changed.emit, lambda e: self.config_error.emit(str(e)))
+
+        # 单实例：之后启动的程序和其他工具通过本地端口把请求交给当前进程
+        self.remote_show.connect(self.open_request)
+        self.ipc = None
+        if config.get('single_instance', True):
+            handlers = default_handlers(read_config)
+            handlers['show'] = self.remote_show.emit
+            self.ipc = IPCServer(handlers, ipc_port(config))
+            try:
+                self.ipc.start()
+            except OSError:
+                self.ipc = None
+        timeline.mark('window_created')
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            timeline.mark('first_paint')
+            # 首帧绘制完成后，等事件循环空闲再初始化其余部分
+            QTimer.singleShot(0, self.on_ready)
+
+    def on_ready(self):
+        timeline.mark('ready_for_input')
+        threading.Thread(target=self.start_services, daemon=True).start()
+
+    def start_services(self):
+        config = read_config()
+        for name, start in (('hotkey_ready', lambda: self.start_hotkey(config)),
+                            ('client_ready', lambda: core.warm_up(config)),
+                            ('tray_ready', self.start_tray)):
+            try:
+                start()
+            except Exception as e:
+                timeline.mark(name, e)
+            else:
+                timeline.mark(name)
+        try:
+            self.config.start()
+        except ConfigError as e:
+            self.config_error.emit(str(e))
+        # 上次退出或崩溃时已上传但尚未下载的文件，继续轮询和下载
+        jobs = jobs_from_config(config)
+        if jobs is not None and jobs.pending():
+            self.resume_requested.emit()
+
+    def start_tray(self):
         # 托盘图标
+        import pystray
+        from PIL import Image
+
         self.tray_icon = pystray.Icon('PyDeepL', Image.open(self.get_resource_path('./icon_resources/pydeepl.ico')),
                                       title='PyDeepL',
                                       menu=pystray.Menu(
                                           pystray.MenuItem('打开窗口', self.show_window),
+                                          pystray.MenuItem('文件翻译记录',
+                                                           lambda icon, item: self.history_requested.emit()),
                                           pystray.MenuItem('退出', self.exit_app)
                                       ))
         self.tray_icon.run_detached()
 
-        # 绑定信号与槽
-        self.ui.SourceComboBox.currentIndexChanged.connect(self.on_combobox_changed)
-        self.ui.TargetComboBox.currentIndexChanged.connect(self.on_combobox_changed)
-        self.ui.SwapButton.clicked.connect(self.swap_languages)
-        self.ui.ClearButton.clicked.connect(self.clear_text)
-        self.ui.TranslateButton.clicked.connect(self.translate_text)
-        self.ui.CopyButton.clicked.connect(self.copy_text)
-        self.ui.UploadFileButton.clicked.connect(self.select_and_translate_file)
+    def start_hotkey(self, config: dict):
+        # 监听快捷键；更换快捷键时先启动新的监听再停止旧的，新快捷键无效时（抛出 ValueError）仍保留旧的
+        from pynput import keyboard
+
+        shortcut = config.get('call_shortcut', DEFAULT_SHORTCUT)
+        with self._hotkey_lock:
+            listener = keyboard.GlobalHotKeys({
+                shortcut: self.on_hotkey_thread
+            })
+            listener.start()
+            old, self.listener, self.shortcut = self.listener, listener, shortcut
+        if old is not None:
+            old.stop()
+
+    def on_config_changed(self, old, new):
+        self._config_fallback = False
+        self.live.configure(new)
+        self.quick.configure(new)
+        metrics.configure(new)
+        shortcut = new.get('call_shortcut', DEFAULT_SHORTCUT)
+        if shortcut != old.get('call_shortcut', DEFAULT_SHORTCUT):
+            try:
+                self.start_hotkey(new)
+            except Exception as e:
+                kept = f'，继续使用 {self.shortcut}' if self.listener is not None else ''
+                self.output.set_text(f'无法使用快捷键 {shortcut}{kept}：{e}')
 
-        # 监听快捷键
-        config = read_config()
-        self.listener = keyboard.GlobalHotKeys({
-            config['call_shortcut']: self.toggle_window
-        })
-        self.listener.start()
+    def on_config_error(self, error):
+        kept = '暂时使用默认配置' if self._config_fallback else '继续使用上次的配置'
+        self.output.set_text(f'配置文件有误，{kept}：{error}')
 
     def on_combobox_changed(self):
         source_index = self.ui.SourceComboBox.currentIndex()
@@ -93,64 +241,139 @@ class MainWindow(QMainWindow):
             self.ui.TargetComboBox.setCurrentIndex(source_index - 1)
 
     def clear_text(self):
+        self.workers.cancel('text')
         self.ui.InputTextEdit.clear()
-        self.ui.OutputTextBrowser.clear()
+        self.output.clear()
         self.ui.InputTextEdit.setFocus()
 
     def translate_text(self):
         input_text = self.ui.InputTextEdit.toPlainText()
         if input_text:
-            try:
-                translated_text = self.translate(input_text)
-                self.ui.OutputTextBrowser.clear()
-                self.ui.OutputTextBrowser.setText(translated_text)
-            except Exception as e:
-                self.ui.OutputTextBrowser.clear()
-                self.ui.OutputTextBrowser.setText(f'翻译失败：{e}')
+            source_lang, target_lang = self.current_languages()
+            if len(input_text) > core.CHUNK_CHARS:
+                # 长文本分块同时翻译，译文按顺序逐块显示
+                self.output.clear()
+                self.workers.submit('text', lambda job: self.translate_large(job, input_text, source_lang,
+                                                                             target_lang))
+            else:
+                self.workers.submit('text', lambda job: self.translate(input_text, source_lang, target_lang))
+
+    def translate_all_targets(self):
+        input_text = self.ui.InputTextEdit.toPlainText()
+        if input_text:
+            source_lang, _ = self.current_languages()
+            config = read_config()
+            # fanout_targets 为逗号分隔的目标语言，未配置时翻译成界面中的全部目标语言
+            target_langs = parse_targets(config.get('fanout_targets') or 'all')
+            self.workers.submit('text', lambda job: format_results(
+                core.translate_targets(input_text, target_langs, source_lang, config=config)))
+
+    def translate_large(self, job, text: str, source_lang: str, target_lang: str):
+        # 每块译文按顺序到达后立即追加到输出框
+        for chunk in core.translate_chunks(text, source_lang, target_lang):
+            if job.is_cancelled():
+                break
+            job.emit_partial(chunk)
+        return None
 
     def copy_text(self):
-        clipboard = QApplication.clipboard()
-        clipboard.setText(self.ui.OutputTextBrowser.toPlainText())
+        self.output.copy_to(QApplication.clipboard())
+
+    def export_output(self):
+        if not len(self.output):
+            return
+        path, _ = QFileDialog.getSaveFileName(self, '导出译文', 'translation.txt', '文本文件 (*.txt);;所有文件 (*)')
+        if path:
+            self.output.export(path)
 
     def select_and_translate_file(self):
         options = QFileDialog.Options()
-        file_path, _ = QFileDialog.getOpenFileName(self, '选择文件', '',
-                                                   '可翻译文件 (*.txt *.doc *.docx *.pptx *.xlsx *.pdf *.htm *.html *.xlf *.xliff *.srt);;所有文件 (*)',
-                                                   options=options)
-        if file_path:
-            directory, filename = os.path.split(file_path)
-            name, ext = os.path.splitext(filename)
-            timestamp = datetime.datetime.now().strftime('%y%m%d%H%M%S')
-            new_file_name = f'{name}_translated_{timestamp}{ext}'
-            save_path = os.path.join(directory, new_file_name)
-            try:
-                config = read_config()
-                auth_key = config['deepl_api']
-                target_lang = self.ui.TargetComboBox.currentIndex()
-
-                target_map = ['ZH', 'EN-US', 'JA', 'FR', 'DE', 'IT', 'ES', 'PT-PT', 'RU']
-
-                translator = deepl.Translator(auth_key)
-                translator.translate_document_from_filepath(file_path, save_path, target_lang=target_map[target_lang])
-
-                subprocess.run(f'explorer /select,"{save_path}"')
-            except Exception as e:
-                self.ui.OutputTextBrowser.setText(f'错误：{e}')
+        patterns = ' '.join(f'*{ext}' for ext in document_extensions)
+        file_paths, _ = QFileDialog.getOpenFileNames(self, '选择文件', '', f'可翻译文件 ({patterns});;所有文件 (*)',
+                                                     options=options)
+        if file_paths:
+            self.translate_files(file_paths)
+
+    def translate_files(self, file_paths: list):
+        _, target_lang = self.current_languages()
+        self.workers.submit('document', lambda job: core.translate_files(file_paths, target_lang,
+                                                                         progress=job.report,
+                                                                         is_cancelled=job.is_cancelled))
+
+    def resume_files(self):
+        self.workers.submit('resume', lambda job: core.resume_files(progress=job.report,
+                                                                    is_cancelled=job.is_cancelled))
+
+    def show_history(self):
+        jobs = jobs_from_config(read_config())
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.output.set_text(format_history(jobs.history()) if jobs is not None else '未开启文件翻译记录')
 
-    def translate(self, text: str) -> str:
-        config = read_config()
-        auth_key = config['deepl_api']
+    def open_request(self, request: dict):
+        # 来自命令行参数或其他进程的请求：显示窗口，并翻译附带的文本或文件
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        if request.get('files'):
+            self.translate_files(request['files'])
+        elif request.get('text'):
+            self.ui.InputTextEdit.setPlainText(request['text'])
+            self.translate_text()
+
+    def current_languages(self):
         source_lang = self.ui.SourceComboBox.currentIndex()
         target_lang = self.ui.TargetComboBox.currentIndex()
+        return source_map[source_lang], target_map[target_lang]
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        return core.translate(text, source_lang, target_lang)
+
+    def on_job_progress(self, kind, message):
+        # 启动时在后台继续的文件不打断当前的翻译，完成后再显示结果
+        if kind != 'resume':
+            self.output.set_text(message)
+
+    def on_job_partial(self, kind, chunk):
+        if kind == 'text':
+            self.output.append(chunk)
+
+    def on_job_result(self, kind, result):
+        if kind == 'text':
+            if result is not None:
+                self.output.set_text(result)
+        elif kind == 'document':
+            self.output.set_text(format_report(result))
+            saved = [document.save_path for document in result if document.ok]
+            if saved:
+                reveal_file(saved[0])
+        elif kind == 'resume':
+            if result and not self.workers.is_busy('text') and not self.workers.is_busy('document'):
+                self.output.set_text('已完成上次未完成的文件翻译：\n' + format_report(result))
+
+    def on_job_error(self, kind, error):
+        if kind == 'resume':
+            if not self.workers.is_busy('text') and not self.workers.is_busy('document'):
+                self.output.set_text(f'继续上次未完成的文件翻译失败：{error}')
+            return
+        if kind == 'text':
+            self.output.set_text(f'翻译失败：{error}')
+        else:
+            self.output.set_text(f'错误：{error}')
 
-        source_map = [None, 'ZH', 'EN', 'JA', 'FR', 'DE', 'IT', 'ES', 'PT', 'RU']
-        target_map = ['ZH', 'EN-US', 'JA', 'FR', 'DE', 'IT', 'ES', 'PT-PT', 'RU']
+    def cancel_jobs(self):
+        if self.workers.is_busy('document'):
+            self.output.set_text('已取消文件翻译')
+        self.workers.cancel()
 
-        translator = deepl.Translator(auth_key)
-        result = translator.translate_text(text,
-                                           source_lang=source_map[source_lang],
-                                           target_lang=target_map[target_lang])
-        return result.text
+    def show_diagnostics(self):
+        if self.diagnostics is None:
+            from pydeepl.diagnostics import DiagnosticsDialog
+            self.diagnostics = DiagnosticsDialog(self)
+        self.diagnostics.show()
+        self.diagnostics.raise_()
+        self.diagnostics.activateWindow()
 
     def closeEvent(self, event):
         event.ignore()
@@ -165,9 +388,51 @@ class MainWindow(QMainWindow):
         self.show()
 
     def exit_app(self, icon, item):
-        self.tray_icon.stop()
+        close_config_services()
+        if self.tray_icon is not None:
+            self.tray_icon.stop()
+        if self.ipc is not None:
+            self.ipc.stop()
+        # 先关闭任务记录，正在进行的文件保持未完成状态，下次启动时继续
+        close_job_stores()
+        self.workers.shutdown()
+        self.quick.shutdown()
+        close_batchers()
+        close_translators()
+        close_caches()
+        metrics.close()
         QApplication.quit()
 
+    def on_hotkey_thread(self):
+        # 在 pynput 的线程中调用，界面操作通过信号交给主线程
+        if self.quick.simulate_copy:
+            copy_selection()
+        self.hotkey_pressed.emit()
+
+    def on_hotkey(self):
+        if not self.quick.enabled:
+            self.toggle_window()
+            return
+        # 取词翻译：先开始翻译，再显示窗口；最近翻译过的文字直接显示
+        text = self.quick.capture()
+        languages = self.current_languages()
+        cached = None
+        if text:
+            cached = self.quick.lookup(text, *languages)
+            if cached is None:
+                self.workers.submit('text', lambda job: self.quick.translate(text, *languages))
+            else:
+                self.workers.cancel('text')
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.ui.InputTextEdit.setFocus()
+        if text:
+            self.ui.InputTextEdit.setPlainText(text)
+            self.live.skip(text, languages)
+            if cached is not None:
+                self.output.set_text(cached)
+
     def toggle_window(self):
         if not self.isVisible():
             self.show()
@@ -180,5 +445,8 @@ if __name__ == '__main__':
     app = QApplication(sys.argv)
     main_window = MainWindow()
     main_window.show()
+    launch = parse_launch_args(sys.argv[1:])
+    if launch['text'] or launch['files']:
+        main_window.open_request(launch)
     sys.exit(app.exec_())
 # pyinstaller --onefile --windowed --add-data "gui.py;." --add-data "pydeepl_rc.py;." --add-data "icon_resources;icon_resources" main.py  --icon='icon_resources/pydeepl.ico' --name=PyDeepL
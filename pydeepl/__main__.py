@@ -0,0 +1,5 @@
+import sys
+
+from pydeepl.cli import main
+
+sys.exit(main())
@@ -0,0 +1,160 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from pydeepl import metrics
+from pydeepl.scheduler import scheduled_translator_from_config
+
+# DeepL 单次请求最多 50 条文本，请求体不超过 128 KiB
+MAX_TEXTS_PER_REQUEST = 50
+MAX_REQUEST_BYTES = 128 * 1024
+# 每条文本在 JSON 请求体中的额外开销（引号、逗号、转义等）估算
+TEXT_OVERHEAD_BYTES = 16
+
+
+def pack_batches(texts: list, max_texts: int = MAX_TEXTS_PER_REQUEST, max_bytes: int = MAX_REQUEST_BYTES):
+    batch = []
+    batch_bytes = 0
+    for text in texts:
+        size = len(text.encode('utf-8')) + TEXT_OVERHEAD_BYTES
+        if batch and (len(batch) >= max_texts or batch_bytes + size > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(text)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def translate_many(translator, texts: list, source_lang: str, target_lang: str,
+                   max_texts: int = MAX_TEXTS_PER_REQUEST, max_bytes: int = MAX_REQUEST_BYTES, **options) -> list:
+    # 去重后按条数和字节数打包发送，再按原顺序展开结果
+    unique = list(dict.fromkeys(texts))
+    translations = {}
+    for batch in pack_batches(unique, max_texts, max_bytes):
+        results = translator.translate_text(batch, source_lang=source_lang, target_lang=target_lang, **options)
+        for text, result in zip(batch, results):
+            translations[text] = result.text
+    return [translations[text] for text in texts]
+
+
+class TranslationBatcher:
+    # 收集多个调用方同时提交的文本，合并成尽量少的请求，再把结果分发回各自的 Future。
+    # 没有请求在进行时立即发送，不增加单个请求的延迟；有请求在进行时最多等待 max_delay 收集更多文本
+    def __init__(self, translator, max_texts: int = MAX_TEXTS_PER_REQUEST, max_bytes: int = MAX_REQUEST_BYTES,
+                 max_delay: float = 0.01, max_workers: int = 4):
+        self.translator = translator
+        self.max_texts = max_texts
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.requests = 0
+        self.texts = 0
+
+        self._pending = {}
+        self._pending_count = 0
+        self._inflight = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pydeepl-batch')
+        self._thread = threading.Thread(target=self._run, name='pydeepl-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, source_lang: str, target_lang: str, **options) -> Future:
+        future = Future()
+        group = (source_lang, target_lang, tuple(sorted(options.items())))
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('batcher is closed')
+            self._pending.setdefault(group, {}).setdefault(text, []).append((future, metrics.current()))
+            self._pending_count += 1
+            self._condition.notify()
+        return future
+
+    def translate(self, text: str, source_lang: str, target_lang: str, **options) -> str:
+        return self.submit(text, source_lang, target_lang, **options).result()
+
+    def translate_many(self, texts: list, source_lang: str, target_lang: str, **options) -> list:
+        futures = [self.submit(text, source_lang, target_lang, **options) for text in texts]
+        return [future.result() for future in futures]
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending_count and not self._closed:
+                    self._condition.wait()
+                if not self._pending_count and self._closed:
+                    return
+                # 已有请求在进行时等待一小段时间（或直到有请求完成），让更多文本合并进同一批
+                deadline = time.monotonic() + self.max_delay
+                while not self._closed and self._inflight and self._pending_count < self.max_texts:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                pending = self._pending
+                self._pending = {}
+                self._pending_count = 0
+
+                batches = [(group, batch, [waiters[text] for text in batch])
+                           for group, waiters in pending.items()
+                           for batch in pack_batches(list(waiters), self.max_texts, self.max_bytes)]
+                self._inflight += len(batches)
+
+            for batch in batches:
+                self._executor.submit(self._dispatch, *batch)
+
+    def _dispatch(self, group, batch, waiters):
+        source_lang, target_lang, options = group
+        # 请求的耗时和字符数记到本批第一个开启了统计的调用方
+        span = next((span for callers in waiters for _, span in callers if span is not None), None)
+        try:
+            with metrics.attach(span):
+                results = self.translator.translate_text(batch, source_lang=source_lang, target_lang=target_lang,
+                                                         **dict(options))
+        except Exception as e:
+            for callers in waiters:
+                for future, _ in callers:
+                    future.set_exception(e)
+            return
+        finally:
+            with self._condition:
+                self._inflight -= 1
+                self._condition.notify()
+
+        with self._condition:
+            self.requests += 1
+            self.texts += len(batch)
+        for result, callers in zip(results, waiters):
+            for future, _ in callers:
+                future.set_result(result.text)
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def batcher_from_config(config: dict, priority: int) -> TranslationBatcher:
+    # 同一客户端和优先级共享一个合并器：常驻进程中同时到达的请求、多语言同时翻译等并发调用合并发送
+    key = (config['deepl_api'], config.get('server_url'), priority)
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = TranslationBatcher(scheduled_translator_from_config(config, priority))
+            _batchers[key] = batcher
+    return batcher
+
+
+def close_batchers():
+    with _batchers_lock:
+        batchers = list(_batchers.values())
+        _batchers.clear()
+    for batcher in batchers:
+        batcher.close()
@@ -0,0 +1,186 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from pydeepl import metrics
+
+CACHE_FILE = 'PyDeeplCache.db'
+
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize('NFC', text.replace('\r\n', '\n'))
+
+
+def cache_key(text: str, source_lang: str, target_lang: str, **options) -> bytes:
+    parts = [normalize_text(text), source_lang or '', target_lang]
+    for name in sorted(options):
+        if options[name] is not None:
+            parts.append(f'{name}={options[name]}')
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).digest()
+
+
+class TranslationCache:
+    # SQLite 持久化的翻译记忆，前面再加一层进程内 LRU，命中时无需访问磁盘
+    def __init__(self, path: str = CACHE_FILE, max_entries: int = 100000, ttl: float = None,
+                 memory_entries: int = 2048):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._touched = {}
+        self._puts = 0
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS translations ('
+                         'key BLOB PRIMARY KEY, translation TEXT NOT NULL, '
+                         'created REAL NOT NULL, last_used REAL NOT NULL) WITHOUT ROWID')
+        self._db.execute('CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)')
+        self._db.commit()
+
+    def get(self, text: str, source_lang: str, target_lang: str, **options):
+        return self.get_by_key(cache_key(text, source_lang, target_lang, **options))
+
+    def put(self, text: str, source_lang: str, target_lang: str, translation: str, **options):
+        self.put_by_key(cache_key(text, source_lang, target_lang, **options), translation)
+
+    def get_by_key(self, key: bytes):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            else:
+                entry = self._db.execute('SELECT translation, created FROM translations WHERE key = ?',
+                                         (key,)).fetchone()
+                if entry is not None:
+                    self._remember(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                metrics.count('cache_misses')
+                return None
+            if self.ttl is not None and now - entry[1] > self.ttl:
+                self._memory.pop(key, None)
+                self._db.execute('DELETE FROM translations WHERE key = ?', (key,))
+                self._db.commit()
+                self.misses += 1
+                metrics.count('cache_misses')
+                return None
+
+            # 访问时间先记在内存里，攒够一批再写回数据库
+            self._touched[key] = now
+            if len(self._touched) >= 4096:
+                self._flush_touched()
+                self._db.commit()
+            self.hits += 1
+            metrics.count('cache_hits')
+            return entry[0]
+
+    def put_by_key(self, key: bytes, translation: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO translations (key, translation, created, last_used) '
+                             'VALUES (?, ?, ?, ?)', (key, translation, now, now))
+            self._remember(key, (translation, now))
+            self._touched.pop(key, None)
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self._evict(now)
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+        total = self.hits + self.misses
+        return {'entries': entries, 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0}
+
+    def configure(self, max_entries: int, ttl: float = None):
+        # 配置热更新后调整上限和有效期；缩小时立即淘汰多出的和过期的条目
+        with self._lock:
+            if (max_entries, ttl) == (self.max_entries, self.ttl):
+                return
+            self.max_entries = max_entries
+            self.ttl = ttl
+            self._evict(time.time())
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._db.execute('DELETE FROM translations')
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self._evict(time.time())
+            self._db.commit()
+            self._db.close()
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_touched(self):
+        if self._touched:
+            self._db.executemany('UPDATE translations SET last_used = ? WHERE key = ?',
+                                 [(last_used, key) for key, last_used in self._touched.items()])
+            self._touched.clear()
+
+    def _evict(self, now):
+        self._flush_touched()
+        if self.ttl is not None:
+            self.evictions += self._db.execute('DELETE FROM translations WHERE created < ?',
+                                               (now - self.ttl,)).rowcount
+        excess = self._db.execute('SELECT COUNT(*) FROM translations').fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.evictions += self._db.execute('DELETE FROM translations WHERE key IN '
+                                               '(SELECT key FROM translations ORDER BY last_used LIMIT ?)',
+                                               (excess,)).rowcount
+            self._memory.clear()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def cache_from_config(config: dict):
+    options = config.get('cache') or {}
+    if not options.get('enabled', True):
+        return None
+
+    path = options.get('path', CACHE_FILE)
+    max_entries = options.get('max_entries', 100000)
+    ttl_days = options.get('ttl_days')
+    ttl = ttl_days * 86400 if ttl_days else None
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = TranslationCache(path, max_entries=max_entries, ttl=ttl)
+            _caches[path] = cache
+    # 同一路径的缓存只创建一次，配置中的上限和有效期变化后（配置热更新）应用到已有的缓存上
+    if (max_entries, ttl) != (cache.max_entries, cache.ttl):
+        cache.configure(max_entries, ttl)
+    return cache
+
+
+def close_caches():
+    with _caches_lock:
+        caches = list(_caches.values())
+        _caches.clear()
+    for cache in caches:
+        cache.close()
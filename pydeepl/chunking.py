@@ -0,0 +1,91 @@
+import threading
+
+from pydeepl.segments import split_segments
+
+FIRST_CHUNK_CHARS = 1000
+MIN_CHUNK_CHARS = 500
+TARGET_CHUNK_SECONDS = 1.0
+CONTEXT_CHARS = 1000
+
+
+class LatencyModel:
+    # 根据观测到的（字符数, 耗时）估计每个请求的固定开销和每字符耗时：带衰减的最小二乘，越新的观测权重越大
+    def __init__(self, decay: float = 0.9, overhead: float = 0.3, per_char: float = 0.0001):
+        self.decay = decay
+        self.overhead = overhead
+        self.per_char = per_char
+        self._sums = [0.0] * 5
+        self._lock = threading.Lock()
+
+    def observe(self, chars: int, seconds: float):
+        with self._lock:
+            weight, x, y, xx, xy = (value * self.decay for value in self._sums)
+            self._sums = [weight + 1, x + chars, y + seconds, xx + chars * chars, xy + chars * seconds]
+            weight, x, y, xx, xy = self._sums
+            variance = weight * xx - x * x
+            if variance > 1e-9 * weight * xx:
+                per_char = (weight * xy - x * y) / variance
+                overhead = (y - per_char * x) / weight
+            else:
+                # 各次请求大小相近时无法区分两项，保留原来的开销估计
+                overhead = self.overhead
+                per_char = (y - overhead * weight) / x if x else self.per_char
+            if per_char > 0:
+                self.per_char = per_char
+                self.overhead = min(max(overhead, 0.0), y / weight)
+
+    def chars_for(self, seconds: float) -> int:
+        with self._lock:
+            return int(max(seconds - self.overhead, 0.0) / self.per_char)
+
+
+latency_model = LatencyModel()
+
+
+class ChunkPlanner:
+    # 按段落和句子边界切块：第一块很小，尽快得到第一段译文；之后的块逐步加大，
+    # 不超过估计在 target_seconds 内能完成的大小、max_chars 以及全文平分到各并发请求的大小
+    def __init__(self, text: str, max_chars: int, concurrency: int = 4, model: LatencyModel = latency_model,
+                 first_chars: int = FIRST_CHUNK_CHARS, target_seconds: float = TARGET_CHUNK_SECONDS,
+                 context_chars: int = CONTEXT_CHARS):
+        self.max_chars = max_chars
+        self.concurrency = max(1, concurrency)
+        self.model = model
+        self.target_seconds = target_seconds
+        self.context_chars = context_chars
+        self._pieces = [body + separator for body, separator in split_segments(text)]
+        self._index = 0
+        self._spread = -(-len(text) // self.concurrency)
+        self._size = min(first_chars, max_chars)
+        self._previous = ''
+
+    def next_chunk(self):
+        # 返回 (块, 上文)，上文为前一块原文的末尾几句，随请求一起发送但不翻译；没有剩余文本时返回 None
+        if self._index >= len(self._pieces):
+            return None
+        limit = self._size
+        chunk = []
+        size = 0
+        while self._index < len(self._pieces):
+            piece = self._pieces[self._index]
+            if chunk and size + len(piece) > limit:
+                break
+            if len(piece) > self.max_chars:
+                # 单个分段超过上限时截断，剩余部分留给下一块
+                self._pieces[self._index] = piece[self.max_chars:]
+                piece = piece[:self.max_chars]
+            else:
+                self._index += 1
+            chunk.append(piece)
+            size += len(piece)
+        chunk = ''.join(chunk)
+        context = self._previous[-self.context_chars:]
+        if len(self._previous) > self.context_chars:
+            # 从句子边界开始，不带半句话
+            pieces = split_segments(context)
+            context = ''.join(body + separator for body, separator in pieces[1:]) if len(pieces) > 1 else context
+        self._previous = chunk
+
+        self._size = max(MIN_CHUNK_CHARS, min(self.max_chars, self._size * 2, self._spread,
+                                              self.model.chars_for(self.target_seconds)))
+        return chunk, context.strip()
@@ -0,0 +1,280 @@
+import argparse
+import os
+import sys
+
+from pydeepl import core, metrics
+from pydeepl.batching import close_batchers
+from pydeepl.cache import close_caches
+from pydeepl.config import CONFIG_FILE, ConfigError, config_service, read_config
+from pydeepl.documents import DocumentResult, format_report
+from pydeepl.fanout import all_ok, fan_out, format_results, parse_targets, results_from_dict
+from pydeepl.glossary import glossary_specs, store_from_config
+from pydeepl.ipc import IPCServer, connect, default_handlers, ipc_port
+from pydeepl.jobs import close_job_stores, format_history, jobs_from_config
+from pydeepl.languages import document_extensions, language_names, normalize_source, target_map
+
+
+def iter_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    if os.path.splitext(filename)[1].lower() in document_extensions:
+                        yield os.path.join(root, filename)
+        else:
+            yield path
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='pydeepl', description='PyDeepL 命令行翻译工具')
+    parser.add_argument('text', nargs='*', help='要翻译的文本；不提供时从标准输入读取')
+    parser.add_argument('-s', '--source', default=None, help='源语言，默认自动检测')
+    parser.add_argument('-t', '--target', default=target_map[0],
+                        help=f'目标语言，默认 {target_map[0]}；多种语言用逗号分隔（如 EN-US,JA），all 表示全部语言，'
+                             '各语言同时翻译，文件译文分别保存在以语言代码命名的子目录中')
+    parser.add_argument('-f', '--file', nargs='+', default=[], metavar='PATH',
+                        help='要翻译的文件或目录（目录会递归查找可翻译文件）')
+    parser.add_argument('-o', '--output', default=None, metavar='DIR', help='文件译文的保存目录，默认与原文件相同')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='同时翻译的文件数，默认读取配置 max_concurrent_documents（4）')
+    parser.add_argument('--report', default=None, metavar='PATH', help='将每个文件的翻译结果写入报告文件')
+    parser.add_argument('--resume', action='store_true',
+                        help='继续上次中断的文件翻译：已上传但尚未下载的文件只轮询和下载，不重新上传')
+    parser.add_argument('--history', action='store_true', help='列出最近的文件翻译记录')
+    parser.add_argument('--lines', action='store_true', help='逐行翻译（适合资源文件等大量短文本）')
+    parser.add_argument('--config', default=CONFIG_FILE, help=f'配置文件路径，默认 {CONFIG_FILE}')
+    parser.add_argument('--languages', action='store_true', help='列出支持的目标语言')
+    parser.add_argument('--glossaries', action='store_true', help='上传配置中的术语表（内容未变时跳过）并列出')
+    parser.add_argument('--serve', action='store_true', help='作为常驻进程运行，供其他程序通过本地端口调用')
+    parser.add_argument('--remote', action='store_true',
+                        help='交给正在运行的 PyDeepL 翻译，复用其连接和缓存')
+    parser.add_argument('--metrics', action='store_true',
+                        help='结束时在标准错误输出各操作的耗时分位数；与 --remote 一起使用时输出常驻进程的统计')
+    return parser
+
+
+def translate_files(args, config, source_lang, target_langs):
+    file_paths = list(iter_files(args.file))
+    progress = lambda message: sys.stderr.write(message + '\n')
+    if len(target_langs) > 1:
+        results = core.translate_files_targets(file_paths, target_langs, source_lang=source_lang,
+                                               output_dir=args.output, config=config, max_workers=args.jobs,
+                                               progress=progress)
+        report, ok = format_results(results), all_ok(results)
+    else:
+        try:
+            results = core.translate_files(file_paths, target_langs[0], source_lang=source_lang,
+                                           output_dir=args.output, config=config, max_workers=args.jobs,
+                                           progress=progress)
+        except Exception as e:
+            # 各文件开始之前的错误（如无法创建输出目录、上传术语表失败）计为每个文件都失败
+            print(f'翻译失败：{e}', file=sys.stderr)
+            results = [DocumentResult(file_path, None, False, str(e), None, 0.0) for file_path in file_paths]
+        report, ok = format_report(results), all(result.ok for result in results)
+    print(report)
+    if args.report:
+        try:
+            with open(args.report, 'w', encoding='utf-8') as file:
+                file.write(report + '\n')
+        except OSError as e:
+            print(f'无法写入报告文件 {args.report}：{e}', file=sys.stderr)
+            return 1
+    return 0 if ok else 1
+
+
+def translate_targets(args, config, text, source_lang, target_langs):
+    # 多种目标语言：各语言同时翻译，按语言分段输出
+    if args.lines:
+        lines = text.splitlines()
+        results = fan_out(target_langs, lambda target_lang: '\n'.join(
+            core.translate_texts(lines, source_lang, target_lang, config=config)))
+    else:
+        results = core.translate_targets(text, target_langs, source_lang, config=config)
+    sys.stdout.write(format_results(results) + '\n')
+    return 0 if all_ok(results) else 1
+
+
+def translate_text(args, config, source_lang, target_langs):
+    text = ' '.join(args.text) if args.text else sys.stdin.read()
+    if not text:
+        return 0
+    if len(target_langs) > 1:
+        return translate_targets(args, config, text, source_lang, target_langs)
+    target_lang = target_langs[0]
+    try:
+        if args.lines:
+            lines = text.splitlines()
+            sys.stdout.write('\n'.join(core.translate_texts(lines, source_lang, target_lang, config=config)) + '\n')
+        elif len(text) > core.CHUNK_CHARS:
+            # 长文本分块同时翻译，每块译文按顺序到达后立即输出
+            for chunk in core.translate_chunks(text, source_lang, target_lang, config=config):
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+            sys.stdout.write('\n')
+        else:
+            sys.stdout.write(core.translate(text, source_lang, target_lang, config=config) + '\n')
+    except Exception as e:
+        print(f'翻译失败：{e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+def resume_files(args, config):
+    results = core.resume_files(config, max_workers=args.jobs,
+                                progress=lambda message: sys.stderr.write(message + '\n'))
+    if not results:
+        print('没有未完成的文件翻译', file=sys.stderr)
+        return 0
+    print(format_report(results))
+    return 0 if all(result.ok for result in results) else 1
+
+
+def show_history(config):
+    jobs = jobs_from_config(config)
+    if jobs is None:
+        print('配置文件中已关闭文件翻译记录（document_jobs）', file=sys.stderr)
+        return 1
+    print(format_history(jobs.history()))
+    return 0
+
+
+def sync_glossaries(config):
+    specs = glossary_specs(config)
+    if not specs:
+        print('配置文件中没有术语表（glossaries）', file=sys.stderr)
+        return 0
+    store = store_from_config(config)
+    failed = 0
+    for (source_lang, target_lang), spec in specs.items():
+        try:
+            entries, _ = store.entries(spec)
+            glossary_id = store.glossary_id(spec)
+            print(f'{source_lang}->{target_lang}\t{len(entries)} 条\t{glossary_id or "（无术语）"}')
+        except Exception as e:
+            failed += 1
+            print(f'{source_lang}->{target_lang}\t失败：{e}', file=sys.stderr)
+    return 1 if failed else 0
+
+
+def serve(args, config):
+    server = IPCServer(default_handlers(lambda: read_config(args.config)), ipc_port(config))
+    try:
+        server.start()
+    except OSError as e:
+        print(f'无法监听端口 {server.port}（可能已有 PyDeepL 在运行）：{e}', file=sys.stderr)
+        return 1
+    # 常驻进程监视配置文件，修改后的配置（包括 API 密钥）无需重启即可生效
+    service = config_service(args.config)
+    service.subscribe(core.apply_config, lambda e: print(f'配置文件有误，继续使用上次的配置：{e}', file=sys.stderr))
+    service.start()
+    print(f'PyDeepL 正在监听 127.0.0.1:{server.port}，按 Ctrl+C 退出', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        service.stop()
+    return 0
+
+
+def remote(args, config):
+    client = connect(ipc_port(config))
+    if client is None:
+        print('没有正在运行的 PyDeepL', file=sys.stderr)
+        return 1
+    target_langs = parse_targets(args.target)
+    with client:
+        try:
+            if args.file:
+                files = [os.path.abspath(path) for path in iter_files(args.file)]
+                output_dir = os.path.abspath(args.output) if args.output else None
+                if len(target_langs) > 1:
+                    results = results_from_dict(client.request('translate_files_targets', files=files,
+                                                               targets=target_langs, source=args.source,
+                                                               output_dir=output_dir))
+                    print(format_results(results))
+                    return 0 if all_ok(results) else 1
+                results = [DocumentResult(**result) for result in
+                           client.request('translate_files', files=files, target=args.target, source=args.source,
+                                          output_dir=output_dir)]
+                print(format_report(results))
+                return 0 if all(result.ok for result in results) else 1
+            text = ' '.join(args.text) if args.text else sys.stdin.read()
+            if not text:
+                return 0
+            if len(target_langs) > 1 and not args.lines:
+                # 由常驻进程同时翻译各语言
+                results = results_from_dict(client.request('translate_targets', text=text, targets=target_langs,
+                                                           source=args.source))
+                sys.stdout.write(format_results(results) + '\n')
+                return 0 if all_ok(results) else 1
+            if len(target_langs) > 1:
+                # 逐行翻译成多种语言时按语言依次请求，同一连接上的请求不能并行
+                lines = text.splitlines()
+                results = fan_out(target_langs, lambda target_lang: '\n'.join(client.request(
+                    'translate_texts', texts=lines, target=target_lang, source=args.source)), max_workers=1)
+                sys.stdout.write(format_results(results) + '\n')
+                return 0 if all_ok(results) else 1
+            if args.lines:
+                translations = client.request('translate_texts', texts=text.splitlines(), target=args.target,
+                                              source=args.source)
+                sys.stdout.write('\n'.join(translations) + '\n')
+            else:
+                sys.stdout.write(client.request('translate', text=text, target=args.target, source=args.source) + '\n')
+        except Exception as e:
+            print(f'翻译失败：{e}', file=sys.stderr)
+            return 1
+        finally:
+            if args.metrics:
+                print(metrics.format_summary(client.request('metrics')), file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.languages:
+        for lang in target_map:
+            print(f'{lang}\t{language_names[lang]}')
+        return 0
+
+    try:
+        config = read_config(args.config)
+    except ConfigError as e:
+        print(f'配置文件 {args.config} 有误：{e}', file=sys.stderr)
+        return 1
+    if args.metrics:
+        config = dict(config, metrics=dict(config.get('metrics') or {}, enabled=True))
+    metrics.configure(config)
+    try:
+        return run(args, config)
+    except Exception as e:
+        # DeepL 或文件错误只输出一行说明，不输出调用栈
+        print(f'错误：{e}', file=sys.stderr)
+        return 1
+    finally:
+        if args.metrics and not args.remote:
+            print(metrics.format_summary(metrics.recorder.summary()), file=sys.stderr)
+        metrics.close()
+        close_job_stores()
+        close_batchers()
+        # 翻译缓存的写入在后台批量提交，退出前写完
+        close_caches()
+
+
+def run(args, config):
+    if args.glossaries:
+        return sync_glossaries(config)
+    if args.history:
+        return show_history(config)
+    if args.resume:
+        return resume_files(args, config)
+    if args.serve:
+        return serve(args, config)
+    if args.remote:
+        return remote(args, config)
+    source_lang = normalize_source(args.source)
+    target_langs = parse_targets(args.target)
+    if args.file:
+        return translate_files(args, config, source_lang, target_langs)
+    return translate_text(args, config, source_lang, target_langs)
@@ -0,0 +1,44 @@
+import threading
+
+# 每个 (auth_key, server_url) 共享一个 deepl.Translator，复用其内部的连接池
+_translators = {}
+# 换用新密钥后不再使用的客户端：可能仍有请求在进行，退出时再关闭
+_retired = []
+_lock = threading.Lock()
+
+
+def get_translator(auth_key: str, server_url: str = None):
+    key = (auth_key, server_url)
+    translator = _translators.get(key)
+    if translator is not None:
+        return translator
+
+    with _lock:
+        translator = _translators.get(key)
+        if translator is None:
+            import deepl
+
+            translator = deepl.Translator(auth_key, server_url=server_url)
+            _translators[key] = translator
+    return translator
+
+
+def translator_from_config(config: dict):
+    return get_translator(config['deepl_api'], config.get('server_url'))
+
+
+def retire_translator(auth_key: str, server_url: str = None):
+    # 配置热更新换用其他 API 密钥或服务地址时调用：之后的请求会创建新的客户端
+    with _lock:
+        translator = _translators.pop((auth_key, server_url), None)
+        if translator is not None:
+            _retired.append(translator)
+
+
+def close_translators():
+    with _lock:
+        translators = list(_translators.values()) + _retired
+        _translators.clear()
+        _retired.clear()
+    for translator in translators:
+        translator.close()
@@ -0,0 +1,263 @@
+import os
+import sys
+import threading
+from types import MappingProxyType
+
+import yaml
+
+CONFIG_FILE = 'PyDeeplConfig.yml'
+DEFAULT_SHORTCUT = '<ctrl>+<space>'
+WATCH_INTERVAL = 1.0
+
+DEFAULT_CONFIG = '''deepl_api: "enter deepl api key"
+# 输入你的DeepL API密钥
+
+call_shortcut: <ctrl>+<space>
+
+# 边输入边翻译：停止输入 debounce_ms 毫秒后自动翻译，改动少于 min_change 个字符时会等待更久再翻译
+live_translate:
+  enabled: false
+  debounce_ms: 500
+  min_change: 3
+'''
+
+
+class ConfigError(Exception):
+    # 配置文件无法解析或不符合 SCHEMA
+    pass
+
+
+class Required:
+    # 必填项
+    def __init__(self, kind):
+        self.kind = kind
+
+
+NUMBER = (int, float)
+
+# 配置项 -> 类型；dict 为子配置段，[类型] 为列表，set 为可选的字符串值。值为空（null）的项不检查类型
+SCHEMA = {
+    'deepl_api': Required(str),
+    'server_url': str,
+    'call_shortcut': str,
+    'single_instance': bool,
+    'ipc_port': int,
+    'incremental': bool,
+    'detect_language': bool,
+    'chunk_concurrency': int,
+    'max_concurrent_documents': int,
+    'stream_text_files': bool,
+    'extract_files': bool,
+    'fanout_targets': str,
+    'glossary_file': str,
+    'glossaries': [{'source': Required(str), 'target': Required(str), 'file': str, 'entries': dict}],
+    'live_translate': {'enabled': bool, 'debounce_ms': int, 'min_change': int},
+    'quick_translate': {'enabled': bool, 'source': {'clipboard', 'selection'}, 'cache_size': int, 'prefetch': bool,
+                        'prefetch_max_chars': int, 'prefetch_budget': int},
+    'cache': {'enabled': bool, 'path': str, 'ttl_days': NUMBER, 'max_entries': int},
+    'document_jobs': {'enabled': bool, 'path': str, 'max_active': int, 'history': int},
+    'scheduler': {'rate': NUMBER, 'burst': NUMBER, 'max_concurrent': int, 'max_retries': int,
+                  'quota_reserve': NUMBER},
+    'metrics': {'enabled': bool, 'format': {'jsonl', 'prometheus'}, 'path': str},
+}
+
+_TYPE_NAMES = {str: '字符串', int: '整数', float: '数字', bool: 'true 或 false', list: '列表', dict: '映射'}
+
+
+def _check(value, schema, path: str, errors: list):
+    if isinstance(schema, Required):
+        schema = schema.kind
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            errors.append(f'{path or "配置文件"} 应为映射')
+            return
+        for key, kind in schema.items():
+            name = f'{path}.{key}' if path else key
+            if value.get(key) is not None:
+                _check(value[key], kind, name, errors)
+            elif isinstance(kind, Required):
+                errors.append(f'缺少 {name}')
+    elif isinstance(schema, list):
+        if not isinstance(value, list):
+            errors.append(f'{path} 应为列表')
+            return
+        for index, item in enumerate(value):
+            _check(item, schema[0], f'{path}[{index}]', errors)
+    elif isinstance(schema, set):
+        if value not in schema:
+            errors.append(f'{path} 应为 {" 或 ".join(sorted(schema))}，实际为 {value!r}')
+    else:
+        kinds = schema if isinstance(schema, tuple) else (schema,)
+        # bool 是 int 的子类，数字项不接受 true/false
+        if not isinstance(value, kinds) or (isinstance(value, bool) and bool not in kinds):
+            errors.append(f'{path} 应为{_TYPE_NAMES[kinds[-1]]}，实际为 {value!r}')
+
+
+def validate_config(config) -> list:
+    # 返回错误说明的列表，为空表示配置有效；未知的配置项不报错
+    errors = []
+    _check(config, SCHEMA, '', errors)
+    return errors
+
+
+def freeze(value):
+    # 只读快照：映射变为 MappingProxyType，列表变为元组
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def load_config(config_file: str = CONFIG_FILE):
+    if not os.path.exists(config_file):
+        with open(config_file, 'w', encoding='utf-8') as file:
+            file.write(DEFAULT_CONFIG)
+    try:
+        with open(config_file, 'r', encoding='utf-8') as file:
+            yml_config = yaml.safe_load(file)
+    except yaml.YAMLError as e:
+        raise ConfigError(f'无法解析：{e}') from None
+    if yml_config is None:
+        yml_config = {}
+    errors = validate_config(yml_config)
+    if errors:
+        raise ConfigError('；'.join(errors))
+    return freeze(yml_config)
+
+
+class ConfigService:
+    # 配置文件的只读快照：监视线程按 mtime 轮询文件，变化后重新解析、校验并发布新快照，
+    # 翻译等热路径只读取内存中的快照。新内容无效时保留上一份快照，并通知 on_error
+    def __init__(self, path: str = CONFIG_FILE, interval: float = WATCH_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.error = None
+        self._snapshot = None
+        self._signature = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        # 未启动监视线程时（如一次性的命令行），每次读取前检查文件是否变化
+        if snapshot is None or (self._thread is None and self._stat() != self._signature):
+            self.reload()
+            snapshot = self._snapshot
+        return snapshot
+
+    def subscribe(self, on_change, on_error=None):
+        # on_change(旧快照, 新快照)、on_error(ConfigError) 在发布快照的线程中调用
+        with self._lock:
+            self._listeners.append((on_change, on_error))
+
+    def reload(self) -> bool:
+        # 返回是否发布了新快照；首次加载失败时抛出 ConfigError
+        with self._lock:
+            signature = self._stat()
+            # 文件被删除（或正在被替换）时继续使用当前快照
+            if self._snapshot is not None and signature in (self._signature, None):
+                return False
+            old = self._snapshot
+            try:
+                new = load_config(self.path)
+            except (ConfigError, OSError) as e:
+                if old is None:
+                    raise
+                # 同一份无效内容只报告一次，文件再次变化后重试
+                self._signature = signature
+                self.error = e if isinstance(e, ConfigError) else ConfigError(str(e))
+                listeners = list(self._listeners)
+                new = None
+            else:
+                # 首次加载时文件可能刚由 load_config 创建
+                self._signature = self._stat() if signature is None else signature
+                self._snapshot = new
+                self.error = None
+                listeners = list(self._listeners) if old is not None and new != old else []
+        for on_change, on_error in listeners:
+            try:
+                if new is not None:
+                    on_change(old, new)
+                elif on_error is not None:
+                    on_error(self.error)
+            except Exception as e:
+                print(f'应用新配置失败：{e}', file=sys.stderr)
+        return new is not None
+
+    def fallback(self, error: ConfigError):
+        # 首次加载失败时改用默认配置（图形界面启动时），文件修改后由监视线程重新加载并通知订阅者
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = freeze(yaml.safe_load(DEFAULT_CONFIG))
+                self._signature = self._stat()
+                self.error = error
+            return self._snapshot
+
+    def start(self):
+        # 先完成首次加载（配置无效时抛出 ConfigError），再启动监视线程
+        self.snapshot()
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name='pydeepl-config', daemon=True)
+            self._thread.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            if self._stat() != self._signature:
+                try:
+                    self.reload()
+                except ConfigError:
+                    pass
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def config_service(config_file: str = CONFIG_FILE) -> ConfigService:
+    with _services_lock:
+        service = _services.get(config_file)
+        if service is None:
+            service = ConfigService(config_file)
+            _services[config_file] = service
+    return service
+
+
+def read_config(config_file: str = CONFIG_FILE):
+    # 返回的快照在进程内共享且只读，需要修改时复制：dict(config, key=value)
+    return config_service(config_file).snapshot()
+
+
+def read_config_or_default(config_file: str = CONFIG_FILE):
+    # 返回 (配置, 错误)：配置文件无效时使用默认配置，错误交给调用方提示
+    service = config_service(config_file)
+    try:
+        return service.snapshot(), None
+    except ConfigError as e:
+        return service.fallback(e), e
+
+
+def close_config_services():
+    with _services_lock:
+        services = list(_services.values())
+    for service in services:
+        service.stop()
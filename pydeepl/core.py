@@ -0,0 +1,339 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from pydeepl import metrics
+from pydeepl.batching import batcher_from_config
+from pydeepl.cache import cache_from_config
+from pydeepl.chunking import ChunkPlanner, latency_model
+from pydeepl.client import retire_translator
+from pydeepl.config import read_config
+from pydeepl.detect import resolve_source
+from pydeepl.documents import resume_documents, translate_document, translate_documents, translated_path
+from pydeepl.fanout import fan_out
+from pydeepl.glossary import base_lang, glossary_from_config
+from pydeepl.jobs import jobs_from_config
+from pydeepl.scheduler import BATCH, BULK, INTERACTIVE, scheduled_translator_from_config
+from pydeepl.segments import IncrementalTranslator, join_segments, split_segments
+
+# 长文本分块翻译时每块的最大字符数，中文等按 JSON 转义后仍低于单次请求的大小限制；超过此长度的文本分块同时翻译
+CHUNK_CHARS = 10000
+
+_incremental = IncrementalTranslator()
+
+
+def warm_up(config: dict = None):
+    # 提前导入 deepl、创建客户端并打开翻译缓存，第一次翻译时不必再等待
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    scheduled_translator_from_config(config, INTERACTIVE)
+    cache_from_config(config)
+
+
+def apply_config(old: dict, new: dict):
+    # 配置热更新：API 密钥或服务地址变化时换用新的客户端，并提前创建，下一次翻译不必等待
+    if (old.get('deepl_api'), old.get('server_url')) != (new.get('deepl_api'), new.get('server_url')):
+        retire_translator(old.get('deepl_api'), old.get('server_url'))
+        warm_up(new)
+
+
+def glossary_options(config: dict, source_lang, target_lang: str, create: bool = True) -> dict:
+    # 该语言对配置了术语表时附加到请求中；术语表 ID 同时进入缓存键，术语变化后不会命中旧译文
+    glossary_id = glossary_from_config(config, source_lang, target_lang, create)
+    return {'glossary': glossary_id} if glossary_id else {}
+
+
+@metrics.timed('translate')
+def translate(text: str, source_lang: str = None, target_lang: str = 'ZH', config: dict = None,
+              incremental: bool = None, priority: int = INTERACTIVE) -> str:
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    # 未指定源语言时先在本地检测：已是目标语言则不必发请求，否则带上源语言使缓存键更精确
+    source_lang, same_language = resolve_source(text, source_lang, target_lang, config)
+    if same_language:
+        return text
+    options = glossary_options(config, source_lang, target_lang)
+    cache = cache_from_config(config)
+    if cache is not None:
+        cached = cache.get(text, source_lang, target_lang, **options)
+        if cached is not None:
+            return cached
+
+    translator = scheduled_translator_from_config(config, priority)
+    if incremental is None:
+        incremental = config.get('incremental', False)
+    if incremental:
+        # 增量模式：只翻译与上次提交相比新增或改动过的句子
+        translated_text = _incremental.translate(translator, text, source_lang, target_lang, cache=cache, **options)
+    elif len(text) > CHUNK_CHARS:
+        # 超过单个请求上限的文本分块同时翻译
+        translated_text = ''.join(_translate_chunks(translator, text, source_lang, target_lang, config, options,
+                                                    cache, CHUNK_CHARS))
+    else:
+        # 经共享的合并器发送：其他调用方同时提交的短文本（如常驻进程中并发的请求）合并成一个请求
+        translated_text = batcher_from_config(config, priority).translate(text, source_lang, target_lang, **options)
+    # 增量译文是逐句翻译拼成的，没有整段上下文，只保留各句的缓存，不作为全文译文缓存
+    if cache is not None and not incremental:
+        cache.put(text, source_lang, target_lang, translated_text, **options)
+    return translated_text
+
+
+def translate_chunks(text: str, source_lang: str = None, target_lang: str = 'ZH', config: dict = None,
+                     max_chars: int = CHUNK_CHARS, priority: int = INTERACTIVE, incremental: bool = None):
+    # 长文本按段落和句子边界切块同时翻译，按顺序逐块返回译文，调用方可以边收边显示
+    # 源语言只对全文检测一次，各块使用相同的源语言；全文译文完成后整体缓存
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    source_lang, same_language = resolve_source(text, source_lang, target_lang, config)
+    if same_language:
+        yield text
+        return
+    options = glossary_options(config, source_lang, target_lang)
+    cache = cache_from_config(config)
+    if cache is not None:
+        cached = cache.get(text, source_lang, target_lang, **options)
+        if cached is not None:
+            yield cached
+            return
+
+    translator = scheduled_translator_from_config(config, priority)
+    if incremental is None:
+        incremental = config.get('incremental', False)
+    if incremental:
+        # 增量模式与 translate 相同：逐句与上次提交比较，只翻译新增或改动过的句子。
+        # 自适应的块边界每次都可能不同，按块缓存无法复用，因此不分块，译文一次返回
+        yield _incremental.translate(translator, text, source_lang, target_lang, cache=cache, **options)
+        return
+    translations = []
+    for translated_chunk in _translate_chunks(translator, text, source_lang, target_lang, config, options, cache,
+                                              max_chars):
+        translations.append(translated_chunk)
+        yield translated_chunk
+    if cache is not None:
+        cache.put(text, source_lang, target_lang, ''.join(translations), **options)
+
+
+def _translate_chunks(translator, text: str, source_lang, target_lang: str, config: dict, options: dict, cache,
+                      max_chars: int):
+    # 最多 chunk_concurrency 个块同时翻译，按原顺序逐块产出；块的大小根据观测到的每字符耗时调整
+    concurrency = config.get('chunk_concurrency', 4)
+    planner = ChunkPlanner(text, max_chars, concurrency)
+
+    def run(chunk, context):
+        body = chunk.strip()
+        if not body:
+            return chunk
+        # DeepL 会去掉首尾的空白，由这里原样补回，保证块与块之间的换行不丢失
+        leading = chunk[:len(chunk) - len(chunk.lstrip())]
+        trailing = chunk[len(chunk.rstrip()):]
+        translated_text = cache.get(body, source_lang, target_lang, **options) if cache is not None else None
+        if translated_text is None:
+            # 前一块的末尾几句作为上文一起发送（不翻译、不计费），块首的译文能与前文衔接；上文不进入缓存键
+            extra = {'context': context} if context else {}
+            start = time.perf_counter()
+            translated_text = translator.translate_text(body, source_lang=source_lang, target_lang=target_lang,
+                                                        **options, **extra).text
+            latency_model.observe(len(body), time.perf_counter() - start)
+            if cache is not None:
+                cache.put(body, source_lang, target_lang, translated_text, **options)
+        return leading + translated_text + trailing
+
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='pydeepl-chunk')
+    inflight = deque()
+    try:
+        while True:
+            while len(inflight) < max(1, concurrency):
+                item = planner.next_chunk()
+                if item is None:
+                    break
+                inflight.append(executor.submit(run, *item))
+            if not inflight:
+                break
+            yield inflight.popleft().result()
+    finally:
+        # 调用方提前停止（如取消翻译）时，尚未开始的块不再发送
+        for future in inflight:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def preview(text: str, source_lang: str = None, target_lang: str = 'ZH', config: dict = None):
+    # 只用本地已有的译文拼出预览，不访问网络；返回 (预览文本或 None, 是否已完整)
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    source_lang, same_language = resolve_source(text, source_lang, target_lang, config)
+    if same_language:
+        return text, True
+    options = glossary_options(config, source_lang, target_lang, create=False)
+    cache = cache_from_config(config)
+    if cache is not None:
+        cached = cache.get(text, source_lang, target_lang, **options)
+        if cached is not None:
+            return cached, True
+
+    pieces = split_segments(text)
+    translations = {}
+    complete = True
+    for body, _ in pieces:
+        if not body.strip() or body in translations:
+            continue
+        cached = _incremental.lookup(body, source_lang, target_lang, **options)
+        if cached is None and cache is not None:
+            cached = cache.get(body, source_lang, target_lang, **options)
+        if cached is None:
+            complete = False
+        else:
+            translations[body] = cached
+    if not translations:
+        return None, False
+    # 非增量模式下逐句拼出的译文只作预览，仍需按全文翻译
+    return join_segments(pieces, translations), complete and bool(config.get('incremental', False))
+
+
+@metrics.timed('translate_texts')
+def translate_texts(texts: list, source_lang: str = None, target_lang: str = 'ZH', config: dict = None,
+                    priority: int = BATCH) -> list:
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    cache = cache_from_config(config)
+    translations = {}
+    # 按（检测后的）源语言分组发送，每组使用各自语言对的术语表
+    missing = {}
+    options = {}
+    for text in dict.fromkeys(texts):
+        if not text.strip():
+            translations[text] = text
+            continue
+        text_source, same_language = resolve_source(text, source_lang, target_lang, config)
+        if same_language:
+            translations[text] = text
+            continue
+        if text_source not in options:
+            options[text_source] = glossary_options(config, text_source, target_lang)
+        cached = cache.get(text, text_source, target_lang, **options[text_source]) if cache is not None else None
+        if cached is not None:
+            translations[text] = cached
+        else:
+            missing.setdefault(text_source, []).append(text)
+
+    if missing:
+        batcher = batcher_from_config(config, priority)
+    for text_source, group in missing.items():
+        results = batcher.translate_many(group, text_source, target_lang, **options[text_source])
+        for text, translated_text in zip(group, results):
+            translations[text] = translated_text
+            if cache is not None:
+                cache.put(text, text_source, target_lang, translated_text, **options[text_source])
+    return [translations[text] for text in texts]
+
+
+@metrics.timed('translate_file')
+def translate_file(file_path: str, target_lang: str = 'ZH', source_lang: str = None, save_path: str = None,
+                   config: dict = None, progress=None, is_cancelled=None) -> str:
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    if save_path is None:
+        save_path = translated_path(file_path)
+    translator = scheduled_translator_from_config(config, BULK)
+    glossary = glossary_from_config(config, source_lang, target_lang)
+    jobs = jobs_from_config(config)
+    translate_document(translator, file_path, save_path, target_lang, source_lang=source_lang,
+                       progress=progress, is_cancelled=is_cancelled, glossary=glossary, jobs=jobs,
+                       job=jobs.find(file_path, source_lang, target_lang, glossary) if jobs is not None else None)
+    return save_path
+
+
+@metrics.timed('translate_files')
+def translate_files(file_paths: list, target_lang: str = 'ZH', source_lang: str = None, output_dir: str = None,
+                    config: dict = None, max_workers: int = None, progress=None, is_cancelled=None,
+                    slots=None) -> list:
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    if max_workers is None:
+        max_workers = config.get('max_concurrent_documents', 4)
+    translator = scheduled_translator_from_config(config, BULK)
+
+    def texts_translator(texts):
+        return translate_texts(texts, source_lang, target_lang, config=config, priority=BULK)
+
+    # .txt/.srt 文件按块走文本接口，不受文档大小限制，且可复用翻译缓存；
+    # 开启 extract_files 后 .xlsx/.xliff 文件在本地提取文字，重复的文字只翻译一次
+    return translate_documents(translator, file_paths, target_lang, source_lang=source_lang, output_dir=output_dir,
+                               max_workers=max_workers, progress=progress, is_cancelled=is_cancelled,
+                               translate_texts=texts_translator if config.get('stream_text_files', True) else None,
+                               extract_texts=texts_translator if config.get('extract_files', False) else None,
+                               glossary=glossary_from_config(config, source_lang, target_lang),
+                               jobs=jobs_from_config(config), slots=slots)
+
+
+@metrics.timed('resume_files')
+def resume_files(config: dict = None, max_workers: int = None, progress=None, is_cancelled=None) -> list:
+    # 继续上次退出或崩溃时已上传但尚未下载的文件
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    jobs = jobs_from_config(config)
+    if jobs is None or not jobs.pending():
+        return []
+    if max_workers is None:
+        max_workers = config.get('max_concurrent_documents', 4)
+    return resume_documents(scheduled_translator_from_config(config, BULK), jobs, max_workers=max_workers,
+                            progress=progress, is_cancelled=is_cancelled)
+
+
+@metrics.timed('translate_targets')
+def translate_targets(text: str, target_langs: list, source_lang: str = None, config: dict = None) -> dict:
+    # 同一段文本翻译成多种目标语言：源语言只检测一次，各语言同时发送，共用同一个调度器的限速
+    # 返回 {目标语言: TargetResult}；与源语言相同的目标语言直接返回原文
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    source_lang, _ = resolve_source(text, source_lang, target_langs[0], config) if target_langs else (None, False)
+    # 检测不出源语言时交给 DeepL 自动检测，各语言不必再各自检测一遍
+    run_config = config if source_lang is not None else dict(config, detect_language=False)
+
+    def run(target_lang):
+        if source_lang is not None and source_lang == base_lang(target_lang):
+            return text
+        return translate(text, source_lang, target_lang, config=run_config)
+
+    return fan_out(target_langs, run)
+
+
+@metrics.timed('translate_files_targets')
+def translate_files_targets(file_paths: list, target_langs: list, source_lang: str = None, output_dir: str = None,
+                            config: dict = None, max_workers: int = None, progress=None, is_cancelled=None) -> dict:
+    # 文件翻译成多种目标语言，各语言的译文分别保存在输出目录下以语言代码命名的子目录中
+    # DeepL 的文档接口每次上传只能指定一种目标语言，因此每种语言各上传一次，各语言同时进行；
+    # 每种语言内部的文件并发数与单一语言时相同，实际同时发出的请求数由共享的调度器限制
+    if config is None:
+        with metrics.stage('config'):
+            config = read_config()
+    if max_workers is None:
+        max_workers = config.get('max_concurrent_documents', 4)
+    if output_dir is None and file_paths:
+        output_dir = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in file_paths])
+    # 各语言共用任务记录中的 max_active 个名额时，多语言的文件只能排队依次进行，总耗时随语言数增长；
+    # 这次翻译的各语言另用一份名额，大小足够每种语言按单一语言时的并发数同时进行
+    jobs = jobs_from_config(config)
+    slots = None
+    if jobs is not None:
+        per_target = max(1, min(len(file_paths), max_workers))
+        slots = threading.BoundedSemaphore(max(jobs.max_active, len(target_langs) * per_target))
+
+    def run(target_lang):
+        report = (lambda message: progress(f'{target_lang}：{message}')) if progress else None
+        return translate_files(file_paths, target_lang, source_lang=source_lang,
+                               output_dir=os.path.join(output_dir, target_lang) if output_dir else None, config=config,
+                               max_workers=max_workers, progress=report, is_cancelled=is_cancelled, slots=slots)
+
+    return fan_out(target_langs, run)
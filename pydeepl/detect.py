@@ -0,0 +1,144 @@
+import math
+import re
+import threading
+from collections import Counter
+from itertools import repeat
+
+# 只检测界面中可选的源语言；结果不够确定时返回 None，交给 DeepL 自动检测
+SAMPLE_CHARS = 1000
+SAMPLE_WINDOWS = 3
+MIN_CJK_CHARS = 4
+# 只有汉字时无法区分中文和纯汉字的日文，也无法区分简体和繁体：较长的文本才作为中文源语言发送，且从不据此跳过翻译
+MIN_HAN_CHARS = 10
+MIN_LATIN_LETTERS = 20
+MIN_MARGIN = 0.05
+# 模型之外的拉丁字母语言（荷兰语、瑞典语、波兰语等）常用词命中率和已见三元组比例都明显偏低
+MIN_COMMON_WORDS = 0.1
+MIN_SEEN_TRIGRAMS = 0.45
+# 判断为"已是目标语言"而不发请求时要求更高的把握
+CONFIDENT_MARGIN = 0.1
+CONFIDENT_COMMON_WORDS = 0.2
+CONFIDENT_SEEN_TRIGRAMS = 0.6
+# 乌克兰语、白俄罗斯语、塞尔维亚语等特有的西里尔字母，出现时不按俄语处理
+NON_RUSSIAN_CYRILLIC = set('іїєґўђћџљњјѓќѕ')
+
+_WORD = re.compile(r'[^\W\d_]+')
+
+# 三元组模型在第一次检测时才构建
+_model = None
+_model_lock = threading.Lock()
+
+
+def _script_counts(text: str):
+    han = kana = cyrillic = latin = 0
+    for char in text:
+        code = ord(char)
+        if code < 0x250:
+            if char.isalpha():
+                latin += 1
+        elif 0x3040 <= code <= 0x30ff or 0xff66 <= code <= 0xff9f:
+            kana += 1
+        elif 0x4e00 <= code <= 0x9fff or 0x3400 <= code <= 0x4dbf:
+            han += 1
+        elif 0x400 <= code <= 0x4ff:
+            cyrillic += 1
+    return han, kana, cyrillic, latin
+
+
+def _trigrams(text: str):
+    # 去掉数字和标点后以单个空格连接，三元组可以跨越词边界
+    normalized = f' {" ".join(_WORD.findall(text.lower()))} '
+    return [normalized[i:i + 3] for i in range(len(normalized) - 2)]
+
+
+def _load_model():
+    global _model
+    with _model_lock:
+        if _model is None:
+            from pydeepl.detect_corpus import COMMON_WORDS, SAMPLES
+
+            model = {}
+            for lang, sample in SAMPLES.items():
+                counts = Counter(_trigrams(sample))
+                # 常用词单独切分，避免词与词之间的三元组混入
+                for word in COMMON_WORDS[lang].split():
+                    counts.update(_trigrams(word))
+                # 加一平滑后的对数概率；未出现过的三元组统一记为 unseen
+                total = sum(counts.values()) + len(counts)
+                model[lang] = ({gram: math.log((count + 1) / total) for gram, count in counts.items()},
+                               math.log(1 / total), set(COMMON_WORDS[lang].split()))
+            _model = model
+    return _model
+
+
+def _detect_latin(text: str):
+    # 返回 (语言, 是否有把握)
+    model = _model or _load_model()
+    grams = _trigrams(text)
+    if not grams:
+        return None, False
+    scores = {lang: sum(map(probabilities.get, grams, repeat(unseen)))
+              for lang, (probabilities, unseen, _) in model.items()}
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    # 最优与次优的平均对数似然差距太小时视为无法判断
+    margin = (scores[ranked[0]] - scores[ranked[1]]) / len(grams)
+    if margin < MIN_MARGIN:
+        return None, False
+    lang = ranked[0]
+    probabilities, _, common_words = model[lang]
+    # 三元组模型总会选出最接近的一种语言；文本不属于任何已知语言时，常用词和已见三元组都很少
+    words = _WORD.findall(text.lower())
+    common = sum(word in common_words for word in words) / len(words)
+    seen = sum(gram in probabilities for gram in grams) / len(grams)
+    if common < MIN_COMMON_WORDS or seen < MIN_SEEN_TRIGRAMS:
+        return None, False
+    return lang, (margin >= CONFIDENT_MARGIN and common >= CONFIDENT_COMMON_WORDS
+                  and seen >= CONFIDENT_SEEN_TRIGRAMS)
+
+
+def _detect_sample(sample: str):
+    han, kana, cyrillic, latin = _script_counts(sample)
+    cjk = han + kana
+    # 一个汉字/假名大致相当于两三个拉丁字母，夹杂少量英文单词的中文仍按中文处理
+    if cjk >= MIN_CJK_CHARS and cjk * 3 >= latin:
+        if kana * 10 >= cjk:
+            return 'JA', True
+        if kana or han < MIN_HAN_CHARS:
+            return None, False
+        return 'ZH', False
+    if cyrillic > latin:
+        if cyrillic < MIN_LATIN_LETTERS // 2 or not NON_RUSSIAN_CYRILLIC.isdisjoint(sample.lower()):
+            return None, False
+        return 'RU', True
+    if latin >= MIN_LATIN_LETTERS:
+        return _detect_latin(sample)
+    return None, False
+
+
+def _sample_windows(text: str) -> list:
+    # 长文本从开头、中间和结尾各取一段，开头一小段其他语言的标题不会决定整篇文本的语言
+    if len(text) <= SAMPLE_CHARS * SAMPLE_WINDOWS:
+        return [text]
+    step = (len(text) - SAMPLE_CHARS) // (SAMPLE_WINDOWS - 1)
+    return [text[i * step:i * step + SAMPLE_CHARS] for i in range(SAMPLE_WINDOWS)]
+
+
+def detect_language(text: str):
+    return _detect_sample('\n'.join(_sample_windows(text)))[0]
+
+
+def resolve_source(text: str, source_lang, target_lang: str, config: dict):
+    # 返回 (源语言, 是否与目标语言相同)；已指定源语言或关闭检测时原样返回
+    if source_lang is not None or not config.get('detect_language', True):
+        return source_lang, False
+    windows = _sample_windows(text)
+    detected, confident = _detect_sample('\n'.join(windows))
+    if detected is None:
+        return None, False
+    if detected == target_lang.upper().split('-')[0]:
+        # 只有很有把握时才不翻译直接返回原文，否则交给 DeepL 自动检测；
+        # 长文本还要求各段的检测结果一致（夹杂多种语言的文档仍需翻译）
+        if confident and len(windows) > 1:
+            confident = all(_detect_sample(window)[0] == detected for window in windows)
+        return (detected, True) if confident else (None, False)
+    return detected, False
@@ -0,0 +1,106 @@
+# 拉丁字母语言的样本文本，首次检测语言时据此构建三元组模型
+SAMPLES = {
+    'EN': '''
+The weather was cold and grey when we arrived in the city, but the people we met were friendly and helpful.
+We spent the first day walking through the old town, looking at the buildings and stopping for coffee whenever
+it started to rain. In the evening we found a small restaurant near the river where the food was simple and
+very good. The next morning I had to work, so I opened my laptop and answered the emails that had been waiting
+for me since the beginning of the week. It is not always easy to focus when you are travelling, but I think
+that a change of place can also bring new ideas. Please make sure that you have saved all of your files before
+you close the application, otherwise your changes will be lost. If you have any questions about this project,
+you can contact our team at any time and we will do our best to help you. Which of these options would you
+like to choose, and how long do you expect the whole process to take? They would have finished earlier if
+the system had not stopped working during the night.
+''',
+    'DE': '''
+Das Wetter war kalt und grau, als wir in der Stadt ankamen, aber die Menschen, die wir trafen, waren freundlich
+und hilfsbereit. Am ersten Tag sind wir durch die Altstadt gelaufen, haben uns die Gebäude angesehen und sind
+immer dann in ein Café gegangen, wenn es zu regnen begann. Am Abend haben wir ein kleines Restaurant in der
+Nähe des Flusses gefunden, wo das Essen einfach und sehr gut war. Am nächsten Morgen musste ich arbeiten, also
+habe ich meinen Laptop geöffnet und die E-Mails beantwortet, die seit Anfang der Woche auf mich gewartet
+hatten. Es ist nicht immer leicht, sich auf Reisen zu konzentrieren, aber ich glaube, dass ein Ortswechsel
+auch neue Ideen bringen kann. Bitte stellen Sie sicher, dass Sie alle Dateien gespeichert haben, bevor Sie die
+Anwendung schließen, sonst gehen Ihre Änderungen verloren. Wenn Sie Fragen zu diesem Projekt haben, können
+Sie sich jederzeit an unser Team wenden, und wir werden unser Bestes tun, um Ihnen zu helfen. Welche dieser
+Möglichkeiten möchten Sie wählen, und wie lange wird der gesamte Vorgang voraussichtlich dauern?
+''',
+    'FR': '''
+Le temps était froid et gris quand nous sommes arrivés dans la ville, mais les gens que nous avons rencontrés
+étaient aimables et serviables. Nous avons passé le premier jour à nous promener dans la vieille ville, à
+regarder les bâtiments et à nous arrêter pour prendre un café chaque fois qu'il commençait à pleuvoir. Le soir,
+nous avons trouvé un petit restaurant près de la rivière où la cuisine était simple et très bonne. Le
+lendemain matin, je devais travailler, alors j'ai ouvert mon ordinateur et j'ai répondu aux courriels qui
+m'attendaient depuis le début de la semaine. Il n'est pas toujours facile de se concentrer quand on voyage,
+mais je pense qu'un changement de lieu peut aussi apporter de nouvelles idées. Veuillez vous assurer que vous
+avez enregistré tous vos fichiers avant de fermer l'application, sinon vos modifications seront perdues. Si
+vous avez des questions sur ce projet, vous pouvez contacter notre équipe à tout moment et nous ferons de
+notre mieux pour vous aider. Laquelle de ces options voulez-vous choisir, et combien de temps pensez-vous que
+cela va prendre ?
+''',
+    'IT': '''
+Il tempo era freddo e grigio quando siamo arrivati in città, ma le persone che abbiamo incontrato erano
+gentili e disponibili. Abbiamo passato il primo giorno a camminare per il centro storico, guardando gli
+edifici e fermandoci a prendere un caffè ogni volta che cominciava a piovere. La sera abbiamo trovato un
+piccolo ristorante vicino al fiume dove il cibo era semplice e molto buono. La mattina dopo dovevo lavorare,
+quindi ho aperto il mio portatile e ho risposto alle email che mi aspettavano dall'inizio della settimana.
+Non è sempre facile concentrarsi quando si viaggia, ma penso che un cambiamento di luogo possa anche portare
+nuove idee. Assicuratevi di aver salvato tutti i file prima di chiudere l'applicazione, altrimenti le
+modifiche andranno perse. Se avete domande su questo progetto, potete contattare il nostro gruppo in qualsiasi
+momento e faremo del nostro meglio per aiutarvi. Quale di queste opzioni volete scegliere, e quanto tempo
+pensate che ci vorrà per completare tutto il processo? Gli abbiamo detto che della questione si sarebbe
+occupato lui.
+''',
+    'ES': '''
+El tiempo era frío y gris cuando llegamos a la ciudad, pero las personas que conocimos eran amables y
+serviciales. Pasamos el primer día caminando por el casco antiguo, mirando los edificios y parando a tomar un
+café cada vez que empezaba a llover. Por la noche encontramos un pequeño restaurante cerca del río donde la
+comida era sencilla y muy buena. A la mañana siguiente tenía que trabajar, así que abrí mi portátil y respondí
+a los correos que me esperaban desde el principio de la semana. No siempre es fácil concentrarse cuando uno
+viaja, pero creo que un cambio de lugar también puede traer nuevas ideas. Por favor, asegúrese de haber
+guardado todos sus archivos antes de cerrar la aplicación; de lo contrario, se perderán los cambios. Si tiene
+alguna pregunta sobre este proyecto, puede ponerse en contacto con nuestro equipo en cualquier momento y
+haremos todo lo posible para ayudarle. ¿Cuál de estas opciones quiere elegir y cuánto tiempo cree que llevará
+todo el proceso? Los niños estaban jugando en la calle con sus amigos.
+''',
+    'PT': '''
+O tempo estava frio e cinzento quando chegámos à cidade, mas as pessoas que conhecemos eram simpáticas e
+prestáveis. Passámos o primeiro dia a caminhar pela cidade velha, a olhar para os edifícios e a parar para
+tomar um café sempre que começava a chover. À noite encontrámos um pequeno restaurante perto do rio, onde a
+comida era simples e muito boa. Na manhã seguinte tive de trabalhar, por isso abri o meu portátil e respondi
+aos emails que estavam à minha espera desde o início da semana. Nem sempre é fácil concentrar-se quando se
+viaja, mas acho que uma mudança de lugar também pode trazer novas ideias. Por favor, certifique-se de que
+guardou todos os seus ficheiros antes de fechar a aplicação, caso contrário as suas alterações serão perdidas.
+Se tiver alguma dúvida sobre este projeto, pode contactar a nossa equipa a qualquer momento e faremos o
+possível para o ajudar. Qual destas opções quer escolher e quanto tempo acha que o processo vai demorar? Não
+sabemos se eles já terminaram o trabalho, mas vamos perguntar amanhã. Você não está sozinho nessa situação.
+''',
+}
+
+# 各语言最常用的词，补充样本文本中覆盖不足的高频三元组
+COMMON_WORDS = {
+    'EN': '''the of and to in is you that it he was for on are as with his they at be this have from or one
+had by word but not what all were we when your can said there use an each which she do how their if will up
+other about out many then them these so some her would make like him into time has look two more write go see
+number no way could people my than first been call who its now find long down day did get come made may part
+because should where why after before very just only also any through''',
+    'DE': '''der die und in den von zu das mit sich des auf für ist im dem nicht ein eine als auch es an werden aus
+er hat dass sie nach wird bei einer um am sind noch wie einem über einen so zum war haben nur oder aber vor zur
+bis mehr durch man sein wurde sei ich wir ihr uns euch mich dich wenn dann schon hier doch kann können muss soll
+sehr immer wieder jetzt heute diese dieser dieses welche weil ohne unter zwischen gegen seit während deutsch''',
+    'FR': '''de la le et les des en un du une que est pour qui dans par plus pas au sur ne se ce il sont avec
+ou son elle nous vous ils leur mais comme on tout aussi été fait peut cette ces aux ses même sans bien très
+faire entre après sous deux donc encore alors ici où quand parce avoir être nous leurs avant depuis toujours
+chaque rien autre moins peu beaucoup déjà français''',
+    'IT': '''di che il la e in un per una non sono del è della con si le da al dei gli lo mi ma come anche più
+nel alla io ci questo ha ho hanno essere fatto molto dopo prima sempre ancora tutto tutti quando perché dove
+questa quello cosa sua suo loro noi voi era erano sia stato nella delle degli sul sulla tra fra così qui oggi
+già bene italiano''',
+    'ES': '''de la que el en y a los se del las un por con no una su para es al lo como más pero sus le ya o
+este sí porque esta entre cuando muy sin sobre también me hasta hay donde quien desde todo nos durante todos
+uno les ni contra otros ese eso ante ellos e esto mí antes algunos qué unos yo otro otras otra él tanto esa
+estos mucho quienes nada muchos cual poco ella estar estas algunas algo nosotros español''',
+    'PT': '''de a o que e do da em um para é com não uma os no se na por mais as dos como mas foi ao ele das tem
+à seu sua ou ser quando muito há nos já está eu também só pelo pela até isso ela entre era depois sem mesmo aos
+ter seus quem nas me esse eles estão você tinha foram essa num nem suas meu às minha têm numa pelos elas havia
+seja qual será nós tenho lhe deles essas esses pelas este fosse dele português''',
+}
@@ -0,0 +1,68 @@
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QDialog, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem, QVBoxLayout
+
+from pydeepl import metrics
+
+REFRESH_MS = 1000
+COLUMNS = ['操作/阶段', '次数', '错误', 'p50 ms', 'p95 ms', 'p99 ms', '字符', '缓存命中', '重试']
+
+
+class DiagnosticsDialog(QDialog):
+    # 诊断面板：每种操作的次数、错误、计费字符、缓存命中率，以及总耗时和各阶段耗时的 p50/p95/p99
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('PyDeepL 诊断')
+        self.resize(760, 420)
+
+        self.status = QLabel(self)
+        self.tree = QTreeWidget(self)
+        self.tree.setColumnCount(len(COLUMNS))
+        self.tree.setHeaderLabels(COLUMNS)
+        self.tree.setColumnWidth(0, 180)
+        reset_button = QPushButton('清空', self)
+        reset_button.clicked.connect(self.reset)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.status, 1)
+        buttons.addWidget(reset_button)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.tree)
+        layout.addLayout(buttons)
+
+        # 只在面板可见时刷新
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def reset(self):
+        metrics.recorder.reset()
+        self.refresh()
+
+    def refresh(self):
+        if metrics.enabled():
+            self.status.setText(f'每种操作保留最近 {metrics.recorder.max_samples} 次的耗时用于计算分位数')
+        else:
+            self.status.setText('统计未开启：在配置文件中设置 metrics: {enabled: true}')
+
+        expanded = {self.tree.topLevelItem(i).text(0) for i in range(self.tree.topLevelItemCount())
+                    if self.tree.topLevelItem(i).isExpanded()}
+        self.tree.clear()
+        for row in metrics.recorder.summary():
+            lookups = row['cache_hits'] + row['cache_misses']
+            hit_rate = f'{row["cache_hits"] / lookups:.0%}' if lookups else '-'
+            item = QTreeWidgetItem([row['operation'], str(row['count']), str(row['errors'])]
+                                   + [f'{value:.1f}' for value in row['duration']]
+                                   + [str(row['characters']), hit_rate, str(row['retries'])])
+            for stage_name, values in row['stages'].items():
+                item.addChild(QTreeWidgetItem([stage_name, '', ''] + [f'{value:.1f}' for value in values]))
+            self.tree.addTopLevelItem(item)
+            item.setExpanded(row['operation'] in expanded)
@@ -0,0 +1,264 @@
+import collections
+import datetime
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pydeepl import metrics
+from pydeepl.extract import ExtractionUnsupported, extract_translate_file, is_extractable
+from pydeepl.jobs import CANCELLED, DONE, FAILED
+from pydeepl.streaming import STREAMABLE_EXTENSIONS, find_resumable, stream_translate_file
+
+# 轮询间隔从很短开始，逐步放宽；服务器给出剩余时间时以其为准
+MIN_POLL_INTERVAL = 0.25
+MAX_POLL_INTERVAL = 5.0
+POLL_BACKOFF = 1.5
+
+DocumentResult = collections.namedtuple('DocumentResult',
+                                        ['file_path', 'save_path', 'ok', 'error', 'billed_characters', 'elapsed'])
+
+
+class TranslationCancelled(Exception):
+    pass
+
+
+def translated_path(file_path: str, output_dir: str = None) -> str:
+    directory, filename = os.path.split(file_path)
+    name, ext = os.path.splitext(filename)
+    timestamp = datetime.datetime.now().strftime('%y%m%d%H%M%S')
+    return os.path.join(output_dir or directory, f'{name}_translated_{timestamp}{ext}')
+
+
+def next_poll_interval(status, previous: float = None) -> float:
+    if status.seconds_remaining:
+        interval = float(status.seconds_remaining)
+    elif previous is None:
+        interval = MIN_POLL_INTERVAL
+    else:
+        interval = previous * POLL_BACKOFF
+    return min(max(interval, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL)
+
+
+def translate_document(translator, file_path: str, save_path: str, target_lang: str, source_lang: str = None,
+                       progress=None, is_cancelled=None, glossary: str = None, jobs=None, job=None, slots=None):
+    # 上传 -> 轮询状态 -> 下载，每一步之间都可以取消
+    # 提供 jobs 时，上传后记录 document_id，之后的轮询和下载可以在重启后继续；job 为要继续的已上传任务
+    # slots 为同时进行中的文件数上限，默认使用 jobs.slots
+    def report(message):
+        if progress is not None:
+            progress(message)
+
+    def check_cancelled():
+        if is_cancelled is not None and is_cancelled():
+            raise TranslationCancelled()
+
+    if jobs is None:
+        return _translate_document(translator, file_path, save_path, target_lang, source_lang, report,
+                                   check_cancelled, glossary, None, None)
+    # 所有批次共用同时进行中的文件数上限，等待期间也可以取消
+    if slots is None:
+        slots = jobs.slots
+    while not slots.acquire(timeout=0.5):
+        check_cancelled()
+        report('等待其他文件翻译完成…')
+    try:
+        return _translate_document(translator, file_path, save_path, target_lang, source_lang, report,
+                                   check_cancelled, glossary, jobs, job)
+    finally:
+        slots.release()
+
+
+def _translate_document(translator, file_path, save_path, target_lang, source_lang, report, check_cancelled,
+                        glossary, jobs, job):
+    job_id = None
+    status = None
+    if job is not None:
+        import deepl
+
+        job_id = job.id
+        handle = deepl.DocumentHandle(job.document_id, job.document_key)
+        report('继续上次未完成的翻译…')
+        try:
+            status = translator.translate_document_get_status(handle)
+        except deepl.DeepLException as e:
+            # DeepL 只保留文档一段时间，已失效时重新上传；网络错误等直接失败，任务留待下次继续
+            if e.http_status_code not in (400, 404):
+                raise
+            jobs.finish(job_id, FAILED, error='DeepL 上的文档已失效，已重新上传')
+            job_id = None
+
+    if status is None:
+        check_cancelled()
+        report('正在上传文件…')
+        with open(file_path, 'rb') as file:
+            handle = translator.translate_document_upload(file, source_lang=source_lang, target_lang=target_lang,
+                                                          filename=os.path.basename(file_path), glossary=glossary)
+        if jobs is not None:
+            job_id = jobs.uploaded(file_path, save_path, source_lang, target_lang, glossary, handle)
+        status = translator.translate_document_get_status(handle)
+
+    try:
+        interval = None
+        while status.ok and not status.done:
+            check_cancelled()
+            if status.seconds_remaining:
+                report(f'正在翻译，预计剩余 {status.seconds_remaining} 秒…')
+            else:
+                report('正在翻译…')
+            interval = next_poll_interval(status, interval)
+            time.sleep(interval)
+            status = translator.translate_document_get_status(handle)
+
+        if not status.ok:
+            if jobs is not None:
+                jobs.finish(job_id, FAILED, error=status.error_message or '文档翻译失败')
+            raise RuntimeError(status.error_message or '文档翻译失败')
+
+        check_cancelled()
+        report('正在下载译文…')
+        import deepl
+
+        try:
+            try:
+                with open(save_path, 'wb') as file:
+                    translator.translate_document_download(handle, file, chunk_size=64 * 1024)
+            except BaseException:
+                if os.path.exists(save_path):
+                    os.remove(save_path)
+                raise
+        except deepl.DeepLException as e:
+            # DeepL 的译文只能下载一次且只保留一段时间：已下载过或已失效时任务无法继续，标记为失败，不再每次启动时重试
+            if e.http_status_code not in (400, 404):
+                raise
+            error = 'DeepL 上的译文已下载过或已失效，请重新翻译该文件'
+            if jobs is not None:
+                jobs.finish(job_id, FAILED, error=error)
+            raise RuntimeError(error) from None
+    except TranslationCancelled:
+        # 已计费的文档保留 document_id，再次翻译同一文件时直接继续
+        if jobs is not None:
+            jobs.finish(job_id, CANCELLED)
+        raise
+    # 其他错误（网络中断等）不改变任务状态，之后可以继续
+    if jobs is not None:
+        jobs.finish(job_id, DONE, billed_characters=status.billed_characters, save_path=save_path)
+    return status
+
+
+def is_streamable(file_path: str) -> bool:
+    return os.path.splitext(file_path)[1].lower() in STREAMABLE_EXTENSIONS
+
+
+def translate_documents(translator, file_paths: list, target_lang: str, source_lang: str = None,
+                        output_dir: str = None, max_workers: int = 4, progress=None, is_cancelled=None,
+                        translate_texts=None, glossary: str = None, jobs=None, extract_texts=None,
+                        slots=None) -> list:
+    # 多个文件并发翻译，同时进行中的文件数不超过 max_workers；返回每个文件的结果
+    # 提供 translate_texts 时，.txt/.srt 文件改为通过文本接口流式翻译
+    # 提供 jobs 时记录每个文件的 document_id；同一文件已上传但未下载过时直接继续，不再重新上传
+    # 提供 extract_texts 时，.xlsx/.xliff 文件在本地提取文字，去重后翻译并写回副本，无法提取时仍走文档接口
+    save_paths = []
+    used = set()
+    for file_path in file_paths:
+        save_path = None
+        if translate_texts is not None and is_streamable(file_path):
+            save_path = find_resumable(file_path, output_dir)
+        save_path = save_path or translated_path(file_path, output_dir)
+        base, ext = os.path.splitext(save_path)
+        index = 1
+        while save_path in used:
+            index += 1
+            save_path = f'{base}_{index}{ext}'
+        used.add(save_path)
+        save_paths.append(save_path)
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    def translate(file_path, save_path, report, check_cancelled):
+        if translate_texts is not None and is_streamable(file_path):
+            return stream_translate_file(file_path, save_path, translate_texts, progress=report,
+                                         check_cancelled=check_cancelled)
+        if extract_texts is not None and is_extractable(file_path):
+            try:
+                return extract_translate_file(file_path, save_path, target_lang, extract_texts, progress=report,
+                                              check_cancelled=check_cancelled)
+            except ExtractionUnsupported as e:
+                if report is not None:
+                    report(f'{e}，改用文档接口翻译…')
+        job = jobs.find(file_path, source_lang, target_lang, glossary) if jobs is not None else None
+        return translate_document(translator, file_path, save_path, target_lang, source_lang=source_lang,
+                                  progress=report, is_cancelled=is_cancelled, glossary=glossary, jobs=jobs,
+                                  job=job, slots=slots).billed_characters
+
+    return _run_documents(list(zip(file_paths, save_paths)), translate, max_workers, progress, is_cancelled)
+
+
+def resume_documents(translator, jobs, max_workers: int = 4, progress=None, is_cancelled=None) -> list:
+    # 继续上次退出或崩溃时未完成的文件：只轮询和下载，不重新上传
+    pending = {job.save_path: job for job in jobs.pending()}
+
+    def translate(file_path, save_path, report, check_cancelled):
+        job = pending[save_path]
+        directory = os.path.dirname(save_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return translate_document(translator, file_path, save_path, job.target_lang, source_lang=job.source_lang,
+                                  progress=report, is_cancelled=is_cancelled, glossary=job.glossary, jobs=jobs,
+                                  job=job).billed_characters
+
+    return _run_documents([(job.file_path, job.save_path) for job in pending.values()], translate, max_workers,
+                          progress, is_cancelled)
+
+
+def _run_documents(items: list, translate, max_workers: int, progress, is_cancelled) -> list:
+    def check_cancelled():
+        if is_cancelled is not None and is_cancelled():
+            raise TranslationCancelled()
+
+    finished = [0]
+    lock = threading.Lock()
+
+    def run(file_path, save_path):
+        name = os.path.basename(file_path)
+        start = time.perf_counter()
+        report = (lambda message: progress(f'{name}：{message}')) if progress else None
+        # 每个文件在各自的线程中记为一次操作
+        with metrics.operation('document') as span:
+            try:
+                check_cancelled()
+                billed_characters = translate(file_path, save_path, report, check_cancelled)
+                result = DocumentResult(file_path, save_path, True, None, billed_characters,
+                                        time.perf_counter() - start)
+            except TranslationCancelled:
+                result = DocumentResult(file_path, None, False, '已取消', None, time.perf_counter() - start)
+            except Exception as e:
+                result = DocumentResult(file_path, None, False, str(e), None, time.perf_counter() - start)
+            if span is not None and not result.ok:
+                span.error = result.error
+
+        if progress is not None:
+            with lock:
+                finished[0] += 1
+                count = finished[0]
+            progress(f'已完成 {count}/{len(items)}：{name}' + ('' if result.ok else f'（{result.error}）'))
+        return result
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='pydeepl-document') as executor:
+        return list(executor.map(lambda item: run(*item), items))
+
+
+def format_report(results: list) -> str:
+    lines = []
+    for result in results:
+        if result.ok:
+            billed = result.billed_characters if result.billed_characters is not None else '-'
+            lines.append(f'成功\t{result.elapsed:.1f}s\t{billed}\t{result.file_path} -> {result.save_path}')
+        else:
+            lines.append(f'失败\t{result.elapsed:.1f}s\t-\t{result.file_path}：{result.error}')
+    succeeded = sum(1 for result in results if result.ok)
+    lines.append(f'共 {len(results)} 个文件，成功 {succeeded} 个，失败 {len(results) - succeeded} 个')
+    return '\n'.join(lines)
@@ -0,0 +1,282 @@
+import os
+import posixpath
+import shutil
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+EXTRACTABLE_EXTENSIONS = ('.xlsx', '.xlf', '.xliff')
+MAX_CHUNK_CHARS = 20000
+MAX_CHUNK_UNITS = 200
+
+XLSX_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+_write_lock = threading.Lock()
+
+
+class ExtractionUnsupported(Exception):
+    # 文件中有本地提取无法保留的内容，改用文档接口翻译
+    pass
+
+
+def is_extractable(file_path: str) -> bool:
+    return os.path.splitext(file_path)[1].lower() in EXTRACTABLE_EXTENSIONS
+
+
+def _local(tag) -> str:
+    # 注释和处理指令的 tag 是函数，不是字符串
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+class _Builder(ET.TreeBuilder):
+    # 保留注释和处理指令，记下文件中的命名空间前缀（写回时沿用原来的前缀），
+    # 以及根元素之前和之后的注释、处理指令（ElementTree 的树中无法保存，写回时单独输出）
+    def __init__(self):
+        super().__init__(insert_comments=True, insert_pis=True)
+        self.namespaces = []
+        self.prolog = []
+        self.epilog = []
+        self._depth = 0
+        self._seen_root = False
+
+    def start_ns(self, prefix, uri):
+        if prefix != 'xml' and (prefix, uri) not in self.namespaces:
+            self.namespaces.append((prefix, uri))
+
+    def start(self, tag, attrs):
+        self._depth += 1
+        self._seen_root = True
+        return super().start(tag, attrs)
+
+    def end(self, tag):
+        self._depth -= 1
+        return super().end(tag)
+
+    def comment(self, text):
+        if self._depth:
+            return super().comment(text)
+        (self.epilog if self._seen_root else self.prolog).append(ET.Comment(text))
+
+    def pi(self, target, text=None):
+        if self._depth:
+            return super().pi(target, text)
+        (self.epilog if self._seen_root else self.prolog).append(ET.ProcessingInstruction(target, text))
+
+
+def _parse(source):
+    builder = _Builder()
+    return ET.parse(source, ET.XMLParser(target=builder)), builder
+
+
+def _write(tree, target, layout):
+    # ElementTree 的前缀表是全局的，写出时才登记本文件的前缀，并与其他线程的写出互斥
+    if isinstance(target, str):
+        with open(target, 'wb') as file:
+            return _write(tree, file, layout)
+    with _write_lock:
+        for prefix, uri in layout.namespaces:
+            ET.register_namespace(prefix, uri)
+        target.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+        for node in layout.prolog:
+            target.write(ET.tostring(node, encoding='unicode').encode('utf-8') + b'\n')
+        tree.write(target, encoding='utf-8', xml_declaration=False)
+        for node in layout.epilog:
+            target.write(b'\n' + ET.tostring(node, encoding='unicode').encode('utf-8'))
+
+
+def translate_unique(texts, translate_batch, max_inflight: int = 4, progress=None, check_cancelled=None):
+    # 去掉首尾空白、去重并跳过不含文字的字符串（数字、符号等），其余分块同时翻译；
+    # 返回把原文替换为译文的函数，以及需要翻译的字符数
+    unique = {}
+    for text in texts:
+        body = text.strip()
+        if body and body not in unique and any(char.isalpha() for char in body):
+            unique[body] = None
+    if progress is not None:
+        progress(f'共 {len(unique)} 条不重复的文本')
+
+    chunks, chunk, chars = [], [], 0
+    for text in unique:
+        if chunk and (chars + len(text) > MAX_CHUNK_CHARS or len(chunk) >= MAX_CHUNK_UNITS):
+            chunks.append(chunk)
+            chunk, chars = [], 0
+        chunk.append(text)
+        chars += len(text)
+    if chunk:
+        chunks.append(chunk)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_inflight), thread_name_prefix='pydeepl-extract') as executor:
+        futures = []
+        try:
+            for chunk in chunks:
+                futures.append((chunk, executor.submit(translate_batch, chunk)))
+            for index, (chunk, future) in enumerate(futures):
+                if check_cancelled is not None:
+                    check_cancelled()
+                unique.update(zip(chunk, future.result()))
+                if progress is not None:
+                    progress(f'已翻译 {index + 1}/{len(chunks)} 块')
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+    def translated(text):
+        body = text.strip()
+        if unique.get(body) is None:
+            return text
+        start = text.index(body)
+        return text[:start] + unique[body] + text[start + len(body):]
+
+    return translated, sum(len(text) for text in unique)
+
+
+def _set_text(element, text: str):
+    element.text = text
+    if text != text.strip():
+        element.set(XML_SPACE, 'preserve')
+
+
+def _shared_strings_part(archive) -> str:
+    # 共享字符串表的位置由 workbook.xml.rels 指定，通常为 xl/sharedStrings.xml
+    try:
+        with archive.open('xl/_rels/workbook.xml.rels') as file:
+            rels = ET.parse(file).getroot()
+    except KeyError:
+        return None
+    for rel in rels.iter(f'{{{RELS_NS}}}Relationship'):
+        if rel.get('Type', '').endswith('/sharedStrings'):
+            target = rel.get('Target')
+            return target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+    return None
+
+
+def _has_inline_strings(archive) -> bool:
+    # 单元格内联字符串不在共享字符串表中，逐块扫描工作表，不把整个工作表读入内存
+    marker = b't="inlineStr"'
+    for name in archive.namelist():
+        if not name.startswith('xl/worksheets/') or not name.endswith('.xml'):
+            continue
+        with archive.open(name) as file:
+            tail = b''
+            while True:
+                block = file.read(1024 * 1024)
+                if not block:
+                    break
+                if marker in tail + block:
+                    return True
+                tail = block[-len(marker):]
+    return False
+
+
+def translate_xlsx(file_path: str, save_path: str, translate_batch, progress=None, check_cancelled=None) -> int:
+    # xlsx 中重复的文字只在共享字符串表里保存一次；只翻译这张表，其余部分原样复制
+    with zipfile.ZipFile(file_path) as archive:
+        part = _shared_strings_part(archive)
+        if part is None or part not in archive.namelist():
+            raise ExtractionUnsupported('没有共享字符串表')
+        if _has_inline_strings(archive):
+            raise ExtractionUnsupported('包含内联字符串')
+        with archive.open(part) as file:
+            tree, layout = _parse(file)
+
+        items = []
+        for item in tree.getroot().iter(f'{{{XLSX_NS}}}si'):
+            direct = item.find(f'{{{XLSX_NS}}}t')
+            runs = [run.find(f'{{{XLSX_NS}}}t') for run in item.findall(f'{{{XLSX_NS}}}r')]
+            elements = [direct] if direct is not None else [element for element in runs if element is not None]
+            if elements:
+                items.append((elements, ''.join(element.text or '' for element in elements)))
+
+        translated, characters = translate_unique([text for _, text in items], translate_batch,
+                                                  progress=progress, check_cancelled=check_cancelled)
+        for elements, text in items:
+            # 富文本按整段翻译，译文放在第一段中并沿用其格式
+            _set_text(elements[0], translated(text))
+            for element in elements[1:]:
+                element.text = ''
+
+        if progress is not None:
+            progress('正在写入译文…')
+        try:
+            with zipfile.ZipFile(save_path, 'w') as output:
+                for info in archive.infolist():
+                    # 新建条目信息，写入时不会改动读取原文件所需的偏移量
+                    entry = zipfile.ZipInfo(info.filename, info.date_time)
+                    entry.compress_type = info.compress_type
+                    entry.external_attr = info.external_attr
+                    with output.open(entry, 'w') as target:
+                        if info.filename == part:
+                            _write(tree, target, layout)
+                        else:
+                            with archive.open(info) as source:
+                                shutil.copyfileobj(source, target, 1024 * 1024)
+        except BaseException:
+            if os.path.exists(save_path):
+                os.remove(save_path)
+            raise
+    return characters
+
+
+def _locale(target_lang: str, source_locale: str) -> str:
+    # DeepL 的语言代码（DE、EN-US、ZH-HANS）转为文件中使用的区域设置写法（de、en-US、zh-Hans），
+    # 分隔符与源语言一致（en_US 对应 de_DE 的写法）
+    parts = target_lang.split('-')
+    tags = [parts[0].lower()] + [part.title() if len(part) == 4 else part.upper() for part in parts[1:]]
+    return ('_' if '_' in source_locale else '-').join(tags)
+
+
+def translate_xliff(file_path: str, save_path: str, target_lang: str, translate_batch, progress=None,
+                    check_cancelled=None) -> int:
+    # XLIFF 1.2 的 trans-unit 和 2.0 的 segment：翻译 source，写入（或替换）紧随其后的 target
+    tree, layout = _parse(file_path)
+    root = tree.getroot()
+    units = []
+    for parent in root.iter():
+        if _local(parent.tag) not in ('trans-unit', 'segment'):
+            continue
+        source = next((child for child in parent if _local(child.tag) == 'source'), None)
+        if source is None:
+            continue
+        if len(source):
+            raise ExtractionUnsupported('包含内联标记')
+        units.append((parent, source))
+
+    translated, characters = translate_unique([source.text or '' for _, source in units], translate_batch,
+                                              progress=progress, check_cancelled=check_cancelled)
+    for parent, source in units:
+        target = next((child for child in parent if _local(child.tag) == 'target'), None)
+        if target is None:
+            target = ET.Element(source.tag[:-len('source')] + 'target')
+            parent.insert(list(parent).index(source) + 1, target)
+            target.tail = source.tail
+        text = source.text or ''
+        _set_text(target, translated(text))
+        if any(char.isalpha() for char in text):
+            # 已填入译文：1.2 的状态写在 target 上，2.0 写在 segment 上
+            (target if _local(parent.tag) == 'trans-unit' else parent).set('state', 'translated')
+    if _local(root.tag) == 'xliff' and root.get('srcLang') is not None:
+        root.set('trgLang', _locale(target_lang, root.get('srcLang')))
+    for element in root.iter():
+        if _local(element.tag) == 'file' and element.get('source-language') is not None:
+            element.set('target-language', _locale(target_lang, element.get('source-language')))
+
+    if progress is not None:
+        progress('正在写入译文…')
+    try:
+        _write(tree, save_path, layout)
+    except BaseException:
+        if os.path.exists(save_path):
+            os.remove(save_path)
+        raise
+    return characters
+
+
+def extract_translate_file(file_path: str, save_path: str, target_lang: str, translate_batch, progress=None,
+                           check_cancelled=None) -> int:
+    # 返回去重后需要翻译的字符数（其中命中翻译缓存的部分不会计费）
+    if file_path.lower().endswith('.xlsx'):
+        return translate_xlsx(file_path, save_path, translate_batch, progress, check_cancelled)
+    return translate_xliff(file_path, save_path, target_lang, translate_batch, progress, check_cancelled)
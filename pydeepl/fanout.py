@@ -0,0 +1,64 @@
+import collections
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pydeepl.documents import DocumentResult, format_report
+from pydeepl.languages import language_names, normalize_target, target_map
+
+# result 为译文（文本）或 DocumentResult 列表（文件）
+TargetResult = collections.namedtuple('TargetResult', ['target_lang', 'result', 'ok', 'error', 'elapsed'])
+
+
+def parse_targets(value: str) -> list:
+    # 逗号分隔的目标语言列表，all 表示界面中的全部目标语言
+    if value.strip().lower() == 'all':
+        return list(target_map)
+    return list(dict.fromkeys(normalize_target(lang.strip()) for lang in value.split(',') if lang.strip()))
+
+
+def fan_out(target_langs: list, fn, max_workers: int = None) -> dict:
+    # 每种目标语言一个线程同时执行 fn(target_lang)；实际的请求并发数和速率由共享的调度器限制
+    # 返回 {目标语言: TargetResult}，顺序与传入的目标语言一致，某种语言失败不影响其他语言
+    def run(target_lang):
+        start = time.perf_counter()
+        try:
+            return TargetResult(target_lang, fn(target_lang), True, None, time.perf_counter() - start)
+        except Exception as e:
+            return TargetResult(target_lang, None, False, str(e), time.perf_counter() - start)
+
+    targets = list(dict.fromkeys(target_langs))
+    if not targets:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(targets), thread_name_prefix='pydeepl-fanout') as executor:
+        return dict(zip(targets, executor.map(run, targets)))
+
+
+def format_results(results: dict) -> str:
+    blocks = []
+    for target_lang, result in results.items():
+        if not result.ok:
+            body = f'翻译失败：{result.error}'
+        elif isinstance(result.result, list):
+            body = format_report(result.result)
+        else:
+            body = result.result
+        blocks.append(f'【{language_names.get(target_lang, target_lang)} {target_lang}】\n{body}')
+    return '\n\n'.join(blocks)
+
+
+def results_to_dict(results: dict) -> dict:
+    # 供本地端口返回的可序列化形式
+    return {target_lang: dict(result._asdict(), result=[item._asdict() for item in result.result]
+                              if isinstance(result.result, list) else result.result)
+            for target_lang, result in results.items()}
+
+
+def results_from_dict(data: dict) -> dict:
+    return {target_lang: TargetResult(**dict(result, result=[DocumentResult(**item) for item in result['result']]
+                                             if isinstance(result['result'], list) else result['result']))
+            for target_lang, result in data.items()}
+
+
+def all_ok(results: dict) -> bool:
+    return all(result.ok and (not isinstance(result.result, list) or all(item.ok for item in result.result))
+               for result in results.values())
@@ -0,0 +1,144 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+
+from pydeepl.scheduler import INTERACTIVE, scheduled_translator_from_config
+
+GLOSSARY_FILE = 'PyDeeplGlossaries.json'
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def base_lang(lang: str) -> str:
+    # 术语表只区分基础语言，EN-US 与 EN-GB 共用 EN 的术语表
+    return lang.upper().split('-')[0]
+
+
+def load_entries(spec: dict) -> dict:
+    # CSV 文件每行两列：原文术语,译文术语；配置中直接写的 entries 优先
+    entries = {}
+    path = spec.get('file')
+    if path:
+        with open(path, encoding='utf-8-sig', newline='') as file:
+            for row in csv.reader(file):
+                if len(row) >= 2 and row[0].strip() and not row[0].startswith('#'):
+                    entries[row[0].strip()] = row[1].strip()
+    for source, target in (spec.get('entries') or {}).items():
+        entries[str(source).strip()] = str(target).strip()
+    return entries
+
+
+def glossary_hash(source_lang: str, target_lang: str, entries: dict) -> str:
+    content = '\n'.join(f'{source}\t{target}' for source, target in sorted(entries.items()))
+    return hashlib.sha256(f'{source_lang}\0{target_lang}\0{content}'.encode('utf-8')).hexdigest()
+
+
+def glossary_specs(config: dict) -> dict:
+    specs = {}
+    for spec in config.get('glossaries') or []:
+        specs[(base_lang(spec['source']), base_lang(spec['target']))] = spec
+    return specs
+
+
+class GlossaryStore:
+    # 本地记录已上传的术语表（内容哈希 -> 服务器上的 ID），内容不变时不会重复上传
+    def __init__(self, translator, path: str = GLOSSARY_FILE):
+        self.translator = translator
+        self.path = path
+        self._lock = threading.Lock()
+        self._verified = set()
+        self._entries = {}
+        self._records = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self._records, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    def entries(self, spec: dict):
+        # 返回 (术语, 内容哈希)；CSV 文件未修改时不重新读取
+        path = spec.get('file')
+        signature = None
+        if path:
+            stat = os.stat(path)
+            signature = (path, stat.st_mtime_ns, stat.st_size)
+        source_lang, target_lang = base_lang(spec['source']), base_lang(spec['target'])
+        key = (source_lang, target_lang, signature, tuple(sorted((spec.get('entries') or {}).items())))
+        cached = self._entries.get(key)
+        if cached is None:
+            entries = load_entries(spec)
+            cached = (entries, glossary_hash(source_lang, target_lang, entries))
+            self._entries[key] = cached
+        return cached
+
+    def glossary_id(self, spec: dict, create: bool = True):
+        # create=False 时只查本地记录，不访问网络
+        from deepl import DeepLException, GlossaryNotFoundException
+
+        source_lang, target_lang = base_lang(spec['source']), base_lang(spec['target'])
+        with self._lock:
+            entries, digest = self.entries(spec)
+            if not entries:
+                return None
+            record = self._records.get(digest)
+            if record is not None and (not create or record['id'] in self._verified):
+                return record['id']
+            if not create:
+                return None
+
+            if record is not None:
+                # 每个进程第一次使用时确认服务器上仍存在
+                try:
+                    self.translator.get_glossary(record['id'])
+                    self._verified.add(record['id'])
+                    return record['id']
+                except GlossaryNotFoundException:
+                    del self._records[digest]
+
+            info = self.translator.create_glossary(f'PyDeepL {source_lang}-{target_lang} {digest[:8]}',
+                                                   source_lang, target_lang, entries)
+            # 同一语言对的旧版本已不再使用，从服务器上删除
+            for old_digest, old in list(self._records.items()):
+                if (old['source'], old['target']) == (source_lang, target_lang):
+                    try:
+                        self.translator.delete_glossary(old['id'])
+                    except DeepLException:
+                        pass
+                    del self._records[old_digest]
+            self._records[digest] = {'id': info.glossary_id, 'source': source_lang, 'target': target_lang,
+                                     'entries': len(entries)}
+            self._verified.add(info.glossary_id)
+            self._save()
+            return info.glossary_id
+
+
+def store_from_config(config: dict) -> GlossaryStore:
+    path = config.get('glossary_file', GLOSSARY_FILE)
+    key = (config.get('deepl_api'), config.get('server_url'), path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = GlossaryStore(scheduled_translator_from_config(config, INTERACTIVE), path)
+            _stores[key] = store
+        return store
+
+
+def glossary_from_config(config: dict, source_lang, target_lang: str, create: bool = True):
+    # 返回该语言对应使用的术语表 ID；DeepL 要求使用术语表时指定源语言，未指定时返回 None
+    if source_lang is None:
+        return None
+    spec = glossary_specs(config).get((base_lang(source_lang), base_lang(target_lang)))
+    if spec is None:
+        return None
+    return store_from_config(config).glossary_id(spec, create)
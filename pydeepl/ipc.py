@@ -0,0 +1,275 @@
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+
+# 单实例与本地进程间通信：每行一个 JSON 请求，每行一个 JSON 响应，连接可复用
+# 请求：{"token": "...", "command": "translate", "text": "Hello", "target": "ZH"}
+# 响应：{"ok": true, "result": "..."} 或 {"ok": false, "error": "..."}
+HOST = '127.0.0.1'
+DEFAULT_PORT = 47365
+MAX_LINE = 64 * 1024 * 1024
+CONNECT_TIMEOUT = 0.5
+# 确认实例存活的等待时间：端口上的进程接受连接却不应答时（状态文件已过期、端口被其他程序占用）按没有实例处理
+PING_TIMEOUT = 2.0
+
+
+class IPCError(Exception):
+    pass
+
+
+def state_dir() -> str:
+    # 每个用户单独的目录：Windows 的临时目录本身按用户区分；其他系统优先使用 XDG_RUNTIME_DIR，
+    # 没有时在共享的临时目录下建立只有当前用户可访问的子目录
+    if os.name == 'nt':
+        return tempfile.gettempdir()
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return runtime_dir
+    path = os.path.join(tempfile.gettempdir(), f'pydeepl-{os.getuid()}')
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    return path
+
+
+def state_path(port: int = DEFAULT_PORT) -> str:
+    # 记录访问令牌的文件，只有当前用户可读
+    return os.path.join(state_dir(), f'pydeepl-ipc-{port}.json')
+
+
+def ipc_port(config: dict) -> int:
+    return int(config.get('ipc_port', DEFAULT_PORT))
+
+
+def _write_state(path: str, state: dict):
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+    # 不跟随他人预先放置的同名符号链接
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        json.dump(state, file)
+    os.replace(temp_path, path)
+
+
+def _trusted(file) -> bool:
+    # 其他用户放置或可以改写的状态文件不可信：其中的端口可能指向他们的进程，转发的文本和文件路径会被截获
+    if os.name == 'nt':
+        return True
+    stat = os.fstat(file.fileno())
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+
+def _read_state(port: int):
+    try:
+        with open(state_path(port), encoding='utf-8') as file:
+            return json.load(file) if _trusted(file) else None
+    except (OSError, ValueError):
+        return None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server.owner
+        while True:
+            line = self.rfile.readline(MAX_LINE)
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('请求必须是 JSON 对象')
+            except ValueError as e:
+                self.respond({'ok': False, 'error': f'无效的请求：{e}'})
+                return
+            if not hmac.compare_digest(str(request.get('token', '')), server.token):
+                self.respond({'ok': False, 'error': '令牌无效'})
+                return
+            self.respond(server.dispatch(request))
+
+    def respond(self, response: dict):
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = False
+
+    def server_bind(self):
+        # Windows 下默认允许其他进程抢占同一端口，需显式独占
+        if hasattr(socket, 'SO_EXCLUSIVEADDRUSE'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        super().server_bind()
+
+
+class IPCServer:
+    # 端口被占用时 start() 抛出 OSError，说明已有实例在运行
+    def __init__(self, handlers: dict, port: int = DEFAULT_PORT):
+        self.handlers = handlers
+        self.port = port
+        self.token = secrets.token_hex(16)
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        self._server = _TCPServer((HOST, self.port), _Handler)
+        self._server.owner = self
+        _write_state(state_path(self.port), {'port': self.port, 'pid': os.getpid(), 'token': self.token})
+        self._thread = threading.Thread(target=self._server.serve_forever, name='pydeepl-ipc', daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        if self._server is None:
+            self.start()
+        # 分段等待，使 Ctrl+C 在 Windows 下也能打断
+        while self._thread.is_alive():
+            self._thread.join(0.5)
+
+    def dispatch(self, request: dict) -> dict:
+        handler = self.handlers.get(request.get('command'))
+        if handler is None:
+            return {'ok': False, 'error': f'未知命令：{request.get("command")}'}
+        try:
+            return {'ok': True, 'result': handler(request)}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        state = _read_state(self.port)
+        if state is not None and state.get('token') == self.token:
+            try:
+                os.remove(state_path(self.port))
+            except OSError:
+                pass
+
+
+class IPCClient:
+    def __init__(self, port: int = DEFAULT_PORT, timeout: float = None):
+        state = _read_state(port)
+        if state is None:
+            raise IPCError('没有正在运行的 PyDeepL')
+        self.token = state['token']
+        try:
+            self._socket = socket.create_connection((HOST, port), timeout=CONNECT_TIMEOUT)
+        except OSError as e:
+            raise IPCError(f'无法连接正在运行的 PyDeepL：{e}') from e
+        self._socket.settimeout(timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._socket.makefile('rwb')
+
+    def settimeout(self, timeout: float = None):
+        self._socket.settimeout(timeout)
+
+    def request(self, command: str, **params):
+        params.update(command=command, token=self.token)
+        self._file.write(json.dumps(params, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._file.flush()
+        line = self._file.readline(MAX_LINE)
+        if not line:
+            raise IPCError('连接已断开')
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise IPCError(response.get('error'))
+        return response.get('result')
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def connect(port: int = DEFAULT_PORT, timeout: float = None):
+    # 返回已连接并确认存活的客户端，没有运行中的实例或 PING_TIMEOUT 内没有应答时返回 None；
+    # 确认后改用 timeout（默认不限时，翻译大文件可能需要很久）
+    try:
+        client = IPCClient(port, PING_TIMEOUT)
+    except IPCError:
+        return None
+    try:
+        client.request('ping')
+    except (IPCError, OSError, ValueError):
+        client.close()
+        return None
+    client.settimeout(timeout)
+    return client
+
+
+def parse_launch_args(args: list) -> dict:
+    # 启动参数：已存在的文件按文件翻译，其余拼成要翻译的文本
+    files = [os.path.abspath(arg) for arg in args if os.path.isfile(arg)]
+    text = ' '.join(arg for arg in args if not os.path.isfile(arg))
+    return {'text': text, 'files': files}
+
+
+def forward_to_instance(launch: dict, config: dict) -> bool:
+    if not config.get('single_instance', True):
+        return False
+    client = connect(ipc_port(config))
+    if client is None:
+        return False
+    with client:
+        client.request('show', **launch)
+    return True
+
+
+def default_handlers(load_config) -> dict:
+    # 与界面无关的命令，在常驻进程中复用已建立的连接和缓存
+    from pydeepl import core, metrics
+    from pydeepl.fanout import results_to_dict
+    from pydeepl.languages import normalize_source, normalize_target
+
+    def translate(request):
+        return core.translate(request['text'], normalize_source(request.get('source')),
+                              normalize_target(request.get('target') or 'ZH'), config=load_config())
+
+    def translate_texts(request):
+        return core.translate_texts(request['texts'], normalize_source(request.get('source')),
+                                    normalize_target(request.get('target') or 'ZH'), config=load_config())
+
+    def translate_files(request):
+        results = core.translate_files(request['files'], normalize_target(request.get('target') or 'ZH'),
+                                       source_lang=normalize_source(request.get('source')),
+                                       output_dir=request.get('output_dir'), config=load_config())
+        return [result._asdict() for result in results]
+
+    def translate_targets(request):
+        results = core.translate_targets(request['text'], [normalize_target(lang) for lang in request['targets']],
+                                         normalize_source(request.get('source')), config=load_config())
+        return results_to_dict(results)
+
+    def translate_files_targets(request):
+        target_langs = [normalize_target(lang) for lang in request['targets']]
+        results = core.translate_files_targets(request['files'], target_langs,
+                                               source_lang=normalize_source(request.get('source')),
+                                               output_dir=request.get('output_dir'), config=load_config())
+        return results_to_dict(results)
+
+    return {
+        'ping': lambda request: {'pid': os.getpid(), 'executable': sys.executable},
+        'translate': translate,
+        'translate_texts': translate_texts,
+        'translate_files': translate_files,
+        'translate_targets': translate_targets,
+        'translate_files_targets': translate_files_targets,
+        'metrics': lambda request: metrics.recorder.summary(),
+    }
@@ -0,0 +1,160 @@
+import collections
+import datetime
+import os
+import sqlite3
+import threading
+import time
+
+JOBS_FILE = 'PyDeeplJobs.db'
+
+# uploaded：已上传，DeepL 已返回 document_id 和 document_key，尚未下载（程序退出或崩溃时停留在此状态）
+UPLOADED = 'uploaded'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+STATE_NAMES = {UPLOADED: '未完成', DONE: '成功', FAILED: '失败', CANCELLED: '已取消'}
+
+DocumentJob = collections.namedtuple('DocumentJob', [
+    'id', 'file_path', 'save_path', 'source_lang', 'target_lang', 'glossary', 'file_size', 'file_mtime',
+    'state', 'document_id', 'document_key', 'billed_characters', 'error', 'created', 'updated'])
+
+
+def file_signature(file_path: str):
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class JobStore:
+    # SQLite 记录每个通过文档接口翻译的文件：上传后立即保存 document_id 和 document_key，
+    # 程序重启后可以继续轮询和下载，不必重新上传（重新上传会再次计费）
+    def __init__(self, path: str = JOBS_FILE, max_active: int = 8, history: int = 500):
+        self.path = path
+        self.history_size = history
+        self.max_active = max(1, max_active)
+        # 所有批次（包括多语言同时翻译和重启后继续的任务）共用的上限：同时在 DeepL 上翻译中的文件数
+        self.slots = threading.BoundedSemaphore(self.max_active)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS jobs ('
+                         'id INTEGER PRIMARY KEY AUTOINCREMENT, file_path TEXT NOT NULL, save_path TEXT NOT NULL, '
+                         'source_lang TEXT, target_lang TEXT NOT NULL, glossary TEXT, '
+                         'file_size INTEGER, file_mtime INTEGER, state TEXT NOT NULL, '
+                         'document_id TEXT, document_key TEXT, billed_characters INTEGER, error TEXT, '
+                         'created REAL NOT NULL, updated REAL NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state)')
+        self._db.commit()
+
+    def _execute(self, sql: str, parameters=()):
+        # 关闭后的写入直接忽略：退出程序时正在进行的任务保持 uploaded 状态，下次启动继续
+        with self._lock:
+            if self._db is None:
+                return None
+            cursor = self._db.execute(sql, parameters)
+            self._db.commit()
+            return cursor
+
+    def _query(self, sql: str, parameters=()) -> list:
+        with self._lock:
+            if self._db is None:
+                return []
+            return [DocumentJob(*row) for row in self._db.execute(sql, parameters).fetchall()]
+
+    def uploaded(self, file_path: str, save_path: str, source_lang, target_lang: str, glossary, handle) -> int:
+        try:
+            size, mtime = file_signature(file_path)
+        except OSError:
+            size = mtime = None
+        now = time.time()
+        cursor = self._execute('INSERT INTO jobs (file_path, save_path, source_lang, target_lang, glossary, '
+                               'file_size, file_mtime, state, document_id, document_key, created, updated) '
+                               'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                               (os.path.abspath(file_path), os.path.abspath(save_path), source_lang, target_lang,
+                                glossary, size, mtime, UPLOADED, handle.document_id, handle.document_key, now, now))
+        return cursor.lastrowid if cursor is not None else None
+
+    def finish(self, job_id: int, state: str, billed_characters: int = None, error: str = None,
+               save_path: str = None):
+        if job_id is None:
+            return
+        self._execute('UPDATE jobs SET state = ?, billed_characters = ?, error = ?, updated = ?, '
+                      'save_path = COALESCE(?, save_path) WHERE id = ?',
+                      (state, billed_characters, error, time.time(),
+                       os.path.abspath(save_path) if save_path else None, job_id))
+        if state == DONE:
+            self._trim()
+
+    def find(self, file_path: str, source_lang, target_lang: str, glossary):
+        # 同一文件（内容未变）、同样的语言和术语表已上传但没有下载过时，复用其 document_id
+        try:
+            size, mtime = file_signature(file_path)
+        except OSError:
+            return None
+        jobs = self._query('SELECT * FROM jobs WHERE file_path = ? AND target_lang = ? AND source_lang IS ? '
+                           'AND glossary IS ? AND file_size = ? AND file_mtime = ? AND state IN (?, ?) '
+                           'ORDER BY id DESC LIMIT 1',
+                           (os.path.abspath(file_path), target_lang, source_lang, glossary, size, mtime,
+                            UPLOADED, CANCELLED))
+        return jobs[0] if jobs else None
+
+    def pending(self) -> list:
+        return self._query('SELECT * FROM jobs WHERE state = ? ORDER BY id', (UPLOADED,))
+
+    def history(self, limit: int = 50) -> list:
+        return self._query('SELECT * FROM jobs ORDER BY id DESC LIMIT ?', (limit,))
+
+    def _trim(self):
+        # 只保留最近 history_size 条记录，未完成的任务不会被删除
+        self._execute('DELETE FROM jobs WHERE state != ? AND id <= '
+                      '(SELECT id FROM jobs ORDER BY id DESC LIMIT 1 OFFSET ?)', (UPLOADED, self.history_size))
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def format_history(jobs: list) -> str:
+    if not jobs:
+        return '没有文件翻译记录'
+    lines = []
+    for job in jobs:
+        when = datetime.datetime.fromtimestamp(job.updated).strftime('%m-%d %H:%M')
+        name = os.path.basename(job.file_path)
+        line = f'{when}\t{STATE_NAMES.get(job.state, job.state)}\t{job.target_lang}\t{name}'
+        if job.state == DONE:
+            line += f' -> {job.save_path}'
+        elif job.error:
+            line += f'：{job.error}'
+        lines.append(line)
+    pending = sum(1 for job in jobs if job.state == UPLOADED)
+    if pending:
+        lines.append(f'{pending} 个文件尚未下载，启动程序或运行 python -m pydeepl --resume 时会继续')
+    return '\n'.join(lines)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def jobs_from_config(config: dict):
+    options = config.get('document_jobs') or {}
+    if not options.get('enabled', True):
+        return None
+
+    path = options.get('path', JOBS_FILE)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = JobStore(path, max_active=options.get('max_active', 8), history=options.get('history', 500))
+            _stores[path] = store
+    return store
+
+
+def close_job_stores():
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
@@ -0,0 +1,32 @@
+# 顺序与界面中 SourceComboBox / TargetComboBox 的选项一一对应
+source_map = [None, 'ZH', 'EN', 'JA', 'FR', 'DE', 'IT', 'ES', 'PT', 'RU']
+target_map = ['ZH', 'EN-US', 'JA', 'FR', 'DE', 'IT', 'ES', 'PT-PT', 'RU']
+
+language_names = {
+    'ZH': '中文',
+    'EN': '英语',
+    'EN-US': '英语',
+    'JA': '日语',
+    'FR': '法语',
+    'DE': '德语',
+    'IT': '意大利语',
+    'ES': '西班牙语',
+    'PT': '葡萄牙语',
+    'PT-PT': '葡萄牙语',
+    'RU': '俄语',
+}
+
+# 可通过文档接口翻译的文件类型
+document_extensions = ('.txt', '.doc', '.docx', '.pptx', '.xlsx', '.pdf', '.htm', '.html', '.xlf', '.xliff', '.srt')
+
+
+def normalize_target(lang: str) -> str:
+    lang = lang.upper()
+    # 与界面保留一致：EN、PT 作为目标语言时需要指定地区
+    return {'EN': 'EN-US', 'PT': 'PT-PT'}.get(lang, lang)
+
+
+def normalize_source(lang: str):
+    if not lang or lang.lower() == 'auto':
+        return None
+    return lang.upper().split('-')[0]
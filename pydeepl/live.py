@@ -0,0 +1,95 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from pydeepl import core
+from pydeepl.config import read_config
+from pydeepl.output import LARGE_TEXT_CHARS
+from pydeepl.segments import changed_characters
+
+DEFAULT_DEBOUNCE_MS = 500
+DEFAULT_MIN_CHANGE = 3
+
+
+class LiveTranslator(QObject):
+    # 边输入边翻译：停止输入一段时间后才发请求；改动太小时再多等一会儿，避免每敲一个字就翻译一次
+    preview = pyqtSignal(str)
+    cleared = pyqtSignal()
+
+    def __init__(self, editor, workers, languages, parent=None, load_config=read_config):
+        super().__init__(parent)
+        self.editor = editor
+        self.workers = workers
+        self.languages = languages
+        self.load_config = load_config
+        self.enabled = False
+        self.debounce_ms = DEFAULT_DEBOUNCE_MS
+        self.min_change = DEFAULT_MIN_CHANGE
+        self.last_text = ''
+        self.last_languages = None
+        self._settling = False
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        self.editor.textChanged.connect(self.on_text_changed)
+
+    def configure(self, config: dict):
+        options = config.get('live_translate') or {}
+        self.enabled = bool(options.get('enabled', False))
+        self.debounce_ms = int(options.get('debounce_ms', DEFAULT_DEBOUNCE_MS))
+        self.min_change = int(options.get('min_change', DEFAULT_MIN_CHANGE))
+        if not self.enabled:
+            self.timer.stop()
+
+    def on_text_changed(self):
+        if self.enabled:
+            self._settling = False
+            self.timer.start(self.debounce_ms)
+
+    def skip(self, text: str, languages):
+        # 文本已由别处提交翻译（如快捷键取词），不必再翻译一次
+        self.timer.stop()
+        self._settling = False
+        self.last_text = text
+        self.last_languages = languages
+
+    def invalidate(self):
+        # 切换语言等情况下，即使文本没变也需要重新翻译
+        self.last_languages = None
+        self.on_text_changed()
+
+    def flush(self):
+        text = self.editor.toPlainText()
+        languages = self.languages()
+        if len(text) > LARGE_TEXT_CHARS:
+            # 长文本不自动翻译，点击翻译后逐块翻译
+            return
+        if not text.strip():
+            self.last_text = ''
+            self.workers.cancel('text')
+            self.cleared.emit()
+            return
+        if languages == self.last_languages:
+            changed = changed_characters(self.last_text, text)
+            if changed == 0:
+                return
+            if changed < self.min_change and not self._settling:
+                self._settling = True
+                self.timer.start(self.debounce_ms * 3)
+                return
+        self._settling = False
+        self.submit(text, languages)
+
+    def submit(self, text: str, languages):
+        self.last_text = text
+        self.last_languages = languages
+        source_lang, target_lang = languages
+        config = self.load_config()
+
+        # 本地已有的译文先显示出来，其余部分等网络结果补全
+        preview, complete = core.preview(text, source_lang, target_lang, config=config)
+        if preview is not None:
+            self.preview.emit(preview)
+        if complete:
+            self.workers.cancel('text')
+            return
+        self.workers.submit('text', lambda job: core.translate(text, source_lang, target_lang, config=config))
@@ -0,0 +1,316 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# 每次翻译操作的耗时分解：排队、读取配置、获取客户端、网络、缓存命中等
+# 关闭时所有入口只检查一个全局开关，返回共享的空上下文
+METRICS_FILE = 'PyDeeplMetrics.jsonl'
+PROMETHEUS_FILE = 'PyDeeplMetrics.prom'
+MAX_SAMPLES = 10000
+PROMETHEUS_INTERVAL = 5.0
+QUANTILES = (0.5, 0.95, 0.99)
+COUNTERS = ('characters', 'cache_hits', 'cache_misses', 'retries')
+
+_NOOP = nullcontext()
+_enabled = False
+_local = threading.local()
+_configured = None
+_configure_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ('name', 'started', 'duration', 'stages', 'counts', 'error')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self.duration = 0.0
+        self.stages = {}
+        self.counts = {}
+        self.error = None
+
+    def add_time(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        record = {'ts': round(self.started, 3), 'operation': self.name, 'duration_ms': round(self.duration * 1000, 3)}
+        record.update({f'{stage}_ms': round(seconds * 1000, 3) for stage, seconds in self.stages.items()})
+        record.update(self.counts)
+        if self.error is not None:
+            record['error'] = self.error
+        return record
+
+
+class _Operation:
+    __slots__ = ('span', 'parent', '_start')
+
+    def __init__(self, name: str):
+        self.span = Span(name)
+
+    def __enter__(self):
+        self.parent = getattr(_local, 'span', None)
+        _local.span = self.span
+        self._start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.duration = time.perf_counter() - self._start
+        _local.span = self.parent
+        if exc_type is not None:
+            self.span.error = f'{exc_type.__name__}: {exc}'
+        recorder.record(self.span)
+        return False
+
+
+class _Stage:
+    __slots__ = ('span', 'name', '_start')
+
+    def __init__(self, span: Span, name: str):
+        self.span = span
+        self.name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.add_time(self.name, time.perf_counter() - self._start)
+        return False
+
+
+class _Attach:
+    __slots__ = ('span', 'parent')
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self):
+        self.parent = getattr(_local, 'span', None)
+        _local.span = self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.span = self.parent
+        return False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def current():
+    return getattr(_local, 'span', None) if _enabled else None
+
+
+def operation(name: str):
+    return _Operation(name) if _enabled else _NOOP
+
+
+def attach(span):
+    # 在其他线程中代为发送请求时（如合并请求），把各阶段耗时记到提交请求的操作上
+    return _Attach(span) if span is not None else _NOOP
+
+
+def stage(name: str):
+    span = current()
+    return _Stage(span, name) if span is not None else _NOOP
+
+
+def add_time(name: str, seconds: float):
+    span = current()
+    if span is not None:
+        span.add_time(name, seconds)
+
+
+def count(name: str, value: int = 1):
+    span = current()
+    if span is not None:
+        span.count(name, value)
+
+
+def timed(name: str):
+    # 把整个函数调用记为一次操作
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Operation(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Recorder:
+    # 每种操作保留最近 max_samples 个样本用于计算分位数，计数器累计全部操作
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.exporter = None
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._stages = {}
+        self._totals = {}
+
+    def record(self, span: Span):
+        with self._lock:
+            samples = self._durations.get(span.name)
+            if samples is None:
+                samples = self._durations[span.name] = deque(maxlen=self.max_samples)
+            samples.append(span.duration)
+            for stage_name, seconds in span.stages.items():
+                key = (span.name, stage_name)
+                stage_samples = self._stages.get(key)
+                if stage_samples is None:
+                    stage_samples = self._stages[key] = deque(maxlen=self.max_samples)
+                stage_samples.append(seconds)
+            totals = self._totals.setdefault(span.name, dict.fromkeys(('count', 'errors', 'seconds') + COUNTERS, 0))
+            totals['count'] += 1
+            totals['errors'] += span.error is not None
+            totals['seconds'] += span.duration
+            for name, value in span.counts.items():
+                totals[name] = totals.get(name, 0) + value
+            exporter = self.exporter
+        if exporter is not None:
+            exporter.export(span)
+
+    def summary(self) -> list:
+        # 每种操作一行：次数、错误数、字符数、缓存命中情况，以及总耗时和各阶段耗时的分位数（毫秒）
+        with self._lock:
+            durations = {name: sorted(samples) for name, samples in self._durations.items()}
+            stages = {key: sorted(samples) for key, samples in self._stages.items()}
+            totals = {name: dict(values) for name, values in self._totals.items()}
+        rows = []
+        for name in sorted(durations):
+            row = dict(totals[name], operation=name)
+            row['duration'] = [percentile(durations[name], q) * 1000 for q in QUANTILES]
+            row['stages'] = {stage_name: [percentile(samples, q) * 1000 for q in QUANTILES]
+                             for (operation_name, stage_name), samples in sorted(stages.items())
+                             if operation_name == name}
+            rows.append(row)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._stages.clear()
+            self._totals.clear()
+
+
+class JsonlExporter:
+    # 每次操作追加一行 JSON
+    def __init__(self, path: str = METRICS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + '\n')
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class PrometheusExporter:
+    # 定期把汇总结果整体写成 Prometheus 文本格式，可由 node_exporter 的 textfile 收集器读取
+    def __init__(self, path: str = PROMETHEUS_FILE, interval: float = PROMETHEUS_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._written = 0.0
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        now = time.monotonic()
+        if now - self._written >= self.interval:
+            self._written = now
+            self.write()
+
+    def write(self):
+        lines = ['# TYPE pydeepl_operation_seconds summary', '# TYPE pydeepl_stage_seconds summary']
+        counters = []
+        for row in recorder.summary():
+            label = f'operation="{row["operation"]}"'
+            for q, value in zip(QUANTILES, row['duration']):
+                lines.append(f'pydeepl_operation_seconds{{{label},quantile="{q}"}} {value / 1000:.6f}')
+            lines.append(f'pydeepl_operation_seconds_sum{{{label}}} {row["seconds"]:.6f}')
+            lines.append(f'pydeepl_operation_seconds_count{{{label}}} {row["count"]}')
+            for stage_name, values in row['stages'].items():
+                for q, value in zip(QUANTILES, values):
+                    lines.append(f'pydeepl_stage_seconds{{{label},stage="{stage_name}",quantile="{q}"}} '
+                                 f'{value / 1000:.6f}')
+            for name in ('errors',) + COUNTERS:
+                counters.append((name, label, row.get(name, 0)))
+        for name in ('errors',) + COUNTERS:
+            lines.append(f'# TYPE pydeepl_{name}_total counter')
+            lines.extend(f'pydeepl_{name}_total{{{label}}} {value}' for counter, label, value in counters
+                         if counter == name)
+        with self._lock:
+            temp_path = f'{self.path}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                file.write('\n'.join(lines) + '\n')
+            os.replace(temp_path, self.path)
+
+    def close(self):
+        self.write()
+
+
+recorder = Recorder()
+
+
+def configure(config: dict):
+    # 根据配置中的 metrics 段开启或关闭统计；配置未变化时不做任何事
+    global _enabled, _configured
+    options = config.get('metrics') or {}
+    export_format = options.get('format', 'jsonl')
+    default_path = PROMETHEUS_FILE if export_format == 'prometheus' else METRICS_FILE
+    settings = (bool(options.get('enabled', False)), export_format, options.get('path', default_path))
+    with _configure_lock:
+        if settings == _configured:
+            return
+        _configured = settings
+        if recorder.exporter is not None:
+            recorder.exporter.close()
+            recorder.exporter = None
+        enabled_, export_format, path = settings
+        if enabled_ and path:
+            recorder.exporter = PrometheusExporter(path) if export_format == 'prometheus' else JsonlExporter(path)
+        _enabled = enabled_
+
+
+def close():
+    global _configured
+    with _configure_lock:
+        _configured = None
+        if recorder.exporter is not None:
+            recorder.exporter.close()
+            recorder.exporter = None
+
+
+def format_summary(rows: list) -> str:
+    lines = [f'{"操作/阶段":<22}{"次数":>8}{"错误":>6}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"字符":>10}{"缓存命中":>10}']
+    for row in rows:
+        lookups = row['cache_hits'] + row['cache_misses']
+        hit_rate = f'{row["cache_hits"] / lookups:.0%}' if lookups else '-'
+        lines.append(f'{row["operation"]:<22}{row["count"]:>8}{row["errors"]:>6}'
+                     + ''.join(f'{value:>10.1f}' for value in row['duration'])
+                     + f'{row["characters"]:>10}{hit_rate:>10}')
+        for stage_name, values in row['stages'].items():
+            lines.append(f'  {stage_name:<20}{"":>14}' + ''.join(f'{value:>10.1f}' for value in values))
+    return '\n'.join(lines)
@@ -0,0 +1,99 @@
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtGui import QTextCursor
+
+# 超过此长度的文本进入大文本模式：分批追加到输出框，最多显示 DISPLAY_LIMIT 个字符
+LARGE_TEXT_CHARS = 100000
+DISPLAY_LIMIT = 2000000
+APPEND_BATCH_CHARS = 50000
+TRUNCATED_NOTE = '\n\n……（内容过长，输出框只显示前 {limit} 个字符；复制或按 Ctrl+S 导出可获取全部内容）'
+
+
+class OutputView(QObject):
+    # 输出框内容的唯一来源是按块保存的字符串列表，复制和导出直接读取，不再经由 toPlainText() 从文档中取回；
+    # 各块分别存储，一块中出现中文不会使其余纯英文块也按宽字符保存
+    def __init__(self, browser, parent=None):
+        super().__init__(parent)
+        self.browser = browser
+        self.browser.setUndoRedoEnabled(False)
+        self._chunks = []
+        self._length = 0
+        self._pending = deque()
+        self._displayed = 0
+        self._truncated = False
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self._drain)
+
+    def __len__(self):
+        return self._length
+
+    def clear(self):
+        self.timer.stop()
+        self._chunks = []
+        self._length = 0
+        self._pending.clear()
+        self._displayed = 0
+        self._truncated = False
+        self.browser.clear()
+
+    def set_text(self, text: str):
+        self.clear()
+        if len(text) <= LARGE_TEXT_CHARS:
+            # 按纯文本显示，不做富文本解析
+            self._chunks.append(text)
+            self._length = self._displayed = len(text)
+            self.browser.setPlainText(text)
+        else:
+            self.append(text)
+
+    def append(self, chunk: str):
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        if self._truncated:
+            return
+        self._pending.append(chunk)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _drain(self):
+        # 每次事件循环最多追加 APPEND_BATCH_CHARS 个字符，追加过程中界面保持响应
+        batch = []
+        budget = min(APPEND_BATCH_CHARS, DISPLAY_LIMIT - self._displayed)
+        while self._pending and budget > 0:
+            chunk = self._pending.popleft()
+            if len(chunk) > budget:
+                self._pending.appendleft(chunk[budget:])
+                chunk = chunk[:budget]
+            batch.append(chunk)
+            budget -= len(chunk)
+        text = ''.join(batch)
+        self._displayed += len(text)
+        if self._pending and self._displayed >= DISPLAY_LIMIT:
+            self._pending.clear()
+            self._truncated = True
+            text += TRUNCATED_NOTE.format(limit=DISPLAY_LIMIT)
+
+        cursor = QTextCursor(self.browser.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        if not self._pending:
+            self.timer.stop()
+
+    def text(self) -> str:
+        if len(self._chunks) == 1:
+            return self._chunks[0]
+        return ''.join(self._chunks)
+
+    def copy_to(self, clipboard):
+        clipboard.setText(self.text())
+
+    def export(self, path: str):
+        # 逐块写入，不需要先拼成一个完整的字符串
+        with open(path, 'w', encoding='utf-8') as file:
+            for chunk in self._chunks:
+                file.write(chunk)
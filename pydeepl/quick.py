@@ -0,0 +1,148 @@
+import datetime
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtGui import QClipboard
+
+from pydeepl import core
+from pydeepl.config import read_config
+from pydeepl.scheduler import BATCH
+
+DEFAULT_CACHE_SIZE = 64
+DEFAULT_PREFETCH_MAX_CHARS = 2000
+DEFAULT_PREFETCH_BUDGET = 20000
+COPY_DELAY = 0.15
+
+
+def copy_selection(delay: float = COPY_DELAY):
+    # Windows 没有“选中即可读取”的剪贴板，模拟一次 Ctrl+C 把选中的文字复制到剪贴板
+    from pynput.keyboard import Controller, Key
+
+    keyboard = Controller()
+    with keyboard.pressed(Key.ctrl):
+        keyboard.tap('c')
+    time.sleep(delay)
+
+
+class QuickTranslator(QObject):
+    # 快捷键取词翻译：读取剪贴板（或选中的文字）后立即开始翻译，最近的结果保存在内存中，
+    # 同一段文字再次按快捷键时直接显示。可选在后台预取剪贴板新内容的译文，每天预取的字符数不超过预算
+    def __init__(self, clipboard, languages, parent=None, load_config=read_config):
+        super().__init__(parent)
+        self.clipboard = clipboard
+        self.languages = languages
+        self.load_config = load_config
+        self.enabled = False
+        self.source = 'clipboard'
+        self.simulate_copy = False
+        self.cache_size = DEFAULT_CACHE_SIZE
+        self.prefetch = False
+        self.prefetch_max_chars = DEFAULT_PREFETCH_MAX_CHARS
+        self.prefetch_budget = DEFAULT_PREFETCH_BUDGET
+        self.prefetched_characters = 0
+        self._budget_day = None
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+        self._pending = {}
+        self._executor = None
+        self.clipboard.dataChanged.connect(self.on_clipboard_changed)
+
+    def configure(self, config: dict):
+        options = config.get('quick_translate') or {}
+        self.enabled = bool(options.get('enabled', False))
+        self.source = options.get('source', 'clipboard')
+        self.cache_size = int(options.get('cache_size', DEFAULT_CACHE_SIZE))
+        self.prefetch = self.enabled and bool(options.get('prefetch', False))
+        self.prefetch_max_chars = int(options.get('prefetch_max_chars', DEFAULT_PREFETCH_MAX_CHARS))
+        self.prefetch_budget = int(options.get('prefetch_budget', DEFAULT_PREFETCH_BUDGET))
+        # X11 等平台可以直接读取选中的文字，其余平台在快捷键线程中先模拟复制
+        self.simulate_copy = self.enabled and self.source == 'selection' and not self.clipboard.supportsSelection()
+
+    def capture(self) -> str:
+        if self.source == 'selection' and self.clipboard.supportsSelection():
+            return self.clipboard.text(QClipboard.Selection).strip()
+        return self.clipboard.text().strip()
+
+    def lookup(self, text: str, source_lang: str, target_lang: str):
+        key = (text, source_lang, target_lang)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        # 在工作线程中调用；同一段文字正在预取时等待其结果，不重复发送请求
+        key = (text, source_lang, target_lang)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+            future = self._pending.get(key)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass
+        result = core.translate(text, source_lang, target_lang, config=self.load_config())
+        self._remember(key, result)
+        return result
+
+    def _remember(self, key, result: str):
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+
+    def _charge(self, characters: int) -> bool:
+        # 预取的字符数按天累计，发送前按原文长度计入；超出预算后不再预取，按快捷键时的翻译不受影响
+        today = datetime.date.today()
+        if today != self._budget_day:
+            self._budget_day = today
+            self.prefetched_characters = 0
+        if self.prefetched_characters + characters > self.prefetch_budget:
+            return False
+        self.prefetched_characters += characters
+        return True
+
+    def on_clipboard_changed(self):
+        if not self.prefetch:
+            return
+        text = self.clipboard.text().strip()
+        if not text or len(text) > self.prefetch_max_chars:
+            return
+        source_lang, target_lang = self.languages()
+        key = (text, source_lang, target_lang)
+        with self._lock:
+            if key in self._results or key in self._pending:
+                return
+            # 剪贴板已有新内容，尚未开始的预取不再需要，退回其预算
+            for old_key, future in list(self._pending.items()):
+                if future.cancel():
+                    del self._pending[old_key]
+                    self.prefetched_characters -= len(old_key[0])
+            if not self._charge(len(text)):
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pydeepl-prefetch')
+            self._pending[key] = self._executor.submit(self._prefetch, key)
+
+    def _prefetch(self, key) -> str:
+        text, source_lang, target_lang = key
+        try:
+            # 预取使用批量优先级，不会挡住界面中的翻译
+            result = core.translate(text, source_lang, target_lang, config=self.load_config(), priority=BATCH)
+            self._remember(key, result)
+            return result
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
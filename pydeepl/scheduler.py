@@ -0,0 +1,328 @@
+import email.utils
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from pydeepl import metrics
+from pydeepl.client import translator_from_config
+
+# 优先级通道：数值越小越先执行
+INTERACTIVE = 0
+BATCH = 1
+BULK = 2
+
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_QUOTA_EXCEEDED = 456
+
+
+class QuotaGuardError(Exception):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def try_acquire(self, now: float, tokens: float = 1.0) -> float:
+        # 成功取得令牌返回 0，否则返回还需等待的秒数；调用方负责加锁
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+
+class QuotaTracker:
+    # 本地累计已发送的字符数，定期与 get_usage() 校准，避免不知不觉用完每月额度
+    def __init__(self, reserve: float = 0.0, sync_interval: float = 300.0, sync_characters: int = 50000):
+        self.reserve = reserve
+        self.sync_interval = sync_interval
+        self.sync_characters = sync_characters
+        self.limit = None
+        self.server_count = 0
+        self.local_count = 0
+        self.exhausted = False
+        self._synced_at = None
+        self._syncing = False
+        self._lock = threading.Lock()
+
+    @property
+    def used(self) -> int:
+        return self.server_count + self.local_count
+
+    def needs_sync(self) -> bool:
+        return (self._synced_at is None or self.local_count >= self.sync_characters
+                or time.monotonic() - self._synced_at >= self.sync_interval)
+
+    def begin_sync(self) -> bool:
+        # 需要校准且没有其他线程正在校准时返回 True
+        with self._lock:
+            if self._syncing or not self.needs_sync():
+                return False
+            self._syncing = True
+            return True
+
+    def sync(self, usage):
+        with self._lock:
+            self.limit = usage.character.limit if usage.character.valid else None
+            self.server_count = usage.character.count or 0
+            self.local_count = 0
+            self.exhausted = bool(self.limit) and self.server_count >= self.limit
+            self._synced_at = time.monotonic()
+            self._syncing = False
+
+    def check(self, characters: int):
+        with self._lock:
+            if self.exhausted:
+                raise QuotaGuardError('本期翻译额度已用完')
+            if self.limit and self.used + characters > self.limit * (1 - self.reserve):
+                raise QuotaGuardError(f'剩余额度不足：已用 {self.used} / {self.limit} 字符，本次需要 {characters} 字符')
+
+    def defer_sync(self):
+        with self._lock:
+            self._synced_at = time.monotonic()
+            self._syncing = False
+
+    def record(self, characters: int):
+        with self._lock:
+            self.local_count += characters
+
+    def mark_exhausted(self):
+        with self._lock:
+            self.exhausted = True
+
+
+def parse_retry_after(value: str):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Scheduler:
+    def __init__(self, rate: float = 5.0, burst: float = 10.0, max_concurrent: int = 8, max_retries: int = 5,
+                 base_delay: float = 0.5, max_delay: float = 60.0, quota: QuotaTracker = None):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.quota = quota or QuotaTracker()
+        self.retries = 0
+        self.throttled = 0
+
+        self._condition = threading.Condition()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._paused_until = 0.0
+        self._retry_after = threading.local()
+
+    def response_hook(self, response, *args, **kwargs):
+        # 安装在 requests 会话上，记录当前线程最近一次响应的 Retry-After
+        self._retry_after.value = parse_retry_after(response.headers.get('Retry-After'))
+        return response
+
+    def call(self, fn, *args, priority: int = INTERACTIVE, before_retry=None, **kwargs):
+        attempt = 0
+        while True:
+            queued = time.perf_counter()
+            self._acquire(priority)
+            started = time.perf_counter()
+            metrics.add_time('queue_wait', started - queued)
+            self._retry_after.value = None
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                throttled = getattr(e, 'http_status_code', None) == HTTP_TOO_MANY_REQUESTS
+            finally:
+                self._release()
+                metrics.add_time('network', time.perf_counter() - started)
+
+            attempt += 1
+            metrics.count('retries')
+            with self._condition:
+                self.retries += 1
+                if throttled:
+                    # 被限流时所有请求一起暂停，而不是各自继续撞墙
+                    self.throttled += 1
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                    self._condition.notify_all()
+            if not throttled:
+                time.sleep(delay)
+                metrics.add_time('retry_wait', delay)
+            if before_retry is not None:
+                before_retry()
+
+    def _retry_delay(self, error, attempt: int):
+        status = getattr(error, 'http_status_code', None)
+        if status == HTTP_QUOTA_EXCEEDED:
+            self.quota.mark_exhausted()
+            return None
+        if attempt >= self.max_retries:
+            return None
+        if status != HTTP_TOO_MANY_REQUESTS and not getattr(error, 'should_retry', False):
+            return None
+
+        retry_after = getattr(self._retry_after, 'value', None)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay) * random.uniform(1.0, 1.1)
+        # 带抖动的指数退避
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def _acquire(self, priority: int):
+        entry = (priority, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiting, entry)
+            while True:
+                now = time.monotonic()
+                if self._waiting[0] != entry or self._active >= self.max_concurrent:
+                    self._condition.wait()
+                    continue
+                if now < self._paused_until:
+                    self._condition.wait(self._paused_until - now)
+                    continue
+                wait = self.bucket.try_acquire(now)
+                if wait:
+                    self._condition.wait(wait)
+                    continue
+                heapq.heappop(self._waiting)
+                self._active += 1
+                self._condition.notify_all()
+                return
+
+    def _release(self):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+
+class ScheduledTranslator:
+    # 包装 deepl.Translator：所有请求经过调度器，限流、重试并统计字符用量
+    def __init__(self, translator, scheduler: Scheduler, priority: int = INTERACTIVE):
+        self._translator = translator
+        self.scheduler = scheduler
+        self.priority = priority
+        self._billed_documents = set()
+
+    def __getattr__(self, name):
+        return getattr(self._translator, name)
+
+    def with_priority(self, priority: int):
+        return ScheduledTranslator(self._translator, self.scheduler, priority)
+
+    def _call(self, fn, *args, before_retry=None, **kwargs):
+        return self.scheduler.call(fn, *args, priority=self.priority, before_retry=before_retry, **kwargs)
+
+    def _sync_quota(self):
+        # 在后台查询用量，不阻塞当前请求
+        if self.scheduler.quota.begin_sync():
+            threading.Thread(target=self._run_quota_sync, name='pydeepl-quota', daemon=True).start()
+
+    def _run_quota_sync(self):
+        quota = self.scheduler.quota
+        try:
+            quota.sync(self.scheduler.call(self._translator.get_usage, priority=BULK))
+        except Exception:
+            # 查询用量失败不影响翻译本身，稍后再校准
+            quota.defer_sync()
+
+    def get_usage(self):
+        usage = self._call(self._translator.get_usage)
+        self.scheduler.quota.sync(usage)
+        return usage
+
+    def translate_text(self, text, **kwargs):
+        characters = len(text) if isinstance(text, str) else sum(len(item) for item in text)
+        self._sync_quota()
+        self.scheduler.quota.check(characters)
+        result = self._call(self._translator.translate_text, text, **kwargs)
+        self.scheduler.quota.record(characters)
+        metrics.count('characters', characters)
+        return result
+
+    def translate_document_upload(self, input_document, **kwargs):
+        self._sync_quota()
+        self.scheduler.quota.check(0)
+
+        def rewind():
+            if hasattr(input_document, 'seek'):
+                input_document.seek(0)
+
+        return self._call(self._translator.translate_document_upload, input_document, before_retry=rewind, **kwargs)
+
+    def translate_document_get_status(self, handle):
+        status = self._call(self._translator.translate_document_get_status, handle)
+        if status.done and status.billed_characters and handle.document_id not in self._billed_documents:
+            self._billed_documents.add(handle.document_id)
+            self.scheduler.quota.record(status.billed_characters)
+            metrics.count('characters', status.billed_characters)
+        return status
+
+    def translate_document_download(self, handle, output_file=None, chunk_size: int = 1):
+        def rewind():
+            if output_file is not None and hasattr(output_file, 'truncate'):
+                output_file.seek(0)
+                output_file.truncate()
+
+        return self._call(self._translator.translate_document_download, handle, output_file, chunk_size,
+                          before_retry=rewind)
+
+    # 术语表的查询、创建和删除同样计入限流，被限流时按 Retry-After 重试
+    def get_glossary(self, glossary_id):
+        return self._call(self._translator.get_glossary, glossary_id)
+
+    def create_glossary(self, name, source_lang, target_lang, entries):
+        return self._call(self._translator.create_glossary, name, source_lang, target_lang, entries)
+
+    def delete_glossary(self, glossary):
+        return self._call(self._translator.delete_glossary, glossary)
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def scheduler_from_config(config: dict) -> Scheduler:
+    # 额度按账户计算，同一个 API 密钥共享一个调度器
+    key = config['deepl_api']
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            options = config.get('scheduler') or {}
+            scheduler = Scheduler(rate=options.get('rate', 5.0), burst=options.get('burst', 10.0),
+                                  max_concurrent=options.get('max_concurrent', 8),
+                                  max_retries=options.get('max_retries', 5),
+                                  quota=QuotaTracker(reserve=options.get('quota_reserve', 0.0)))
+            _schedulers[key] = scheduler
+    return scheduler
+
+
+def scheduled_translator_from_config(config: dict, priority: int = INTERACTIVE) -> ScheduledTranslator:
+    start = time.perf_counter()
+    import deepl
+
+    # 重试由调度器负责（并遵循 Retry-After），关闭 deepl 库自带的重试
+    deepl.http_client.max_network_retries = 0
+    translator = translator_from_config(config)
+    scheduler = scheduler_from_config(config)
+    session = getattr(getattr(translator, '_client', None), '_session', None)
+    if session is not None and scheduler.response_hook not in session.hooks['response']:
+        session.hooks['response'].append(scheduler.response_hook)
+    metrics.add_time('client', time.perf_counter() - start)
+    return ScheduledTranslator(translator, scheduler, priority)
@@ -0,0 +1,93 @@
+import re
+import threading
+
+from pydeepl.batching import translate_many
+
+# 段落（换行）以及句末标点之后的空白都视为分段边界，分隔符原样保留
+_BOUNDARY = re.compile(r'[ \t\r]*\n\s*|(?<=[.!?;])[ \t]+(?![a-z])|(?<=[。！？；])[ \t]*')
+
+
+def split_segments(text: str) -> list:
+    pieces = []
+    pos = len(text) - len(text.lstrip())
+    if pos:
+        pieces.append(('', text[:pos]))
+    for match in _BOUNDARY.finditer(text):
+        if match.end() <= pos:
+            continue
+        pieces.append((text[pos:match.start()], match.group()))
+        pos = match.end()
+    if pos < len(text) or not pieces:
+        pieces.append((text[pos:], ''))
+    return pieces
+
+
+def join_segments(pieces: list, translations: dict) -> str:
+    return ''.join(translations.get(body, body) + separator for body, separator in pieces)
+
+
+def changed_characters(old: str, new: str) -> int:
+    # 去掉相同的前缀和后缀后，剩余部分的长度即为改动量的近似值
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return max(len(old), len(new)) - prefix - suffix
+
+
+class IncrementalTranslator:
+    # 记住上一次提交的分段译文，再次提交时只翻译新增或改动过的分段
+    def __init__(self):
+        self.reused = 0
+        self.translated = 0
+        self._previous = {}
+        self._lock = threading.Lock()
+
+    def translate(self, translator, text: str, source_lang: str, target_lang: str, cache=None, **options) -> str:
+        pieces = split_segments(text)
+        # 记忆按语言对和选项（如术语表）区分
+        memo_key = (source_lang, target_lang, tuple(sorted(options.items())))
+        with self._lock:
+            previous = self._previous.get(memo_key, {})
+
+        translations = {}
+        missing = {}
+        for body, _ in pieces:
+            if not body.strip() or body in translations or body in missing:
+                continue
+            if body in previous:
+                translations[body] = previous[body]
+                continue
+            if cache is not None:
+                cached = cache.get(body, source_lang, target_lang, **options)
+                if cached is not None:
+                    translations[body] = cached
+                    continue
+            missing[body] = None
+
+        reused = len(translations)
+        if missing:
+            missing = list(missing)
+            results = translate_many(translator, missing, source_lang, target_lang, **options)
+            for body, translated_text in zip(missing, results):
+                translations[body] = translated_text
+                if cache is not None:
+                    cache.put(body, source_lang, target_lang, translated_text, **options)
+
+        with self._lock:
+            self._previous[memo_key] = translations
+            self.reused = reused
+            self.translated = len(missing)
+        return join_segments(pieces, translations)
+
+    def lookup(self, segment: str, source_lang: str, target_lang: str, **options):
+        memo_key = (source_lang, target_lang, tuple(sorted(options.items())))
+        with self._lock:
+            return self._previous.get(memo_key, {}).get(segment)
+
+    def reset(self):
+        with self._lock:
+            self._previous.clear()
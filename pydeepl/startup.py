@@ -0,0 +1,52 @@
+import json
+import os
+import threading
+import time
+
+# 设置该环境变量为文件路径时，启动完成后把各阶段耗时写入该文件（JSON）
+TIMELINE_ENV = 'PYDEEPL_STARTUP_TIMELINE'
+
+
+class StartupTimeline:
+    # 记录启动各阶段相对入口脚本开始执行时的耗时（毫秒）
+    def __init__(self, path: str = None, expected=()):
+        self.started = time.time()
+        self._origin = time.perf_counter()
+        self.path = path
+        self.expected = set(expected)
+        self.marks = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def mark(self, name: str, error=None):
+        with self._lock:
+            if name in self.marks:
+                return
+            self.marks[name] = (time.perf_counter() - self._origin) * 1000
+            if error is not None:
+                self.errors[name] = str(error)
+            done = self.expected <= self.marks.keys()
+        if done and self.path:
+            self.write()
+
+    def write(self):
+        with self._lock:
+            data = {'started': self.started, 'marks': dict(self.marks), 'errors': dict(self.errors)}
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+        os.replace(temp_path, self.path)
+
+    def format(self) -> str:
+        with self._lock:
+            marks = sorted(self.marks.items(), key=lambda item: item[1])
+            errors = dict(self.errors)
+        lines = []
+        for name, elapsed in marks:
+            note = f'  失败：{errors[name]}' if name in errors else ''
+            lines.append(f'{elapsed:>9.1f} ms  {name}{note}')
+        return '\n'.join(lines)
+
+
+def timeline_from_env(expected=()) -> StartupTimeline:
+    return StartupTimeline(os.environ.get(TIMELINE_ENV) or None, expected)
@@ -0,0 +1,204 @@
+import collections
+import glob
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from pydeepl.segments import split_segments
+
+STREAMABLE_EXTENSIONS = ('.txt', '.srt')
+MAX_CHUNK_CHARS = 20000
+MAX_CHUNK_UNITS = 200
+MAX_BLOCK_LINES = 1000
+
+
+def _split_line_ending(line: str):
+    stripped = line.rstrip('\r\n')
+    return stripped, line[len(stripped):]
+
+
+def read_lines(file, max_chars: int = MAX_CHUNK_CHARS):
+    # 逐行读取，超长的行截成不超过 max_chars 的四分之一的几段，避免整行读入内存
+    size = max(1, max_chars // 4)
+    return iter(lambda: file.readline(size), '')
+
+
+def _cut_block(content: list):
+    # 在最后一个换行处结束当前块；末尾是一行被截断的几段时，改在这一行最后一个句子边界处结束，剩余部分留给下一块
+    if content[-1].endswith('\n'):
+        return content, []
+    start = len(content)
+    while start and not content[start - 1].endswith('\n'):
+        start -= 1
+    tail = ''.join(content[start:])
+    pieces = split_segments(tail)
+    rest, separator = pieces[-1]
+    if len(pieces) > 1 and not separator:
+        return content[:start] + [tail[:len(tail) - len(rest)]], [rest]
+    if start:
+        return content[:start], content[start:]
+    return content, []
+
+
+def iter_blocks(lines, max_chars: int = MAX_CHUNK_CHARS, max_lines: int = MAX_BLOCK_LINES):
+    # 以空行分隔的块：(内容行, 紧随其后的空行)；没有空行的长文本超过 max_chars 或 max_lines 后提前结束当前块，
+    # 所以内存占用只取决于块的上限
+    content, blank = [], []
+    chars = 0
+    for line in lines:
+        if line.strip():
+            if blank:
+                yield content, blank
+                content, blank = [], []
+                chars = 0
+            if content and (chars + len(line) > max_chars or len(content) >= max_lines):
+                content, rest = _cut_block(content)
+                yield content, []
+                content = rest
+                chars = sum(len(item) for item in rest)
+            content.append(line)
+            chars += len(line)
+        else:
+            blank.append(line)
+    if content or blank:
+        yield content, blank
+
+
+def iter_units(lines, srt: bool = False, max_chars: int = MAX_CHUNK_CHARS):
+    # 每个单元为 (前缀, 待翻译文本, 后缀)，只有文本部分会发送给 DeepL
+    for content, blank in iter_blocks(lines, max_chars):
+        if not content:
+            yield '', '', ''.join(blank)
+            continue
+
+        prefix = ''
+        if srt:
+            # 字幕序号和时间轴原样保留
+            if len(content) >= 2 and '-->' in content[1]:
+                prefix, content = content[0] + content[1], content[2:]
+            elif '-->' in content[0]:
+                prefix, content = content[0], content[1:]
+        if not content:
+            yield prefix, '', ''.join(blank)
+            continue
+
+        last, ending = _split_line_ending(content[-1])
+        text = ''.join(content[:-1]) + last
+        suffix = ending + ''.join(blank)
+        if len(text) <= max_chars:
+            yield prefix, text, suffix
+            continue
+
+        # 超长段落按句子拆开
+        pieces = split_segments(text)
+        for index, (body, separator) in enumerate(pieces):
+            yield (prefix if index == 0 else ''), body, separator + (suffix if index == len(pieces) - 1 else '')
+
+
+def iter_chunks(units, max_chars: int = MAX_CHUNK_CHARS, max_units: int = MAX_CHUNK_UNITS):
+    chunk = []
+    chars = 0
+    for unit in units:
+        if chunk and (chars + len(unit[1]) > max_chars or len(chunk) >= max_units):
+            yield chunk
+            chunk = []
+            chars = 0
+        chunk.append(unit)
+        chars += len(unit[1])
+    if chunk:
+        yield chunk
+
+
+def progress_path(save_path: str) -> str:
+    return save_path + '.progress'
+
+
+def find_resumable(file_path: str, output_dir: str = None):
+    # 查找同一源文件未完成的译文，以便从上次中断处继续
+    directory, filename = os.path.split(file_path)
+    name, ext = os.path.splitext(filename)
+    pattern = os.path.join(glob.escape(output_dir or directory), f'{glob.escape(name)}_translated_*{ext}.progress')
+    for state_file in sorted(glob.glob(pattern), reverse=True):
+        state = _load_state(state_file)
+        if state is not None and state.get('source') == _source_signature(file_path):
+            return state_file[:-len('.progress')]
+    return None
+
+
+def _source_signature(file_path: str) -> list:
+    stat = os.stat(file_path)
+    return [os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns]
+
+
+def _load_state(state_file: str):
+    try:
+        with open(state_file, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state_file: str, state: dict):
+    temp_file = state_file + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as file:
+        json.dump(state, file)
+    os.replace(temp_file, state_file)
+
+
+def stream_translate_file(file_path: str, save_path: str, translate_batch, max_chars: int = MAX_CHUNK_CHARS,
+                          max_inflight: int = 4, progress=None, check_cancelled=None) -> int:
+    # 逐块读取、翻译并写出，最多同时有 max_inflight 个块在翻译；每写完一块记录进度，中断后可以续传
+    state_file = progress_path(save_path)
+    source = _source_signature(file_path)
+    state = _load_state(state_file) if os.path.exists(save_path) else None
+    if state is None or state.get('source') != source:
+        state = {'source': source, 'chunks': 0, 'offset': 0, 'characters': 0}
+
+    srt = file_path.lower().endswith('.srt')
+    skip = state['chunks']
+    if skip and progress is not None:
+        progress(f'从第 {skip + 1} 块继续翻译…')
+
+    def translate_chunk(chunk):
+        texts = [text for _, text, _ in chunk if text.strip()]
+        translations = iter(translate_batch(texts) if texts else [])
+        parts = []
+        for prefix, text, suffix in chunk:
+            parts.append(prefix + (next(translations) if text.strip() else text) + suffix)
+        return ''.join(parts).encode('utf-8'), sum(len(text) for text in texts)
+
+    def write_result(output, future):
+        data, characters = future.result()
+        output.write(data)
+        output.flush()
+        state['chunks'] += 1
+        state['offset'] += len(data)
+        state['characters'] += characters
+        _save_state(state_file, state)
+        if progress is not None:
+            progress(f'已翻译 {state["chunks"]} 块')
+
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as source_file, \
+            open(save_path, 'r+b' if state['chunks'] else 'wb') as output, \
+            ThreadPoolExecutor(max_workers=max(1, max_inflight), thread_name_prefix='pydeepl-stream') as executor:
+        output.truncate(state['offset'])
+        output.seek(state['offset'])
+        inflight = collections.deque()
+        try:
+            units = iter_units(read_lines(source_file, max_chars), srt, max_chars)
+            for index, chunk in enumerate(iter_chunks(units, max_chars)):
+                if index < skip:
+                    continue
+                if check_cancelled is not None:
+                    check_cancelled()
+                inflight.append(executor.submit(translate_chunk, chunk))
+                if len(inflight) >= max_inflight:
+                    write_result(output, inflight.popleft())
+            while inflight:
+                write_result(output, inflight.popleft())
+        finally:
+            for future in inflight:
+                future.cancel()
+
+    os.remove(state_file)
+    return state['characters']
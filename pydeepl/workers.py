@@ -0,0 +1,122 @@
+import itertools
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class JobSignals(QObject):
+    progress = pyqtSignal(int, str)
+    partial = pyqtSignal(int, object)
+    result = pyqtSignal(int, object)
+    error = pyqtSignal(int, object)
+    finished = pyqtSignal(int)
+
+
+class Job(QRunnable):
+    def __init__(self, job_id: int, kind: str, fn):
+        super().__init__()
+        self.job_id = job_id
+        self.kind = kind
+        self.fn = fn
+        self.signals = JobSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def report(self, message: str):
+        if not self.is_cancelled():
+            self.signals.progress.emit(self.job_id, message)
+
+    def emit_partial(self, value):
+        # 分段产生的结果（如长文本逐块翻译的译文），界面可以先显示已完成的部分
+        if not self.is_cancelled():
+            self.signals.partial.emit(self.job_id, value)
+
+    def run(self):
+        try:
+            if self.is_cancelled():
+                return
+            result = self.fn(self)
+            if not self.is_cancelled():
+                self.signals.result.emit(self.job_id, result)
+        except Exception as e:
+            if not self.is_cancelled():
+                self.signals.error.emit(self.job_id, e)
+        finally:
+            self.signals.finished.emit(self.job_id)
+
+
+class TranslationWorkers(QObject):
+    # 每类任务只保留最新提交的一个，旧任务会被取消，其结果也不会再发出
+    progress = pyqtSignal(str, str)
+    partial = pyqtSignal(str, object)
+    result = pyqtSignal(str, object)
+    error = pyqtSignal(str, object)
+    busy_changed = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None, max_threads: int = 4):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._latest = {}
+        self._running = {}
+
+    def submit(self, kind: str, fn) -> int:
+        self.cancel(kind)
+        job = Job(next(self._ids), kind, fn)
+        job.signals.progress.connect(lambda job_id, message: self._on_progress(kind, job_id, message))
+        job.signals.partial.connect(lambda job_id, value: self._on_partial(kind, job_id, value))
+        job.signals.result.connect(lambda job_id, value: self._on_result(kind, job_id, value))
+        job.signals.error.connect(lambda job_id, error: self._on_error(kind, job_id, error))
+        job.signals.finished.connect(lambda job_id: self._on_finished(kind, job_id))
+        self._latest[kind] = job
+        self._running[job.job_id] = job
+        self.busy_changed.emit(kind, True)
+        self.pool.start(job)
+        return job.job_id
+
+    def cancel(self, kind: str = None):
+        kinds = list(self._latest) if kind is None else [kind]
+        for name in kinds:
+            job = self._latest.pop(name, None)
+            if job is not None:
+                job.cancel()
+                self.busy_changed.emit(name, False)
+
+    def is_busy(self, kind: str) -> bool:
+        return kind in self._latest
+
+    def shutdown(self, timeout_ms: int = 3000):
+        self.cancel()
+        self.pool.waitForDone(timeout_ms)
+
+    def _is_latest(self, kind: str, job_id: int) -> bool:
+        job = self._latest.get(kind)
+        return job is not None and job.job_id == job_id
+
+    def _on_progress(self, kind, job_id, message):
+        if self._is_latest(kind, job_id):
+            self.progress.emit(kind, message)
+
+    def _on_partial(self, kind, job_id, value):
+        if self._is_latest(kind, job_id):
+            self.partial.emit(kind, value)
+
+    def _on_result(self, kind, job_id, value):
+        if self._is_latest(kind, job_id):
+            self.result.emit(kind, value)
+
+    def _on_error(self, kind, job_id, error):
+        if self._is_latest(kind, job_id):
+            self.error.emit(kind, error)
+
+    def _on_finished(self, kind, job_id):
+        self._running.pop(job_id, None)
+        if self._is_latest(kind, job_id):
+            del self._latest[kind]
+            self.busy_changed.emit(kind, False)